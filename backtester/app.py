@@ -1,32 +1,77 @@
+import asyncio
 from datetime import datetime
-from typing import List, Dict, Union
+from typing import List, Dict, Optional, Union
+
 import pandas as pd
 
 from logger.config import logger
-from backtester.data_loader.parquet_loader import load_klines_range
-from backtester.data_preprocessor.column_filter import drop_unused_columns
+from backtester.data_loader.frame_cache import frame_cache
+from backtester.data_loader.hot_tier import refresh_hot_tier
+from backtester.data_loader.parquet_loader import (
+    get_prefix_fingerprint, get_series_key, load_klines_matrix
+)
+from backtester.data_loader.partitions import TimeBound
+from backtester.data_loader.timeframes import get_timeframes_fingerprint, load_timeframes
+from backtester.halving import run_successive_halving
 from backtester.portfolio import create_portfolio, create_multi_asset_portfolio
-from backtester.strategies import strategies
+from backtester.robustness import run_robustness_analysis
+from backtester.strategies import registry
+from backtester.strategies.indicator_cache import indicator_cache
+from backtester.strategies.streaming import STRATEGY_STREAMS, run_strategy_incremental
+from backtester.sweep import DEFAULT_SWEEP_METRICS, ParamRange, evaluate_signals, run_parameter_sweep
+from backtester.walk_forward import run_walk_forward
+from settings import HOT_TIER_ENABLED, STREAM_CHECKPOINTS_ENABLED
 from utils.path_utils import create_csv_path, create_plot_path
 from utils.plot_utils import create_multi_asset_result_plot, save_multi_plot_image, save_single_plot_image
-from utils.stats_utils import create_symbol_stats, save_stats_to_csv
+from utils.stats_utils import (
+    create_symbol_stats, save_equity_to_csv, save_fold_stats_to_csv, save_robustness_to_csv, save_stats_to_csv,
+    save_sweep_to_csv
+)
+from utils.usage_utils import record_backtest_request
+
+COMPUTE_DTYPE: str = "float64"
+
+# Hot tier refresh running in the background, if any; requests arriving meanwhile do not start another
+_hot_tier_refresh: Optional[asyncio.Future] = None
+
+
+def _log_hot_tier_refresh(future: asyncio.Future) -> None:
+    """Logs the failure of a background hot tier refresh, which no caller awaits."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"Error refreshing the hot tier: {future.exception()}")
+
+
+def _schedule_hot_tier_refresh() -> None:
+    """Starts a hot tier refresh in the default executor unless one is still in flight."""
+    global _hot_tier_refresh
+    if _hot_tier_refresh is not None and not _hot_tier_refresh.done():
+        return
+    _hot_tier_refresh = asyncio.get_running_loop().run_in_executor(None, refresh_hot_tier)
+    _hot_tier_refresh.add_done_callback(_log_hot_tier_refresh)
 
 
 async def run_backtest(
         asset: Union[str, List[str]],
         selected_interval: str,
-        start_date: str,
-        end_date: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
         selected_strategy: str,
         strategy_params: Dict,
         portfolio_params: Dict
 ):
 
-    """Runs a backtest for either single or multiple assets based on input type."""
+    """
+    Runs a backtest for either single or multiple assets based on input type.
+    Start and end are dates ('YYYY-MM-DD', whole days) or datetimes for intraday ranges.
+    """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
     logger.info(f"Backtest Starting for {asset} on range {start_date} - {end_date}, interval: {selected_interval}: {selected_strategy} with params: {strategy_params}")
     logger.info(f"Portfolio: {portfolio_params}")
     try:
+        record_backtest_request(asset if isinstance(asset, list) else [asset], selected_interval)
+        if HOT_TIER_ENABLED:
+            _schedule_hot_tier_refresh()
+
         if isinstance(asset, list) and len(asset) > 0:
             return await run_backtest_multi(
                 asset, selected_interval, start_date, end_date, selected_strategy, strategy_params, portfolio_params, timestamp
@@ -42,11 +87,62 @@ async def run_backtest(
         return {"error": f"Error occurred while running backtest. Check logs for details"}
 
 
+def _required_timeframes(strategy_names: List[str]) -> Dict[str, List[str]]:
+    """Fields the strategies read per higher interval."""
+    timeframes = {}
+    for strategy_name in strategy_names:
+        for interval, fields in registry.get_required_timeframes(strategy_name).items():
+            timeframes.setdefault(interval, [])
+            timeframes[interval] += [field for field in fields if field not in timeframes[interval]]
+    return timeframes
+
+
+def _load_strategy_data(
+        symbols: List[str],
+        interval: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
+        strategy_names: List[str]
+) -> Dict:
+    """
+    Loads only the fields the strategies read, on the selected interval and on their higher
+    timeframes (stored ones are loaded, others resampled from the selected interval).
+    """
+    fields = list(dict.fromkeys(field for strategy_name in strategy_names for field in registry.get_required_fields(strategy_name)))
+    data = load_klines_matrix(symbols, interval, start_date, end_date, fields)
+    # Compact mode stores and caches float32, indicators are computed in float64
+    data = {col: matrix.astype(COMPUTE_DTYPE, copy=False) for col, matrix in data.items()}
+    timeframes = load_timeframes(symbols, interval, start_date, end_date, _required_timeframes(strategy_names), data)
+    data.update({key: matrix.astype(COMPUTE_DTYPE, copy=False) for key, matrix in timeframes.items()})
+    return data
+
+
+def _run_strategy(
+        strategy_name: str,
+        data: Dict,
+        strategy_params: Dict,
+        symbols: List[str],
+        interval: str,
+        start_date: TimeBound,
+        fingerprint: str
+) -> Dict:
+    """Runs a strategy from its stream checkpoint when enabled, otherwise through the indicator cache."""
+    if STREAM_CHECKPOINTS_ENABLED and strategy_name in STRATEGY_STREAMS:
+        return run_strategy_incremental(
+            strategy_name, data, strategy_params, get_series_key(symbols, interval, start_date),
+            lambda last_timestamp: get_prefix_fingerprint(symbols, interval, start_date, last_timestamp)
+        )
+
+    data = registry.run_strategy(strategy_name, data, strategy_params, fingerprint)
+    indicator_cache.log_stats()
+    return data
+
+
 async def run_backtest_single(
         symbol: str,
         interval: str,
-        start_date: str,
-        end_date: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
         strategy_name: str,
         strategy_params: Dict,
         portfolio_params: Dict,
@@ -54,25 +150,24 @@ async def run_backtest_single(
 ):
     """Runs a single-asset backtest and saves results."""
 
-    df = load_klines_range(symbol=symbol, interval=interval, start_date=start_date, end_date=end_date)
-    # TODO: move drop_unusused_columns to strategy function
-    df = drop_unused_columns(df, ["high", "low", "close"])
-    df = df.reset_index().set_index("timestamp").drop(columns=["symbol"])
-
-    strategy_single_mapping = {
-        "sma_rsi": strategies.strategy_sma_rsi_single,
-        "macd": strategies.strategy_macd_single,
-        "bollinger_bands": strategies.strategy_bollinger_bands_single,
-        "stochastic": strategies.strategy_stochastic_single,
-        "atr_breakout": strategies.strategy_atr_breakout_single
-    }
-
-    if strategy_name in strategy_single_mapping:
-        df = strategy_single_mapping[strategy_name](df, strategy_params)
-    else:
+    if strategy_name not in registry.STRATEGY_REGISTRY:
         return {"error": f"Strategy {strategy_name} not found"}
+    interval_error = registry.get_interval_error(strategy_name, interval)
+    if interval_error:
+        return {"error": interval_error}
+    strategy_params = registry.resolve_params(strategy_name, strategy_params)
+
+    fingerprint = get_timeframes_fingerprint(
+        [symbol], interval, start_date, end_date, registry.get_required_timeframes(strategy_name)
+    )
+    data = await asyncio.to_thread(_load_strategy_data, [symbol], interval, start_date, end_date, [strategy_name])
+    frame_cache.log_stats()
 
-    portfolio = create_portfolio(df, portfolio_params, freq=interval)
+    data = await asyncio.to_thread(
+        _run_strategy, strategy_name, data, strategy_params, [symbol], interval, start_date, fingerprint
+    )
+
+    portfolio = create_portfolio(data, portfolio_params, freq=interval)
 
     plot_path = create_plot_path([symbol], strategy_name, timestamp)
     save_single_plot_image(portfolio, plot_path)
@@ -90,8 +185,8 @@ async def run_backtest_single(
 async def run_backtest_multi(
         symbols: List[str],
         interval: str,
-        start_date: str,
-        end_date: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
         strategy_name: str,
         strategy_params: Dict,
         portfolio_params: Dict,
@@ -99,26 +194,24 @@ async def run_backtest_multi(
 ):
     """Runs a multi-asset backtest and saves results."""
 
-    df_list = [load_klines_range(symbol=s, interval=interval, start_date=start_date, end_date=end_date) for s in symbols]
-    df = pd.concat(df_list)
+    if strategy_name not in registry.STRATEGY_REGISTRY:
+        return {"error": f"Strategy {strategy_name} not found"}
+    interval_error = registry.get_interval_error(strategy_name, interval)
+    if interval_error:
+        return {"error": interval_error}
+    strategy_params = registry.resolve_params(strategy_name, strategy_params)
 
-    df = drop_unused_columns(df, ["high", "low", "close"])
+    fingerprint = get_timeframes_fingerprint(
+        symbols, interval, start_date, end_date, registry.get_required_timeframes(strategy_name)
+    )
+    data = await asyncio.to_thread(_load_strategy_data, symbols, interval, start_date, end_date, [strategy_name])
+    frame_cache.log_stats()
 
-    # TODO: remove duplication, add better strategy management
-    strategy_multi_mapping = {
-        "sma_rsi": strategies.strategy_sma_rsi_multi,
-        "macd": strategies.strategy_macd_multi,
-        "bollinger_bands": strategies.strategy_bollinger_bands_multi,
-        "stochastic": strategies.strategy_stochastic_multi,
-        "atr_breakout": strategies.strategy_atr_breakout_multi
-    }
+    data = await asyncio.to_thread(
+        _run_strategy, strategy_name, data, strategy_params, symbols, interval, start_date, fingerprint
+    )
 
-    if strategy_name in strategy_multi_mapping:
-        df = strategy_multi_mapping[strategy_name](df, strategy_params)
-    else:
-        return {"error": f"Strategy {strategy_name} not found"}
-
-    portfolio = create_multi_asset_portfolio(df, portfolio_params, freq=interval)
+    portfolio = create_multi_asset_portfolio(data, portfolio_params, freq=interval)
 
     portfolio_symbols = portfolio.wrapper.columns.to_list()
 
@@ -134,3 +227,256 @@ async def run_backtest_multi(
         "result_path": stats_path,
         "plot_path": plot_path
     }
+
+
+async def run_sweep(
+        asset: Union[str, List[str]],
+        selected_interval: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
+        selected_strategy: str,
+        param_ranges: Dict[str, ParamRange],
+        portfolio_params: Dict,
+        metrics: Optional[List[str]] = None,
+        sort_by: Optional[str] = None
+):
+    """
+    Backtests all combinations of strategy parameter ranges in one vectorized pass and saves
+    the ranked metrics (e.g. param_ranges={'short_window': {'start': 5, 'stop': 50}, 'long_window': [50, 100, 200]}).
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+    symbols = asset if isinstance(asset, list) else [asset]
+    logger.info(f"Sweep Starting for {symbols} on range {start_date} - {end_date}, interval: {selected_interval}: {selected_strategy} with ranges: {param_ranges}")
+    try:
+        if selected_strategy not in registry.STRATEGY_REGISTRY:
+            return {"error": f"Strategy {selected_strategy} not found"}
+        interval_error = registry.get_interval_error(selected_strategy, selected_interval)
+        if interval_error:
+            return {"error": interval_error}
+
+        data = await asyncio.to_thread(
+            _load_strategy_data, symbols, selected_interval, start_date, end_date, [selected_strategy]
+        )
+
+        sweep_results = await asyncio.to_thread(
+            run_parameter_sweep, data, selected_strategy, param_ranges, portfolio_params, selected_interval,
+            metrics, sort_by
+        )
+
+        result_path = create_csv_path(symbols, f"{selected_strategy}_sweep", timestamp)
+        save_sweep_to_csv(sweep_results, result_path)
+
+        return {"result_path": result_path, "best": sweep_results.head(10)}
+    except Exception as e:
+        logger.error(f"Error running sweep: {e}")
+        return {"error": f"Error occurred while running sweep. Check logs for details"}
+
+
+async def run_walk_forward_backtest(
+        asset: Union[str, List[str]],
+        selected_interval: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
+        selected_strategy: str,
+        param_ranges: Dict[str, ParamRange],
+        portfolio_params: Dict,
+        train_period: str,
+        test_period: str,
+        mode: str = "rolling",
+        metric: str = "sharpe_ratio"
+):
+    """
+    Runs a walk-forward optimization (e.g. train_period='180D', test_period='30D') and saves the
+    per-fold stats and the stitched out-of-sample equity.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+    symbols = asset if isinstance(asset, list) else [asset]
+    logger.info(f"Walk-forward Starting for {symbols} on range {start_date} - {end_date}, interval: {selected_interval}: {selected_strategy} with ranges: {param_ranges}, train {train_period}, test {test_period}, {mode}")
+    try:
+        if selected_strategy not in registry.STRATEGY_REGISTRY:
+            return {"error": f"Strategy {selected_strategy} not found"}
+        interval_error = registry.get_interval_error(selected_strategy, selected_interval)
+        if interval_error:
+            return {"error": interval_error}
+
+        data = await asyncio.to_thread(
+            _load_strategy_data, symbols, selected_interval, start_date, end_date, [selected_strategy]
+        )
+
+        fold_stats, equity = await asyncio.to_thread(
+            run_walk_forward, data, selected_strategy, param_ranges, portfolio_params, selected_interval,
+            train_period, test_period, mode, metric
+        )
+
+        result_path = create_csv_path(symbols, f"{selected_strategy}_walk_forward", timestamp)
+        save_fold_stats_to_csv(fold_stats, result_path)
+        equity_path = create_csv_path(symbols, f"{selected_strategy}_walk_forward_equity", timestamp)
+        save_equity_to_csv(equity, equity_path)
+
+        return {"result_path": result_path, "equity_path": equity_path}
+    except Exception as e:
+        logger.error(f"Error running walk-forward: {e}")
+        return {"error": f"Error occurred while running walk-forward. Check logs for details"}
+
+
+async def run_halving_search(
+        asset: Union[str, List[str]],
+        selected_interval: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
+        selected_strategy: str,
+        param_ranges: Dict[str, ParamRange],
+        portfolio_params: Dict,
+        metric: str = "sharpe_ratio",
+        eta: int = 3,
+        min_fraction: float = 1 / 9,
+        n_candidates: Optional[int] = None
+):
+    """
+    Searches large parameter spaces by successive halving: candidates are backtested on growing
+    prefixes of the range and only the best 1/eta survive each rung. Saves the full-range metrics
+    of the final candidates and returns them with the search report (evaluations, wall time).
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+    symbols = asset if isinstance(asset, list) else [asset]
+    logger.info(f"Halving search Starting for {symbols} on range {start_date} - {end_date}, interval: {selected_interval}: {selected_strategy} with ranges: {param_ranges}")
+    try:
+        if selected_strategy not in registry.STRATEGY_REGISTRY:
+            return {"error": f"Strategy {selected_strategy} not found"}
+        interval_error = registry.get_interval_error(selected_strategy, selected_interval)
+        if interval_error:
+            return {"error": interval_error}
+
+        data = await asyncio.to_thread(
+            _load_strategy_data, symbols, selected_interval, start_date, end_date, [selected_strategy]
+        )
+
+        search_results, report = await asyncio.to_thread(
+            run_successive_halving, data, selected_strategy, param_ranges, portfolio_params, selected_interval,
+            metric, eta, min_fraction, n_candidates
+        )
+
+        result_path = create_csv_path(symbols, f"{selected_strategy}_halving", timestamp)
+        save_sweep_to_csv(search_results, result_path)
+
+        return {"result_path": result_path, "best": search_results.head(10), "report": report}
+    except Exception as e:
+        logger.error(f"Error running halving search: {e}")
+        return {"error": f"Error occurred while running halving search. Check logs for details"}
+
+
+def _evaluate_batch(
+        data: Dict,
+        runs: List[Dict],
+        portfolio_params: Dict,
+        interval: str,
+        metrics: List[str]
+) -> pd.DataFrame:
+    """Runs a batch of strategies on the same data and computes the metrics of every run."""
+    outputs = registry.run_strategies(data, [(run["strategy"], run.get("params", {})) for run in runs])
+    return evaluate_signals(outputs, portfolio_params, interval, metrics)
+
+
+async def run_strategy_batch(
+        asset: Union[str, List[str]],
+        selected_interval: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
+        runs: List[Dict],
+        portfolio_params: Dict,
+        metrics: Optional[List[str]] = None
+):
+    """
+    Backtests a batch of strategies on the same data and saves one row of metrics per run
+    (e.g. runs=[{'strategy': 'ema_cross_rsi', 'params': {'fast_window': 8}}, {'strategy': 'sma_rsi', 'params': {}}]).
+    Indicators shared by the expression strategies of the batch are computed once.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+    symbols = asset if isinstance(asset, list) else [asset]
+    logger.info(f"Strategy batch Starting for {symbols} on range {start_date} - {end_date}, interval: {selected_interval}: {len(runs)} runs")
+    try:
+        unknown = [run["strategy"] for run in runs if run["strategy"] not in registry.STRATEGY_REGISTRY]
+        if unknown:
+            return {"error": f"Strategies {', '.join(unknown)} not found"}
+        interval_errors = [registry.get_interval_error(strategy_name, selected_interval)
+                           for strategy_name in dict.fromkeys(run["strategy"] for run in runs)]
+        interval_errors = [error for error in interval_errors if error]
+        if interval_errors:
+            return {"error": "; ".join(interval_errors)}
+
+        data = await asyncio.to_thread(
+            _load_strategy_data, symbols, selected_interval, start_date, end_date, [run["strategy"] for run in runs]
+        )
+
+        batch_results = await asyncio.to_thread(
+            _evaluate_batch, data, runs, portfolio_params, selected_interval, metrics or DEFAULT_SWEEP_METRICS
+        )
+        positions = batch_results.index.get_level_values("run") if len(symbols) > 1 else batch_results.index
+        batch_results.insert(0, "strategy", [runs[position]["strategy"] for position in positions])
+        batch_results.insert(1, "params", [registry.resolve_params(runs[position]["strategy"], runs[position].get("params", {}))
+                                           for position in positions])
+
+        result_path = create_csv_path(symbols, "strategy_batch", timestamp)
+        save_sweep_to_csv(batch_results, result_path)
+
+        return {"result_path": result_path, "results": batch_results}
+    except Exception as e:
+        logger.error(f"Error running strategy batch: {e}")
+        return {"error": f"Error occurred while running strategy batch. Check logs for details"}
+
+
+async def run_robustness_backtest(
+        asset: Union[str, List[str]],
+        selected_interval: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
+        selected_strategy: str,
+        strategy_params: Dict,
+        portfolio_params: Dict,
+        method: str = "bootstrap",
+        n_resamples: int = 10_000,
+        block_size: Optional[int] = None,
+        confidence: float = 0.95
+):
+    """
+    Runs a backtest and resamples its bar returns ('bootstrap') or trade returns ('trades')
+    n_resamples times; saves the confidence intervals of total return, Sharpe ratio and max
+    drawdown per symbol next to the observed values.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+    symbols = asset if isinstance(asset, list) else [asset]
+    logger.info(f"Robustness analysis Starting for {symbols} on range {start_date} - {end_date}, interval: {selected_interval}: {selected_strategy} with params: {strategy_params}, {n_resamples} {method} resamples")
+    try:
+        if selected_strategy not in registry.STRATEGY_REGISTRY:
+            return {"error": f"Strategy {selected_strategy} not found"}
+        interval_error = registry.get_interval_error(selected_strategy, selected_interval)
+        if interval_error:
+            return {"error": interval_error}
+        strategy_params = registry.resolve_params(selected_strategy, strategy_params)
+
+        fingerprint = get_timeframes_fingerprint(
+            symbols, selected_interval, start_date, end_date, registry.get_required_timeframes(selected_strategy)
+        )
+        data = await asyncio.to_thread(
+            _load_strategy_data, symbols, selected_interval, start_date, end_date, [selected_strategy]
+        )
+
+        data = await asyncio.to_thread(
+            _run_strategy, selected_strategy, data, strategy_params, symbols, selected_interval, start_date, fingerprint
+        )
+        if isinstance(asset, list):
+            portfolio = create_multi_asset_portfolio(data, portfolio_params, freq=selected_interval)
+        else:
+            portfolio = create_portfolio(data, portfolio_params, freq=selected_interval)
+
+        robustness = await asyncio.to_thread(
+            run_robustness_analysis, portfolio, selected_interval, method, n_resamples, block_size, confidence
+        )
+
+        result_path = create_csv_path(symbols, f"{selected_strategy}_robustness", timestamp)
+        save_robustness_to_csv(robustness, result_path)
+
+        return {"result_path": result_path, "robustness": robustness}
+    except Exception as e:
+        logger.error(f"Error running robustness analysis: {e}")
+        return {"error": f"Error occurred while running robustness analysis. Check logs for details"}
@@ -0,0 +1,141 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from logger.config import logger
+from settings import LOADER_CACHE_BYTES
+
+CacheKey = Tuple[str, str, pd.Timestamp, pd.Timestamp, Optional[Tuple[str, ...]]]
+
+
+def _covers(key: CacheKey, symbol: str, interval: str, window_start: pd.Timestamp, window_end: pd.Timestamp,
+            columns: Optional[List[str]]) -> bool:
+    """Whether a cached frame holds all requested klines and columns."""
+    cached_symbol, cached_interval, cached_start, cached_end, cached_columns = key
+    return (
+        cached_symbol == symbol
+        and cached_interval == interval
+        and cached_start <= window_start
+        and window_end <= cached_end
+        and (cached_columns is None or (columns is not None and set(columns) <= set(cached_columns)))
+    )
+
+
+def _slice_frame(df: pd.DataFrame, window_start: pd.Timestamp, window_end: pd.Timestamp,
+                 columns: Optional[List[str]]) -> pd.DataFrame:
+    """Cuts the [window_start, window_end) klines and the requested columns out of a single-symbol frame."""
+    timestamps = df.index.get_level_values("timestamp")
+    start, end = timestamps.searchsorted(window_start), timestamps.searchsorted(window_end)
+
+    sliced = df.iloc[start:end]
+    if columns is not None:
+        sliced = sliced[list(columns)]
+    return sliced.copy()
+
+
+class FrameCache:
+    """
+    Process-wide LRU cache of loaded kline frames with a byte budget.
+
+    Entries are tagged with the catalog data version of their symbol and interval and are
+    dropped once the fetcher records new or removed partitions. Requests for a sub-range or
+    a subset of columns of a cached frame are sliced from it instead of being re-read.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[pd.DataFrame, int, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _drop(self, key: CacheKey) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, symbol: str, interval: str, window_start: pd.Timestamp, window_end: pd.Timestamp,
+            columns: Optional[List[str]], version: int) -> Optional[pd.DataFrame]:
+        """
+        Returns a copy of the requested klines if a cached frame covers them, None otherwise.
+
+        Args:
+            symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+            interval (str): Interval of klines (e.g., '1m', '1h').
+            window_start (pd.Timestamp): First timestamp of the window.
+            window_end (pd.Timestamp): End of the window (exclusive).
+            columns (Optional[List[str]]): Requested data columns; all columns if None.
+            version (int): Current catalog data version of the symbol and interval.
+
+        Returns:
+            Optional[pd.DataFrame]: Klines indexed by ('symbol', 'timestamp') or None on a miss.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                df, _, cached_version = self._entries[key]
+                if key[:2] != (symbol, interval):
+                    continue
+                if cached_version != version:
+                    self._drop(key)
+                    continue
+                if _covers(key, symbol, interval, window_start, window_end, columns):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    break
+            else:
+                self.misses += 1
+                return None
+
+        return _slice_frame(df, window_start, window_end, columns)
+
+    def put(self, symbol: str, interval: str, window_start: pd.Timestamp, window_end: pd.Timestamp,
+            columns: Optional[List[str]], version: int, df: pd.DataFrame) -> None:
+        """
+        Stores a loaded frame, evicting the least recently used frames beyond the byte budget.
+        Frames larger than the whole budget are not cached.
+        """
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return
+
+        key = (symbol, interval, window_start, window_end, None if columns is None else tuple(sorted(columns)))
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+            self._entries[key] = (df, size, version)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drops all cached frames."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss/eviction counters and the current cache size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        logger.debug(
+            f"Kline cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions, "
+            f"{stats['entries']} frames, {stats['bytes'] / 2 ** 20:.1f} MiB"
+        )
+
+
+frame_cache = FrameCache(LOADER_CACHE_BYTES)
@@ -0,0 +1,164 @@
+import os
+import threading
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from backtester.data_loader.partitions import to_frame
+from fetcher.config import data_enums
+from fetcher.data_processing import table_proc
+from logger.config import logger
+from settings import HOT_TIER_ENABLED, HOT_TIER_MAX_SERIES, HOT_TIER_MIN_REQUESTS
+from utils import catalog, path_utils, usage_utils
+
+VERSION_METADATA_KEY = b"data_version"
+
+_refresh_lock = threading.Lock()
+
+
+def _open_hot_file(file_path: str) -> pa.Table:
+    """Memory-maps an Arrow IPC file; the returned table references the mapped pages without copying."""
+    return pa.ipc.open_file(pa.memory_map(file_path)).read_all()
+
+
+def get_hot_file_version(symbol: str, interval: str) -> Optional[int]:
+    """Returns the catalog data version a hot file was built from, None if the series is not hot."""
+    file_path = path_utils.get_hot_path(symbol, interval)
+    if not os.path.exists(file_path):
+        return None
+
+    metadata = pa.ipc.open_file(pa.memory_map(file_path)).schema.metadata or {}
+    return int(metadata.get(VERSION_METADATA_KEY, -1))
+
+
+def build_hot_file(symbol: str, interval: str) -> Optional[str]:
+    """
+    Writes every catalogued kline of a series into one uncompressed Arrow IPC file,
+    sorted by timestamp and stored as a single record batch.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h').
+
+    Returns:
+        Optional[str]: Path to the hot file, None if the series has no data.
+    """
+    ranges = catalog.get_available_ranges(symbol, interval)
+    if not ranges:
+        return None
+
+    version = catalog.get_data_version(symbol, interval)
+    file_paths, _ = catalog.get_partition_files(symbol, interval, ranges[0][0], ranges[-1][1])
+
+    table = table_proc.to_storage_types(ds.dataset(file_paths, format="parquet").to_table()).sort_by("timestamp")
+    timestamps = table["timestamp"].cast(pa.int64()).to_numpy()
+    keep = np.append(timestamps[1:] != timestamps[:-1], True)
+    if not keep.all():
+        table = table.filter(pa.array(keep))
+
+    metadata = dict(table.schema.metadata or {})
+    metadata[VERSION_METADATA_KEY] = str(version).encode()
+    table = table.combine_chunks().replace_schema_metadata(metadata)
+
+    file_path = path_utils.create_hot_path(symbol, interval)
+    tmp_path = f"{file_path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+    os.replace(tmp_path, file_path)
+
+    return file_path
+
+
+def read_hot_file(
+        symbol: str,
+        interval: str,
+        window_start: pd.Timestamp,
+        window_end: pd.Timestamp,
+        columns: Optional[List[str]],
+        version: int
+) -> Optional[pd.DataFrame]:
+    """
+    Loads a time window of a hot series from its memory-mapped Arrow IPC file.
+    The window is cut by binary search on the sorted timestamps, and numeric columns
+    are handed to pandas without copying, so processes share the pages via the OS page cache.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h').
+        window_start (pd.Timestamp): First timestamp of the window.
+        window_end (pd.Timestamp): End of the window (exclusive).
+        columns (Optional[List[str]]): Data columns to load; all columns if None.
+        version (int): Current catalog data version of the series.
+
+    Returns:
+        Optional[pd.DataFrame]: Klines indexed by ('symbol', 'timestamp'), None if the series is
+        not hot or its hot file is older than the catalog.
+    """
+    file_path = path_utils.get_hot_path(symbol, interval)
+    if not os.path.exists(file_path):
+        return None
+
+    try:
+        table = _open_hot_file(file_path)
+    except (OSError, pa.ArrowInvalid) as e:
+        logger.warning(f"Unreadable hot file {file_path}, falling back to Parquet: {e}")
+        return None
+
+    if int((table.schema.metadata or {}).get(VERSION_METADATA_KEY, -1)) != version:
+        return None
+
+    timestamps = table["timestamp"].chunk(0).to_numpy() if table.num_rows else np.array([], "datetime64[ns]")
+    start = timestamps.searchsorted(window_start.to_datetime64())
+    end = timestamps.searchsorted(window_end.to_datetime64())
+
+    table = table.slice(start, end - start)
+    if columns is not None:
+        table = table.select(list(columns) + data_enums.INDEX_COLUMNS)
+
+    return to_frame(table)
+
+
+def refresh_hot_tier() -> List[str]:
+    """
+    Promotes the most requested series (by backtest request counts) to the hot tier,
+    rebuilds hot files that are older than the catalog and demotes the rest.
+    Does nothing unless HOT_TIER_ENABLED is set or while another refresh is running.
+
+    Returns:
+        List[str]: Hot series as 'SYMBOL/interval' keys.
+    """
+    if not HOT_TIER_ENABLED or not _refresh_lock.acquire(blocking=False):
+        return []
+
+    try:
+        usage = usage_utils.load_usage()
+        popular = sorted(
+            (key for key, count in usage.items() if count >= HOT_TIER_MIN_REQUESTS),
+            key=lambda key: -usage[key]
+        )[:HOT_TIER_MAX_SERIES]
+
+        hot_series = []
+        for key in popular:
+            symbol, interval = key.split("/", 1)
+            try:
+                if get_hot_file_version(symbol, interval) != catalog.get_data_version(symbol, interval):
+                    if build_hot_file(symbol, interval) is None:
+                        continue
+                    logger.info(f"Promoted {symbol} on {interval} to the hot tier")
+                hot_series.append(key)
+            except Exception as e:
+                logger.error(f"Error promoting {symbol} on {interval} to the hot tier: {e}")
+
+        hot_paths = {path_utils.get_hot_path(*key.split("/", 1)) for key in hot_series}
+        for file_path in path_utils.get_hot_paths():
+            if file_path not in hot_paths:
+                os.remove(file_path)
+                logger.info(f"Demoted {file_path} from the hot tier")
+
+        return hot_series
+    finally:
+        _refresh_lock.release()
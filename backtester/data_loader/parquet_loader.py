@@ -1,9 +1,21 @@
-import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
 import pandas as pd
-from typing import List
 
-from settings import DATE_FORMAT
-from utils import path_utils
+from backtester.data_loader.frame_cache import frame_cache
+from backtester.data_loader.hot_tier import read_hot_file
+from backtester.data_loader.partitions import TimeBound, read_partition_files, resolve_partition_files, to_time_window
+from fetcher.config import data_enums
+from settings import COMPACT_MODE, DATE_FORMAT, HOT_TIER_ENABLED
+from utils import catalog
+
+
+GAP_POLICIES: List[str] = ["ffill", "keep", "drop"]
+
+MATRIX_LOAD_THREADS: int = 8
 
 
 def load_daily_klines(symbol: str, interval: str, date: str) -> pd.DataFrame:
@@ -18,35 +30,206 @@ def load_daily_klines(symbol: str, interval: str, date: str) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame for the requested day.
     """
-    file_path = path_utils.get_parquet_path(symbol, interval, date)
+    return load_klines_range(symbol, interval, date, date)
 
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Parquet file not found: {file_path}")
 
-    return pd.read_parquet(file_path)
-
-
-def load_klines_range(symbol: str, interval: str, start_date: str, end_date: str) -> pd.DataFrame:
+def load_klines_range(
+        symbol: str,
+        interval: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
+        columns: Optional[List[str]] = None
+) -> pd.DataFrame:
     """
-    Loads multiple days of Parquet data into a single DataFrame.
+    Loads klines of a date or datetime range into a single DataFrame.
+    Reads daily as well as compacted monthly/yearly partitions, serving repeated and
+    overlapping requests from the in-process frame cache and popular series from the hot tier.
 
     Args:
         symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
         interval (str): Interval of klines (e.g., '1m', '1h', '1d').
-        start_date (str): Start date in 'YYYY-MM-DD' format.
-        end_date (str): End date in 'YYYY-MM-DD' format.
+        start_date (TimeBound): Start date in 'YYYY-MM-DD' format or a datetime (e.g., '2024-03-05 18:00').
+        end_date (TimeBound): End date in 'YYYY-MM-DD' format (whole day included) or a datetime (inclusive).
+        columns (Optional[List[str]]): Data columns to load (e.g., ['high', 'low', 'close']); all if None.
 
     Returns:
         pd.DataFrame: Merged DataFrame containing requested data.
     """
-    date_range = pd.date_range(start=start_date, end=end_date, freq="D")
-    data_frames: List[pd.DataFrame] = []
+    window_start, window_end = to_time_window(start_date, end_date)
+
+    version = None
+    if frame_cache.max_bytes > 0 or HOT_TIER_ENABLED:
+        version = catalog.get_data_version(symbol, interval)
+
+    if frame_cache.max_bytes > 0:
+        df = frame_cache.get(symbol, interval, window_start, window_end, columns, version)
+        if df is not None:
+            return df
+
+    last_day = (window_end - pd.Timedelta(1, unit="ns")).strftime(DATE_FORMAT)
+    file_paths = resolve_partition_files(symbol, interval, window_start.strftime(DATE_FORMAT), last_day)
+
+    df = None
+    if HOT_TIER_ENABLED:
+        df = read_hot_file(symbol, interval, window_start, window_end, columns, version)
+    if df is None:
+        df = read_partition_files(file_paths, window_start, window_end, columns)
+
+    if frame_cache.max_bytes > 0:
+        frame_cache.put(symbol, interval, window_start, window_end, columns, version, df)
+        df = df.copy()
+
+    return df
+
+
+def get_data_fingerprint(
+        symbols: List[str],
+        interval: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
+        gaps: str = "ffill"
+) -> str:
+    """
+    Identifies the matrices load_klines_matrix would return without loading them: symbols,
+    interval, time window, gap policy, storage precision and the catalog data version of every
+    series. The fingerprint changes as soon as the fetcher records new or removed partitions.
+
+    Args:
+        symbols (List[str]): Trading pair symbols (e.g., ['BTCUSDT', 'ETHUSDT']).
+        interval (str): Interval of klines (e.g., '1m', '1h', '1d').
+        start_date (TimeBound): Start date in 'YYYY-MM-DD' format or a datetime.
+        end_date (TimeBound): End date in 'YYYY-MM-DD' format (whole day included) or a datetime (inclusive).
+        gaps (str): Gap handling policy, one of GAP_POLICIES.
+
+    Returns:
+        str: Hex digest of the inputs.
+    """
+    window_start, window_end = to_time_window(start_date, end_date)
+    versions = [catalog.get_data_version(symbol, interval) for symbol in symbols]
+    payload = repr((list(symbols), interval, window_start.value, window_end.value, gaps, COMPACT_MODE, versions))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_series_key(symbols: List[str], interval: str, start_date: TimeBound, gaps: str = "ffill") -> str:
+    """
+    Identifies a series that grows at its end: symbols, interval, start, gap policy and storage
+    precision, but neither the end nor the data versions.
+
+    Returns:
+        str: Hex digest of the inputs.
+    """
+    window_start, _ = to_time_window(start_date, start_date)
+    payload = repr((list(symbols), interval, window_start.value, gaps, COMPACT_MODE))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_prefix_fingerprint(
+        symbols: List[str],
+        interval: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
+        gaps: str = "ffill"
+) -> str:
+    """
+    Identifies the stored klines of a window by the checksums of the catalogued partitions it
+    covers. Unlike get_data_fingerprint, it does not change when later days are fetched, only
+    when partitions within the window are rewritten, compacted or dropped.
+
+    Args:
+        symbols (List[str]): Trading pair symbols (e.g., ['BTCUSDT', 'ETHUSDT']).
+        interval (str): Interval of klines (e.g., '1m', '1h', '1d').
+        start_date (TimeBound): Start date in 'YYYY-MM-DD' format or a datetime.
+        end_date (TimeBound): End date in 'YYYY-MM-DD' format (whole day included) or a datetime (inclusive).
+        gaps (str): Gap handling policy, one of GAP_POLICIES.
+
+    Returns:
+        str: Hex digest of the inputs.
+    """
+    window_start, window_end = to_time_window(start_date, end_date)
+    first_day = window_start.strftime(DATE_FORMAT)
+    last_day = (window_end - pd.Timedelta(1, unit="ns")).strftime(DATE_FORMAT)
+    partitions = [
+        sorted((date, row["sha256"], row["rows"]) for date, row in catalog.get_partitions(symbol, interval, first_day, last_day).items())
+        for symbol in symbols
+    ]
+    payload = repr((list(symbols), interval, window_start.value, window_end.value, gaps, COMPACT_MODE, partitions))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _align_timestamps(timestamps: List[np.ndarray], gaps: str) -> np.ndarray:
+    """Builds the shared time axis: the union of all timestamps, or their intersection when dropping gaps."""
+    if gaps == "drop":
+        common = timestamps[0]
+        for symbol_timestamps in timestamps[1:]:
+            common = np.intersect1d(common, symbol_timestamps, assume_unique=True)
+        return common
+    return np.unique(np.concatenate(timestamps))
+
+
+def load_klines_matrix(
+        symbols: List[str],
+        interval: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
+        columns: List[str],
+        gaps: str = "ffill"
+) -> Dict[str, pd.DataFrame]:
+    """
+    Loads klines of several symbols as timestamp-aligned time x symbol matrices, one per column,
+    all sharing one DatetimeIndex. Symbols are loaded concurrently and written straight into
+    preallocated arrays, so no long-format concat or unstack is needed.
+
+    Gap handling (timestamps present for some symbols only):
+        - 'ffill': prices are forward-filled (gaps before a symbol's first kline stay NaN)
+          and market activity columns are set to 0.
+        - 'keep': gaps stay NaN (NaT for datetime columns).
+        - 'drop': only timestamps present for every symbol are kept.
+
+    Args:
+        symbols (List[str]): Trading pair symbols (e.g., ['BTCUSDT', 'ETHUSDT']).
+        interval (str): Interval of klines (e.g., '1m', '1h', '1d').
+        start_date (TimeBound): Start date in 'YYYY-MM-DD' format or a datetime.
+        end_date (TimeBound): End date in 'YYYY-MM-DD' format (whole day included) or a datetime (inclusive).
+        columns (List[str]): Data columns to load (e.g., ['high', 'low', 'close']).
+        gaps (str): Gap handling policy, one of GAP_POLICIES.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Time x symbol frames keyed by column.
+    """
+    if gaps not in GAP_POLICIES:
+        raise ValueError(f"Invalid gap policy {gaps}. Available policies are: {', '.join(GAP_POLICIES)}.")
+
+    with ThreadPoolExecutor(max_workers=min(len(symbols), MATRIX_LOAD_THREADS)) as executor:
+        frames = list(executor.map(
+            lambda symbol: load_klines_range(symbol, interval, start_date, end_date, columns), symbols
+        ))
+
+    timestamps = [df.index.get_level_values("timestamp").to_numpy() for df in frames]
+    time_axis = _align_timestamps(timestamps, gaps)
+    index = pd.DatetimeIndex(time_axis, name="timestamp")
+    symbol_index = pd.Index(symbols, name="symbol")
+
+    rows = [np.searchsorted(time_axis, symbol_timestamps) for symbol_timestamps in timestamps]
+    if gaps == "drop":
+        present = [np.isin(symbol_timestamps, time_axis, assume_unique=True) for symbol_timestamps in timestamps]
+    else:
+        present = [slice(None)] * len(frames)
 
-    for date in date_range:
-        date_str = date.strftime(DATE_FORMAT)
+    matrices = {}
+    for col in columns:
+        is_datetime = col in data_enums.DATETIME_COLUMNS
+        if is_datetime:
+            values = np.full((len(time_axis), len(symbols)), np.datetime64("NaT", "ns"))
+        else:
+            dtype = frames[0][col].dtype if frames[0][col].dtype.kind == "f" else np.float64
+            values = np.full((len(time_axis), len(symbols)), np.nan, dtype=dtype)
 
-        day_df = load_daily_klines(symbol, interval, date_str)
+        for i, df in enumerate(frames):
+            values[rows[i][present[i]], i] = df[col].to_numpy()[present[i]]
 
-        data_frames.append(day_df)
+        matrix = pd.DataFrame(values, index=index, columns=symbol_index, copy=False)
+        if gaps == "ffill" and not is_datetime:
+            matrix = matrix.fillna(0) if col in data_enums.MARKET_ACTIVITY_COLUMNS else matrix.ffill()
+        matrices[col] = matrix
 
-    return pd.concat(data_frames).sort_index()
+    return matrices
@@ -0,0 +1,133 @@
+from datetime import date, datetime
+from typing import List, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from fetcher.config import data_enums
+from fetcher.data_processing import table_proc
+from settings import COMPACT_MODE, DATE_FORMAT
+from utils import catalog
+
+TimeBound = Union[str, date, datetime]
+
+
+def _is_whole_day(bound: TimeBound) -> bool:
+    """A bound without a time of day ('YYYY-MM-DD', '2024-3-5' or a date) stands for the whole day."""
+    if isinstance(bound, str):
+        try:
+            datetime.strptime(bound.strip(), DATE_FORMAT)
+        except ValueError:
+            return False
+        return True
+    return not isinstance(bound, datetime)
+
+
+def to_time_window(start: TimeBound, end: TimeBound) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    """
+    Converts start and end bounds to a half-open [start, end) timestamp window.
+
+    Args:
+        start (TimeBound): Start date ('YYYY-MM-DD') or datetime (e.g., '2024-03-05 18:00').
+        end (TimeBound): End date, inclusive of the whole day, or datetime, inclusive.
+
+    Returns:
+        Tuple[pd.Timestamp, pd.Timestamp]: Window start and exclusive window end.
+    """
+    window_start = pd.Timestamp(start)
+    window_end = pd.Timestamp(end)
+    window_end += pd.Timedelta(days=1) if _is_whole_day(end) else pd.Timedelta(1, unit="ns")
+
+    if window_start >= window_end:
+        raise ValueError(f"Start {start} must be before end {end}")
+
+    return window_start, window_end
+
+
+def resolve_partition_files(symbol: str, interval: str, start_date: str, end_date: str) -> List[str]:
+    """
+    Resolves the Parquet files (daily or compacted) covering a date range from the catalog.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h', '1d').
+        start_date (str): Start date in 'YYYY-MM-DD' format.
+        end_date (str): End date in 'YYYY-MM-DD' format.
+
+    Returns:
+        List[str]: Distinct file paths in chronological order.
+
+    Raises:
+        FileNotFoundError: If any day of the range is not catalogued.
+    """
+    files, catalogued_days = catalog.get_partition_files(symbol, interval, start_date, end_date)
+    dates = [day.strftime(DATE_FORMAT) for day in pd.date_range(start=start_date, end=end_date, freq="D")]
+
+    if catalogued_days < len(dates):
+        partitions = catalog.get_partitions(symbol, interval, start_date, end_date)
+        missing_dates = [date for date in dates if date not in partitions]
+        available = ", ".join(f"{start} - {end}" for start, end in catalog.get_available_ranges(symbol, interval))
+        raise FileNotFoundError(
+            f"No klines for {symbol} on {interval} for {len(missing_dates)} days "
+            f"({missing_dates[0]} ... {missing_dates[-1]}), available: {available or 'none'}"
+        )
+
+    return files
+
+
+def to_frame(table: pa.Table) -> pd.DataFrame:
+    """
+    Converts a table in the stored layout to a DataFrame indexed by ('symbol', 'timestamp'),
+    with float32 columns and a categorical symbol level in compact mode.
+
+    Args:
+        table (pa.Table): Table read from Parquet or the hot tier.
+
+    Returns:
+        pd.DataFrame: Klines indexed by ('symbol', 'timestamp').
+    """
+    table = table_proc.to_storage_types(table)
+    if COMPACT_MODE:
+        index = table.schema.get_field_index("symbol")
+        table = table.set_column(index, "symbol", pc.dictionary_encode(table["symbol"]))
+    return table.to_pandas(split_blocks=True)
+
+
+def read_partition_files(
+        file_paths: List[str],
+        window_start: pd.Timestamp,
+        window_end: pd.Timestamp,
+        columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Reads Parquet files into one DataFrame through a multi-threaded Arrow dataset scan.
+    Only the requested columns are decoded, and row groups outside the time window are
+    skipped using their timestamp statistics.
+
+    Args:
+        file_paths (List[str]): Files returned by resolve_partition_files.
+        window_start (pd.Timestamp): First timestamp to keep.
+        window_end (pd.Timestamp): End of the window (exclusive), see to_time_window.
+        columns (Optional[List[str]]): Data columns to read; all columns if None.
+
+    Returns:
+        pd.DataFrame: Klines indexed by ('symbol', 'timestamp'), sorted and without duplicates.
+    """
+    timestamp = ds.field("timestamp")
+    start = pa.scalar(window_start, type=pa.timestamp("ns"))
+    end = pa.scalar(window_end, type=pa.timestamp("ns"))
+
+    dataset = ds.dataset(file_paths, format="parquet")
+    table = dataset.to_table(
+        columns=None if columns is None else list(columns) + data_enums.INDEX_COLUMNS,
+        filter=(timestamp >= start) & (timestamp < end),
+        use_threads=True
+    )
+
+    df = to_frame(table)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    return df[~df.index.duplicated(keep="last")]
@@ -0,0 +1,185 @@
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtester.data_loader.parquet_loader import get_data_fingerprint, load_klines_matrix
+from backtester.data_loader.partitions import TimeBound, to_time_window
+from fetcher.config import data_enums
+from logger.config import logger
+from settings import DATE_FORMAT
+from utils import catalog
+
+# Frames of higher timeframes are keyed '<field>@<interval>' next to the base interval's fields
+TIMEFRAME_SEPARATOR: str = "@"
+
+# How klines of the base interval combine into a bar of a higher timeframe
+RESAMPLE_AGGREGATIONS: Dict[str, str] = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    **{col: "sum" for col in data_enums.MARKET_ACTIVITY_COLUMNS},
+}
+
+# Resampled bars open at multiples of the interval since a Monday midnight UTC, like Binance klines
+RESAMPLE_ORIGIN: pd.Timestamp = pd.Timestamp("1970-01-05")
+
+
+def timeframe_key(field: str, interval: str) -> str:
+    """Data key of a field on a higher timeframe (e.g., 'close@1h')."""
+    return f"{field}{TIMEFRAME_SEPARATOR}{interval}"
+
+
+def split_timeframe_key(key: str) -> Tuple[str, Optional[str]]:
+    """Splits a data key into its field and interval; the interval is None for base fields."""
+    field, _, interval = key.partition(TIMEFRAME_SEPARATOR)
+    return field, interval or None
+
+
+def is_range_stored(symbols: List[str], interval: str, start_date: TimeBound, end_date: TimeBound) -> bool:
+    """Whether the catalog has every day of the range for all symbols on an interval."""
+    window_start, window_end = to_time_window(start_date, end_date)
+    first_day = window_start.strftime(DATE_FORMAT)
+    last_day = (window_end - pd.Timedelta(1, unit="ns")).strftime(DATE_FORMAT)
+    n_days = len(pd.date_range(first_day, last_day, freq="D"))
+    return all(catalog.get_partition_files(symbol, interval, first_day, last_day)[1] == n_days for symbol in symbols)
+
+
+def resample_klines_matrix(data: Dict[str, pd.DataFrame], interval: str) -> Dict[str, pd.DataFrame]:
+    """
+    Derives time x symbol frames of a higher timeframe from those of the base interval. Bars are
+    labeled by their open time like stored klines; a bar is complete only once the base range
+    reaches its close, which alignment takes care of.
+
+    Args:
+        data (Dict[str, pd.DataFrame]): Time x symbol frames of the base interval keyed by field.
+        interval (str): Higher interval (e.g., '1h', '4h').
+
+    Returns:
+        Dict[str, pd.DataFrame]: Time x symbol frames of the higher interval keyed by field.
+    """
+    unknown = [field for field in data if field not in RESAMPLE_AGGREGATIONS]
+    if unknown:
+        raise ValueError(f"Fields {', '.join(unknown)} cannot be resampled")
+
+    return {
+        field: getattr(matrix.resample(pd.Timedelta(interval), closed="left", label="left", origin=RESAMPLE_ORIGIN),
+                       RESAMPLE_AGGREGATIONS[field])()
+        for field, matrix in data.items()
+    }
+
+
+def load_timeframes(
+        symbols: List[str],
+        base_interval: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
+        timeframes: Dict[str, List[str]],
+        base_data: Dict[str, pd.DataFrame],
+        gaps: str = "ffill"
+) -> Dict[str, pd.DataFrame]:
+    """
+    Loads the fields of higher timeframes a strategy reads. Intervals stored for the whole range
+    are loaded, others are resampled from the base interval.
+
+    Args:
+        symbols (List[str]): Trading pair symbols (e.g., ['BTCUSDT', 'ETHUSDT']).
+        base_interval (str): Interval the strategy runs on (e.g., '30m').
+        start_date (TimeBound): Start date in 'YYYY-MM-DD' format or a datetime.
+        end_date (TimeBound): End date in 'YYYY-MM-DD' format (whole day included) or a datetime (inclusive).
+        timeframes (Dict[str, List[str]]): Fields per higher interval (e.g., {'1h': ['close']}).
+        base_data (Dict[str, pd.DataFrame]): Time x symbol frames already loaded on the base interval.
+        gaps (str): Gap handling policy of load_klines_matrix.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Time x symbol frames keyed by timeframe_key.
+    """
+    frames = {}
+    for interval, fields in timeframes.items():
+        if pd.Timedelta(interval) <= pd.Timedelta(base_interval):
+            raise ValueError(f"Timeframe {interval} is not higher than the base interval {base_interval}")
+
+        if is_range_stored(symbols, interval, start_date, end_date):
+            matrices = load_klines_matrix(symbols, interval, start_date, end_date, fields, gaps)
+            logger.debug(f"Timeframe {interval} of {symbols}: loaded {', '.join(fields)}")
+        else:
+            missing = [field for field in fields if field not in base_data]
+            base_fields = {field: base_data[field] for field in fields if field in base_data}
+            if missing:
+                base_fields.update(load_klines_matrix(symbols, base_interval, start_date, end_date, missing, gaps))
+            matrices = resample_klines_matrix(base_fields, interval)
+            logger.debug(f"Timeframe {interval} of {symbols}: resampled {', '.join(fields)} from {base_interval}")
+
+        frames.update({timeframe_key(field, interval): matrices[field] for field in fields})
+    return frames
+
+
+def get_timeframes_fingerprint(
+        symbols: List[str],
+        base_interval: str,
+        start_date: TimeBound,
+        end_date: TimeBound,
+        timeframes: Dict[str, List[str]],
+        gaps: str = "ffill"
+) -> str:
+    """
+    Fingerprint of the data of a multi-timeframe strategy (see get_data_fingerprint): the base
+    interval's, combined with those of the stored higher intervals. Resampled timeframes depend
+    on the base interval only. Without higher timeframes it is the base fingerprint.
+    """
+    fingerprint = get_data_fingerprint(symbols, base_interval, start_date, end_date, gaps)
+    if not timeframes:
+        return fingerprint
+
+    parts = [fingerprint] + [
+        (interval, get_data_fingerprint(symbols, interval, start_date, end_date, gaps)
+         if is_range_stored(symbols, interval, start_date, end_date) else "resampled")
+        for interval in sorted(timeframes)
+    ]
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def infer_bar_step(index: pd.DatetimeIndex) -> pd.Timedelta:
+    """Bar length of a time axis: its smallest step, 0 for a single bar (no bar counts as closed before it opens)."""
+    if len(index) < 2:
+        return pd.Timedelta(0)
+    return pd.Timedelta(np.diff(index.asi8).min())
+
+
+def align_positions(
+        source_index: pd.DatetimeIndex,
+        source_step: pd.Timedelta,
+        target_index: pd.DatetimeIndex,
+        target_step: pd.Timedelta
+) -> np.ndarray:
+    """
+    Maps every target bar to the last source bar that has closed when the target bar closes,
+    so a higher-timeframe value is seen only after its bar is complete (no lookahead).
+
+    Returns:
+        np.ndarray: Source row per target row, -1 where no source bar has closed yet.
+    """
+    source_close = source_index.asi8 + source_step.value
+    target_close = target_index.asi8 + target_step.value
+    # Searching the few source bars among the target bars gives the target row each one becomes visible at
+    visible_from = np.searchsorted(target_close, source_close, side="left")
+    return np.repeat(np.arange(-1, len(source_close)), np.diff(visible_from, prepend=0, append=len(target_close)))
+
+
+def align_frame(frame: pd.DataFrame, positions: np.ndarray, target_index: pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    Forward-aligns a frame onto a target index with a single row gather through the positions
+    of align_positions; rows before the first closed source bar are NaN (False for signals).
+    """
+    aligned = frame.to_numpy().take(positions, axis=0, mode="clip")
+    # Positions never decrease, so the rows without a closed source bar lead
+    n_before = int(np.searchsorted(positions, 0))
+    if n_before:
+        if aligned.dtype == bool:
+            aligned[:n_before] = False
+        else:
+            aligned = aligned.astype(np.float64, copy=False)
+            aligned[:n_before] = np.nan
+    return pd.DataFrame(aligned, index=target_index, columns=frame.columns, copy=False)
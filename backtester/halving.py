@@ -0,0 +1,156 @@
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtester.strategies import registry
+from backtester.sweep import SWEEP_METRICS, ParamRange, evaluate_combinations, expand_param_range, keep_param_order
+from logger.config import logger
+
+
+def _sample_combinations(
+        strategy_name: str,
+        param_ranges: Dict[str, ParamRange],
+        n_candidates: Optional[int],
+        seed: int
+) -> Tuple[List[Dict], int]:
+    """
+    Draws distinct combinations from the parameter grid without building the whole grid;
+    the full grid if n_candidates is None or not smaller than the grid. Drawn combinations
+    breaking the strategy's parameter order are dropped.
+
+    Returns:
+        Tuple[List[Dict], int]: Resolved combinations in grid order and the grid size.
+    """
+    if not param_ranges:
+        raise ValueError("At least one parameter range is required for a search")
+
+    param_names = list(param_ranges)
+    values = [expand_param_range(param_ranges[param_name]) for param_name in param_names]
+    shape = tuple(len(param_values) for param_values in values)
+    grid_size = math.prod(shape)
+
+    if n_candidates is None or n_candidates >= grid_size:
+        positions = np.arange(grid_size)
+    else:
+        positions = np.sort(np.random.default_rng(seed).choice(grid_size, size=n_candidates, replace=False))
+
+    combinations = [
+        registry.resolve_params(
+            strategy_name,
+            {param_name: values[i][value_index] for i, (param_name, value_index) in enumerate(zip(param_names, grid_index))}
+        )
+        for grid_index in zip(*np.unravel_index(positions, shape))
+    ]
+    return keep_param_order(strategy_name, combinations), grid_size
+
+
+def _combination_scores(ranking: pd.DataFrame, swept_params: List[str], metric: str) -> pd.Series:
+    """Metric per combination, averaged over symbols when several are traded."""
+    scores = ranking[metric]
+    if "symbol" in ranking.index.names:
+        scores = scores.groupby(level=swept_params, sort=False).mean()
+    return scores
+
+
+def run_successive_halving(
+        data: Dict[str, pd.DataFrame],
+        strategy_name: str,
+        param_ranges: Dict[str, ParamRange],
+        portfolio_params: Dict,
+        freq: str,
+        metric: str = "sharpe_ratio",
+        eta: int = 3,
+        min_fraction: float = 1 / 9,
+        n_candidates: Optional[int] = None,
+        metrics: Optional[List[str]] = None,
+        seed: int = 0
+) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Successive-halving search: all candidates are backtested on a short prefix of the data,
+    the best 1/eta of them are backtested again on an eta times longer prefix, and so on until
+    the survivors are backtested on the full range. Every rung is evaluated in the vectorized
+    passes of the parameter sweep.
+
+    Args:
+        data (Dict[str, pd.DataFrame]): Time x symbol frames holding the strategy's required fields.
+        strategy_name (str): Registered strategy name.
+        param_ranges (Dict[str, ParamRange]): Searched parameters and their ranges (see expand_param_range).
+        portfolio_params (Dict): Portfolio parameters shared by all candidates.
+        freq (str): Interval of klines (e.g., '1h').
+        metric (str): Metric from SWEEP_METRICS that is maximized (averaged over symbols).
+        eta (int): Reduction factor between rungs, in both candidates and prefix length.
+        min_fraction (float): Fraction of the rows used by the first rung.
+        n_candidates (Optional[int]): Number of combinations drawn from the grid; the whole grid if None.
+        metrics (Optional[List[str]]): Metrics reported for the final candidates; the search metric if None.
+        seed (int): Seed of the candidate draw.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict]: Full-range metrics of the final candidates, best first, and a
+        report with the grid size, the candidates and rows of every rung, the number of evaluations,
+        the evaluated time x column cells relative to a full grid sweep, and the wall time.
+    """
+    metrics = list(dict.fromkeys([metric] + (metrics or [])))
+    unknown = [name for name in metrics if name not in SWEEP_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(unknown)}. Available metrics are: {', '.join(SWEEP_METRICS)}.")
+    if eta < 2:
+        raise ValueError(f"Reduction factor eta must be at least 2, got {eta}")
+    if not 0 < min_fraction <= 1:
+        raise ValueError(f"First rung fraction must be in (0, 1], got {min_fraction}")
+
+    started = time.perf_counter()
+    swept_params = list(param_ranges)
+    candidates, grid_size = _sample_combinations(strategy_name, param_ranges, n_candidates, seed)
+
+    n_rows = len(data["close"].index)
+    n_rungs = max(1, math.floor(math.log(1 / min_fraction, eta) + 1e-9) + 1)
+    rungs = []
+    cells = 0
+
+    for rung in range(n_rungs):
+        last = rung == n_rungs - 1
+        rows = n_rows if last else max(1, math.ceil(n_rows * min_fraction * eta ** rung))
+        # Higher timeframes are cut at the same time as the base bars
+        end = data["close"].index[rows] if rows < n_rows else None
+        prefix = {
+            field: matrix.iloc[:len(matrix.index) if end is None else matrix.index.searchsorted(end)]
+            for field, matrix in data.items()
+        }
+
+        ranking = evaluate_combinations(
+            prefix, strategy_name, candidates, swept_params, portfolio_params, freq, metrics if last else [metric]
+        )
+        rungs.append({"rung": rung, "candidates": len(candidates), "rows": rows})
+        cells += len(candidates) * rows
+        if last:
+            break
+
+        # Survivors keep their grid order, so their results line up with the next rung
+        scores = _combination_scores(ranking, swept_params, metric).to_numpy()
+        keep = max(1, len(candidates) // eta)
+        survivors = np.sort(np.argsort(-np.nan_to_num(scores, nan=-np.inf), kind="stable")[:keep])
+        candidates = [candidates[i] for i in survivors]
+
+    scores = _combination_scores(ranking, swept_params, metric)
+    order = scores.rank(ascending=False, method="first", na_option="bottom")
+    if "symbol" in ranking.index.names:
+        ranking = ranking.assign(_order=order.reindex(ranking.index.droplevel("symbol")).to_numpy())
+    else:
+        ranking = ranking.assign(_order=order.to_numpy())
+    ranking = ranking.sort_values("_order", kind="stable").drop(columns="_order")
+
+    report = {
+        "grid_size": grid_size,
+        "rungs": rungs,
+        "evaluations": sum(rung_info["candidates"] for rung_info in rungs),
+        "cell_fraction": cells / (grid_size * n_rows),
+        "seconds": time.perf_counter() - started,
+    }
+    logger.info(
+        f"Successive halving of {strategy_name}: {report['evaluations']} evaluations over {len(rungs)} rungs, "
+        f"{report['cell_fraction']:.1%} of a full grid sweep, {report['seconds']:.2f}s"
+    )
+    return ranking, report
@@ -1,27 +1,30 @@
+from typing import Dict
+
 import pandas as pd
 import vectorbt as vbt
 
 
 # TODO: add portfolio param 'size'
-def create_portfolio(df: pd.DataFrame, portfolio_params: dict, freq: str) -> vbt.Portfolio:
+def create_portfolio(data: Dict[str, pd.DataFrame], portfolio_params: dict, freq: str) -> vbt.Portfolio:
+    # Single-asset strategy output is one-column time x symbol frames, the portfolio works on series
     portfolio = vbt.Portfolio.from_signals(
-        close=df["close"],
-        entries=df["buy_signal"],
-        exits=df["sell_signal"],
+        close=data["close"].iloc[:, 0],
+        entries=data["buy_signal"].iloc[:, 0],
+        exits=data["sell_signal"].iloc[:, 0],
         freq=freq,
         **portfolio_params
     )
     return portfolio
 
 
-def create_multi_asset_portfolio(df: pd.DataFrame, portfolio_params: dict, freq: str) -> vbt.Portfolio:
+def create_multi_asset_portfolio(data: Dict[str, pd.DataFrame], portfolio_params: dict, freq: str) -> vbt.Portfolio:
 
-    if not isinstance(df.index, pd.MultiIndex):
-        raise ValueError("DataFrame index must be a MultiIndex with ('symbol', 'timestamp')")
+    close = data["close"]
+    entries = data["buy_signal"]
+    exits = data["sell_signal"]
 
-    close = df["close"].unstack(level=0)
-    entries = df["buy_signal"].unstack(level=0)
-    exits = df["sell_signal"].unstack(level=0)
+    if not (close.index.equals(entries.index) and close.columns.equals(entries.columns)):
+        raise ValueError("Signals must be time x symbol frames aligned with 'close'")
 
     group_by = close.columns
 
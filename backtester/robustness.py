@@ -0,0 +1,217 @@
+import math
+import time
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+from numba import njit, prange
+
+from logger.config import logger
+from settings import SWEEP_CHUNK_CELLS
+
+ROBUSTNESS_METHODS: List[str] = ["bootstrap", "trades"]
+
+ROBUSTNESS_METRICS: List[str] = ["total_return", "sharpe_ratio", "max_drawdown"]
+
+# vbt annualizes returns metrics with a 365-day year
+YEAR: pd.Timedelta = pd.Timedelta(days=365)
+
+
+def _symbol_returns(portfolio: vbt.Portfolio) -> pd.DataFrame:
+    """Bar returns of a single- or multi-asset portfolio as a time x symbol frame."""
+    returns = portfolio.returns()
+    if isinstance(returns, pd.Series):
+        returns = returns.to_frame(portfolio.wrapper.columns[0])
+    return returns
+
+
+@njit(cache=True, parallel=True, error_model="numpy")
+def _bootstrap_metrics_nb(returns, starts, block_size, ann_factor):
+    """
+    Walks every resample (column of starts) block by block without materializing it, accumulating
+    the total return, Sharpe ratio and max drawdown as vbt's returns metrics define them.
+    """
+    n_rows = returns.shape[0]
+    n_blocks, n_resamples = starts.shape
+    metrics = np.empty((n_resamples, 3))
+    for col in prange(n_resamples):
+        total = 1.0
+        equity = 100.0
+        peak = np.nan
+        max_drawdown = 0.0
+        count = 0
+        mean = 0.0
+        squares = 0.0
+        row = 0
+        for block in range(n_blocks):
+            position = starts[block, col]
+            for _ in range(block_size):
+                if row == n_rows:
+                    break
+                value = returns[position]
+                position += 1
+                if position == n_rows:
+                    position = 0
+                row += 1
+                if not np.isnan(value):
+                    total *= value + 1
+                    equity *= value + 1
+                    count += 1
+                    delta = value - mean
+                    mean += delta / count
+                    squares += delta * (value - mean)
+                if not equity <= peak:
+                    peak = equity
+                max_drawdown = min(max_drawdown, equity / peak - 1)
+
+        metrics[col, 0] = total - 1
+        if n_rows < 2 or count < 2:
+            metrics[col, 1] = np.nan
+        else:
+            std = np.sqrt(squares / (count - 1))
+            metrics[col, 1] = np.inf if std == 0 else mean / std * np.sqrt(ann_factor)
+        metrics[col, 2] = max_drawdown
+    return metrics
+
+
+def _bootstrap_metrics(returns: np.ndarray, n_resamples: int, block_size: int, freq: str,
+                       rng: np.random.Generator) -> np.ndarray:
+    """
+    Circular block bootstrap of bar returns: every resample is a path of the original length glued
+    from blocks of block_size consecutive bars starting at random bars. Resamples are evaluated as
+    columns of one numba pass; block starts are drawn in chunks of at most SWEEP_CHUNK_CELLS.
+
+    Returns:
+        np.ndarray: Resamples x ROBUSTNESS_METRICS.
+    """
+    n_blocks = math.ceil(len(returns) / block_size)
+    chunk_size = max(1, SWEEP_CHUNK_CELLS // n_blocks)
+    ann_factor = YEAR / pd.Timedelta(freq)
+
+    metrics = np.empty((n_resamples, len(ROBUSTNESS_METRICS)))
+    for start in range(0, n_resamples, chunk_size):
+        n_cols = min(chunk_size, n_resamples - start)
+        starts = rng.integers(0, len(returns), size=(n_blocks, n_cols))
+        metrics[start:start + n_cols] = _bootstrap_metrics_nb(returns, starts, block_size, ann_factor)
+    return metrics
+
+
+def _trade_path_metrics(trade_returns: np.ndarray, trades_per_year: float) -> np.ndarray:
+    """Compounded return, per-trade Sharpe ratio annualized by trade frequency and max drawdown of trade sequences (trades x paths)."""
+    equity = np.cumprod(1 + trade_returns, axis=0)
+    peaks = np.maximum(np.maximum.accumulate(equity, axis=0), 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = trade_returns.mean(axis=0) / trade_returns.std(axis=0, ddof=1) * np.sqrt(trades_per_year)
+    return np.column_stack([equity[-1] - 1, sharpe, np.minimum((equity / peaks - 1).min(axis=0), 0)])
+
+
+def _trade_metrics(trade_returns: np.ndarray, n_resamples: int, trades_per_year: float,
+                   rng: np.random.Generator) -> np.ndarray:
+    """
+    Resamples trade returns with replacement into sequences of the original trade count,
+    chunked like the bootstrap.
+
+    Returns:
+        np.ndarray: Resamples x ROBUSTNESS_METRICS.
+    """
+    n_trades = len(trade_returns)
+    chunk_size = max(1, SWEEP_CHUNK_CELLS // n_trades)
+
+    metrics = np.empty((n_resamples, len(ROBUSTNESS_METRICS)))
+    for start in range(0, n_resamples, chunk_size):
+        n_cols = min(chunk_size, n_resamples - start)
+        paths = trade_returns[rng.integers(0, n_trades, size=(n_trades, n_cols))]
+        metrics[start:start + n_cols] = _trade_path_metrics(paths, trades_per_year)
+    return metrics
+
+
+def _summarize(observed: np.ndarray, samples: np.ndarray, confidence: float) -> pd.DataFrame:
+    """Observed value, resample mean and std, and the confidence interval of every metric."""
+    samples = np.where(np.isfinite(samples), samples, np.nan)
+    lower, median, upper = np.nanquantile(samples, [(1 - confidence) / 2, 0.5, (1 + confidence) / 2], axis=0)
+    return pd.DataFrame({
+        "observed": observed,
+        "mean": np.nanmean(samples, axis=0),
+        "std": np.nanstd(samples, axis=0, ddof=1),
+        "ci_lower": lower,
+        "median": median,
+        "ci_upper": upper,
+        "p_below_zero": (samples < 0).mean(axis=0),
+    }, index=pd.Index(ROBUSTNESS_METRICS, name="metric"))
+
+
+def run_robustness_analysis(
+        portfolio: vbt.Portfolio,
+        freq: str,
+        method: str = "bootstrap",
+        n_resamples: int = 10_000,
+        block_size: Optional[int] = None,
+        confidence: float = 0.95,
+        seed: int = 0
+) -> pd.DataFrame:
+    """
+    Estimates how much of a backtest's result is luck: the strategy's returns are resampled
+    n_resamples times and the spread of total return, Sharpe ratio and max drawdown over the
+    resamples gives their confidence intervals.
+
+    'bootstrap' block-bootstraps the bar returns of every symbol, keeping short-range
+    autocorrelation within blocks; metrics match those of the portfolio's stats.
+    'trades' resamples closed and open trade returns with replacement; returns compound
+    trade after trade, and the Sharpe ratio is per trade, annualized by the number of trades a year.
+
+    Args:
+        portfolio (vbt.Portfolio): Single- or multi-asset backtest portfolio.
+        freq (str): Interval of klines (e.g., '1h').
+        method (str): One of ROBUSTNESS_METHODS.
+        n_resamples (int): Number of resampled paths per symbol.
+        block_size (Optional[int]): Bars per bootstrap block; the cube root of the number of bars if None.
+        confidence (float): Coverage of the confidence intervals.
+        seed (int): Seed of the resampling.
+
+    Returns:
+        pd.DataFrame: Per symbol and metric, the observed value, mean, std, confidence interval
+        bounds, median and the share of resamples below zero.
+    """
+    if method not in ROBUSTNESS_METHODS:
+        raise ValueError(f"Invalid robustness method {method}. Available methods are: {', '.join(ROBUSTNESS_METHODS)}.")
+    if n_resamples < 2:
+        raise ValueError(f"At least 2 resamples are required, got {n_resamples}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"Confidence must be in (0, 1), got {confidence}")
+
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    returns = _symbol_returns(portfolio)
+    n_rows = len(returns.index)
+
+    if method == "trades":
+        trades = portfolio.trades.returns
+        trade_columns = trades.col_arr
+        years = (returns.index[-1] - returns.index[0] + pd.Timedelta(freq)) / YEAR
+
+    summaries = {}
+    for i, symbol in enumerate(returns.columns):
+        if method == "bootstrap":
+            symbol_returns = returns[symbol].to_numpy()
+            size = block_size or max(1, round(n_rows ** (1 / 3)))
+            accessor = returns[[symbol]].vbt.returns(freq=freq)
+            observed = np.array([accessor.total().iloc[0], accessor.sharpe_ratio().iloc[0], accessor.max_drawdown().iloc[0]])
+            samples = _bootstrap_metrics(symbol_returns, n_resamples, size, freq, rng)
+        else:
+            trade_returns = trades.values[trade_columns == i]
+            if len(trade_returns) < 2:
+                logger.warning(f"Robustness of {symbol}: {len(trade_returns)} trades, at least 2 are required to resample them")
+                summaries[symbol] = _summarize(np.full(len(ROBUSTNESS_METRICS), np.nan),
+                                               np.full((n_resamples, len(ROBUSTNESS_METRICS)), np.nan), confidence)
+                continue
+            trades_per_year = len(trade_returns) / years
+            observed = _trade_path_metrics(trade_returns[:, None], trades_per_year)[0]
+            samples = _trade_metrics(trade_returns, n_resamples, trades_per_year, rng)
+        summaries[symbol] = _summarize(observed, samples, confidence)
+
+    logger.info(
+        f"Robustness analysis: {n_resamples} {method} resamples of {len(returns.columns)} symbols x {n_rows} bars "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    return pd.concat(summaries, names=["symbol"])
@@ -0,0 +1,616 @@
+import operator
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+
+from backtester.data_loader.timeframes import (
+    align_frame, align_positions, infer_bar_step, split_timeframe_key, timeframe_key
+)
+from logger.config import logger
+
+# Expression strategies are defined in the config as signal expressions over kline fields,
+# indicator functions and the strategy's parameters, e.g.
+#     "MA(close, short_window) > MA(close, long_window) & RSI(close, rsi_window) < rsi_buy"
+# Expressions are parsed into graphs of hashable tuple nodes. Equal sub-expressions are equal
+# tuples (commutative operands are ordered and '<' is flipped to '>'), so evaluating a set of
+# graphs against one memo computes every distinct node once, whichever strategy, parameter
+# combination or signal it comes from. Indicator runs of the same kind over the same inputs
+# are batched into one vectorized vbt run with per-run parameter lists.
+#
+# Fields of higher timeframes are written 'close@1h'. Sub-expressions over a single higher
+# timeframe are evaluated on its bars (SHIFT(close@1h, 1) is the previous hour); where they meet
+# operands of the base interval, and at the root of a signal, they are wrapped in align nodes
+# that forward-align them onto the base bars once their higher-timeframe bar has closed.
+#
+# Nodes:
+#     ("field", name)                           kline field (time x symbol frame)
+#     ("field", name, interval)                 kline field of a higher timeframe
+#     ("const", value)                          number
+#     ("param", name)                           strategy parameter
+#     ("indicator", kind, inputs, args)         vbt indicator run; inputs and args are node tuples
+#     ("output", function, indicator, attr)     output of an indicator run
+#     ("shift", node, periods)                  node shifted by a fixed number of bars
+#     ("neg", node), ("not", node)
+#     ("binop", op, left, right)
+#     ("align", node, interval)                 higher-timeframe node aligned onto the base bars
+
+KLINE_FIELDS: List[str] = ["open", "high", "low", "close", "volume"]
+
+# Indicator kinds: vbt indicator, number of series inputs, typed parameters and fixed keyword arguments
+INDICATORS: Dict[str, Dict] = {
+    "MA": {"run": vbt.MA.run, "inputs": 1, "params": {"window": int}, "kwargs": {}},
+    "EMA": {"run": vbt.MA.run, "inputs": 1, "params": {"window": int}, "kwargs": {"ewm": True}},
+    "MSTD": {"run": vbt.MSTD.run, "inputs": 1, "params": {"window": int}, "kwargs": {}},
+    "RSI": {"run": vbt.RSI.run, "inputs": 1, "params": {"window": int}, "kwargs": {}},
+    "MACD": {
+        "run": vbt.MACD.run, "inputs": 1,
+        "params": {"fast_window": int, "slow_window": int, "signal_window": int}, "kwargs": {},
+    },
+    "BBANDS": {"run": vbt.BBANDS.run, "inputs": 1, "params": {"window": int, "alpha": float}, "kwargs": {}},
+    "STOCH": {"run": vbt.STOCH.run, "inputs": 3, "params": {"k_window": int, "d_window": int}, "kwargs": {}},
+    "ATR": {"run": vbt.ATR.run, "inputs": 3, "params": {"window": int}, "kwargs": {}},
+}
+
+# Functions available in expressions: indicator kind and the output they return
+FUNCTIONS: Dict[str, Tuple[str, str]] = {
+    "MA": ("MA", "ma"),
+    "EMA": ("EMA", "ma"),
+    "MSTD": ("MSTD", "mstd"),
+    "RSI": ("RSI", "rsi"),
+    "MACD": ("MACD", "macd"),
+    "MACD_SIGNAL": ("MACD", "signal"),
+    "MACD_HIST": ("MACD", "hist"),
+    "BB_UPPER": ("BBANDS", "upper"),
+    "BB_MID": ("BBANDS", "middle"),
+    "BB_LOWER": ("BBANDS", "lower"),
+    "STOCH_K": ("STOCH", "percent_k"),
+    "STOCH_D": ("STOCH", "percent_d"),
+    "ATR": ("ATR", "atr"),
+}
+
+BINARY_OPERATORS: Dict[str, Callable] = {
+    "|": operator.or_,
+    "&": operator.and_,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+
+COMMUTATIVE_OPERATORS: List[str] = ["|", "&", "==", "!=", "+", "*"]
+BOOLEAN_OPERATORS: List[str] = ["|", "&", ">", ">=", "==", "!="]
+FLIPPED_OPERATORS: Dict[str, str] = {"<": ">", "<=": ">="}
+
+_TOKEN_PATTERN = re.compile(r"\s*(?:(\d+\.?\d*|\.\d+)|([A-Za-z_]\w*(?:@\d+[smhdw])?)|(>=|<=|==|!=|[<>&|~+\-*/(),]))")
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    """Splits an expression into ('number' | 'name' | 'symbol', text) tokens."""
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_PATTERN.match(expression, position)
+        if match is None:
+            raise ValueError(f"Unexpected character {expression[position:].lstrip()[:1]!r} in expression {expression!r}")
+        number, name, symbol = match.groups()
+        tokens.append(("number", number) if number else ("name", name) if name else ("symbol", symbol))
+        position = match.end()
+    return tokens
+
+
+def _binop(op: str, left: Tuple, right: Tuple) -> Tuple:
+    """Builds a binary node in canonical form, folding constants."""
+    if op in FLIPPED_OPERATORS:
+        op, left, right = FLIPPED_OPERATORS[op], right, left
+    if left[0] == "const" and right[0] == "const" and op not in BOOLEAN_OPERATORS and not (op == "/" and right[1] == 0):
+        return "const", BINARY_OPERATORS[op](left[1], right[1])
+    if op in COMMUTATIVE_OPERATORS and repr(right) < repr(left):
+        left, right = right, left
+    return "binop", op, left, right
+
+
+def is_boolean(node: Tuple) -> bool:
+    """Whether a node evaluates to a boolean frame."""
+    return (node[0] == "not" or (node[0] == "binop" and node[1] in BOOLEAN_OPERATORS)
+            or (node[0] in ("shift", "align") and is_boolean(node[1])))
+
+
+class _Parser:
+    """
+    Recursive-descent parser of signal expressions. Precedence, loosest first:
+    '|', '&', '~', comparisons, '+' '-', '*' '/', unary '-'.
+    """
+
+    def __init__(self, expression: str, param_names: List[str]):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.param_names = param_names
+
+    def parse(self) -> Tuple:
+        node = self._or()
+        if self.position < len(self.tokens):
+            self._error(f"unexpected {self.tokens[self.position][1]!r}")
+        return node
+
+    def _error(self, message: str):
+        raise ValueError(f"Invalid expression {self.expression!r}: {message}")
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position][1] if self.position < len(self.tokens) else None
+
+    def _take(self, expected: Optional[str] = None) -> Tuple[str, str]:
+        if self.position >= len(self.tokens):
+            self._error("unexpected end")
+        token = self.tokens[self.position]
+        if expected is not None and token[1] != expected:
+            self._error(f"expected {expected!r}, got {token[1]!r}")
+        self.position += 1
+        return token
+
+    def _or(self) -> Tuple:
+        node = self._and()
+        while self._peek() == "|":
+            self._take()
+            node = _binop("|", node, self._and())
+        return node
+
+    def _and(self) -> Tuple:
+        node = self._not()
+        while self._peek() == "&":
+            self._take()
+            node = _binop("&", node, self._not())
+        return node
+
+    def _not(self) -> Tuple:
+        if self._peek() == "~":
+            self._take()
+            return "not", self._not()
+        return self._comparison()
+
+    def _comparison(self) -> Tuple:
+        node = self._additive()
+        if self._peek() in (">", ">=", "<", "<=", "==", "!="):
+            op = self._take()[1]
+            node = _binop(op, node, self._additive())
+        return node
+
+    def _additive(self) -> Tuple:
+        node = self._term()
+        while self._peek() in ("+", "-"):
+            op = self._take()[1]
+            node = _binop(op, node, self._term())
+        return node
+
+    def _term(self) -> Tuple:
+        node = self._unary()
+        while self._peek() in ("*", "/"):
+            op = self._take()[1]
+            node = _binop(op, node, self._unary())
+        return node
+
+    def _unary(self) -> Tuple:
+        if self._peek() == "-":
+            self._take()
+            node = self._unary()
+            return ("const", -node[1]) if node[0] == "const" else ("neg", node)
+        return self._primary()
+
+    def _primary(self) -> Tuple:
+        kind, text = self._take()
+        if kind == "number":
+            value = float(text)
+            return "const", int(value) if value.is_integer() and "." not in text else value
+        if text == "(":
+            node = self._or()
+            self._take(")")
+            return node
+        if kind != "name":
+            self._error(f"unexpected {text!r}")
+
+        name, interval = split_timeframe_key(text)
+        if interval is not None:
+            if name not in KLINE_FIELDS or self._peek() == "(":
+                self._error(f"{text!r}: only kline fields ({', '.join(KLINE_FIELDS)}) take a timeframe")
+            return "field", name, interval
+
+        if self._peek() == "(":
+            self._take("(")
+            args = []
+            if self._peek() != ")":
+                args.append(self._or())
+                while self._peek() == ",":
+                    self._take()
+                    args.append(self._or())
+            self._take(")")
+            return self._call(text.upper(), args)
+
+        if text in KLINE_FIELDS:
+            return "field", text
+        if text in self.param_names:
+            return "param", text
+        self._error(f"unknown name {text!r}; fields are {', '.join(KLINE_FIELDS)}, parameters are {', '.join(self.param_names)}")
+
+    def _call(self, function: str, args: List[Tuple]) -> Tuple:
+        if function in ("CROSSED_ABOVE", "CROSSED_BELOW"):
+            if len(args) != 2:
+                self._error(f"{function} takes 2 arguments")
+            left, right = args if function == "CROSSED_ABOVE" else args[::-1]
+            above = _binop(">", left, right)
+            return _binop("&", above, ("not", ("shift", above, 1)))
+
+        if function == "SHIFT":
+            if len(args) != 2 or args[1][0] != "const" or not float(args[1][1]).is_integer():
+                self._error("SHIFT takes a series and a whole number of bars")
+            return "shift", args[0], int(args[1][1])
+
+        if function not in FUNCTIONS:
+            self._error(f"unknown function {function}; available functions are {', '.join(FUNCTIONS)}, "
+                        f"CROSSED_ABOVE, CROSSED_BELOW, SHIFT")
+        kind, attr = FUNCTIONS[function]
+        spec = INDICATORS[kind]
+        if len(args) != spec["inputs"] + len(spec["params"]):
+            self._error(f"{function} takes {spec['inputs']} series and {len(spec['params'])} parameters "
+                        f"({', '.join(spec['params'])})")
+
+        inputs, params = tuple(args[:spec["inputs"]]), tuple(args[spec["inputs"]:])
+        for node in inputs:
+            if node[0] in ("const", "param"):
+                self._error(f"{function} takes a series, got {render(node)}")
+        for node in params:
+            if node[0] not in ("const", "param"):
+                self._error(f"parameters of {function} must be numbers or strategy parameters, got {render(node)}")
+        return "output", function, ("indicator", kind, inputs, params), attr
+
+
+def parse_expression(expression: str, param_names: List[str]) -> Tuple:
+    """
+    Parses a signal expression into its canonical node graph.
+
+    Args:
+        expression (str): Expression over kline fields, indicator functions and parameters.
+        param_names (List[str]): Names of the strategy's parameters.
+
+    Returns:
+        Tuple: Root node.
+
+    Raises:
+        ValueError: On syntax errors, unknown names or wrong function arguments.
+    """
+    return _Parser(expression, param_names).parse()
+
+
+def render(node: Tuple) -> str:
+    """Formats a node back into expression syntax; used to name indicator outputs."""
+    kind = node[0]
+    if kind == "field":
+        return timeframe_key(*node[1:]) if len(node) > 2 else node[1]
+    if kind == "param":
+        return node[1]
+    if kind == "const":
+        return f"{node[1]:g}"
+    if kind == "output":
+        _, function, (_, _, inputs, params), _ = node
+        return f"{function}({', '.join(render(arg) for arg in inputs + params)})"
+    if kind == "shift":
+        return f"SHIFT({render(node[1])}, {node[2]})"
+    if kind == "align":
+        return render(node[1])
+    if kind == "neg":
+        return f"-{render(node[1])}"
+    if kind == "not":
+        return f"~{render(node[1])}"
+    return f"({render(node[2])} {node[1]} {render(node[3])})"
+
+
+def _walk(node: Tuple, inside_indicator: bool = False):
+    """Yields (node, inside_indicator) for a node and all its descendants."""
+    yield node, inside_indicator
+    kind = node[0]
+    if kind == "output":
+        yield from _walk(node[2], inside_indicator)
+    elif kind == "indicator":
+        for child in node[2] + node[3]:
+            yield from _walk(child, True)
+    elif kind in ("shift", "neg", "not", "align"):
+        yield from _walk(node[1], inside_indicator)
+    elif kind == "binop":
+        yield from _walk(node[2], inside_indicator)
+        yield from _walk(node[3], inside_indicator)
+
+
+# Timeframe of constants and parameters, which combine with any other
+_ANY_TIMEFRAME = "*"
+
+
+def _common_timeframe(resolved: List[Tuple[Tuple, Optional[str]]]) -> Tuple[List[Tuple], Optional[str]]:
+    """Operands of one node on a common timeframe: their own if they share one, else the base interval with the others aligned."""
+    timeframes = {timeframe for _, timeframe in resolved} - {_ANY_TIMEFRAME}
+    if len(timeframes) <= 1:
+        return [node for node, _ in resolved], timeframes.pop() if timeframes else _ANY_TIMEFRAME
+    return [("align", node, timeframe) if timeframe not in (None, _ANY_TIMEFRAME) else node
+            for node, timeframe in resolved], None
+
+
+def _resolve_timeframes(node: Tuple) -> Tuple[Tuple, Optional[str]]:
+    """Inserts align nodes where higher-timeframe operands meet others; returns the node and its timeframe (None for the base interval)."""
+    kind = node[0]
+    if kind == "field":
+        return node, node[2] if len(node) > 2 else None
+    if kind in ("const", "param"):
+        return node, _ANY_TIMEFRAME
+    if kind == "output":
+        _, function, (_, indicator_kind, inputs, params), attr = node
+        inputs, timeframe = _common_timeframe([_resolve_timeframes(child) for child in inputs])
+        return ("output", function, ("indicator", indicator_kind, tuple(inputs), params), attr), timeframe
+    if kind in ("shift", "neg", "not"):
+        child, timeframe = _resolve_timeframes(node[1])
+        return (kind, child) + node[2:], timeframe
+    (left, right), timeframe = _common_timeframe([_resolve_timeframes(node[2]), _resolve_timeframes(node[3])])
+    return _binop(node[1], left, right), timeframe
+
+
+def align_timeframes(node: Tuple) -> Tuple:
+    """Signal graph evaluated on the base bars: higher-timeframe sub-expressions are aligned onto them."""
+    node, timeframe = _resolve_timeframes(node)
+    return ("align", node, timeframe) if timeframe not in (None, _ANY_TIMEFRAME) else node
+
+
+def compile_strategy(strategy_name: str, strategy_details: Dict) -> Dict:
+    """
+    Compiles an expression strategy from its config entry: 'params' with 'default_value's and
+    'signals' with 'buy_signal' and 'sell_signal' expressions.
+
+    Returns:
+        Dict: 'fields' of the base interval, 'timeframes' (higher interval -> fields), typed 'params'
+        (registry schema), 'indicator_params' (parameters that appear inside indicator calls),
+        'outputs' (indicator output name -> node) and 'signals' (signal -> node).
+
+    Raises:
+        ValueError: On invalid expressions or parameters.
+    """
+    configured = strategy_details.get("params", {})
+    expressions = strategy_details.get("signals", {})
+    missing = [signal for signal in ("buy_signal", "sell_signal") if signal not in expressions]
+    if missing:
+        raise ValueError(f"Strategy {strategy_name} does not define: {', '.join(missing)}")
+
+    signals = {signal: parse_expression(expressions[signal], list(configured)) for signal in ("buy_signal", "sell_signal")}
+    for signal, node in signals.items():
+        if not is_boolean(node):
+            raise ValueError(f"The {signal} expression of {strategy_name} is not a condition: {expressions[signal]!r}")
+    signals = {signal: align_timeframes(node) for signal, node in signals.items()}
+
+    # The portfolio is always simulated on the close of the base interval
+    fields, timeframes, outputs, int_params, indicator_params, signal_params = ["close"], {}, {}, set(), set(), set()
+    for root in signals.values():
+        for node, inside_indicator in _walk(root):
+            if node[0] == "field" and len(node) > 2:
+                timeframes.setdefault(node[2], set()).add(node[1])
+            elif node[0] == "field":
+                fields.append(node[1])
+            elif node[0] == "output":
+                outputs.setdefault(render(node), node)
+            elif node[0] == "indicator":
+                for node_arg, param_type in zip(node[3], INDICATORS[node[1]]["params"].values()):
+                    if node_arg[0] == "param" and param_type is int:
+                        int_params.add(node_arg[1])
+            elif node[0] == "param":
+                (indicator_params if inside_indicator else signal_params).add(node[1])
+
+    both = indicator_params & signal_params
+    if both:
+        raise ValueError(f"Parameters of {strategy_name} are used both in indicators and in conditions: {', '.join(sorted(both))}")
+
+    return {
+        "fields": [field for field in KLINE_FIELDS if field in fields],
+        "timeframes": {
+            interval: [field for field in KLINE_FIELDS if field in timeframes[interval]]
+            for interval in sorted(timeframes, key=pd.Timedelta)
+        },
+        "params": {
+            param_name: {"type": int if param_name in int_params else float, "default": param_info["default_value"]}
+            for param_name, param_info in configured.items()
+        },
+        "indicator_params": [param_name for param_name in configured if param_name in indicator_params],
+        "outputs": outputs,
+        "signals": signals,
+    }
+
+
+def _substitute(node: Tuple, params: Dict) -> Tuple:
+    """Replaces parameter nodes with constants, so equal indicators of different strategies share a node."""
+    kind = node[0]
+    if kind == "param":
+        return "const", params[node[1]]
+    if kind == "output":
+        return node[:2] + (_substitute(node[2], params),) + node[3:]
+    if kind == "indicator":
+        return (kind, node[1], tuple(_substitute(child, params) for child in node[2]),
+                tuple(_substitute(child, params) for child in node[3]))
+    if kind in ("shift", "neg", "not", "align"):
+        return (kind, _substitute(node[1], params)) + node[2:]
+    if kind == "binop":
+        return kind, node[1], _substitute(node[2], params), _substitute(node[3], params)
+    return node
+
+
+def _collect_indicators(node: Tuple, groups: Dict[Tuple, List[Tuple]]) -> None:
+    """Groups the distinct indicator nodes of a graph by kind and inputs."""
+    for child, _ in _walk(node):
+        if child[0] == "indicator":
+            group = groups.setdefault((child[1], child[2]), [])
+            if child not in group:
+                group.append(child)
+
+
+def _nesting(inputs: Tuple) -> int:
+    """Number of indicator nodes inside indicator inputs; inner indicators have fewer than outer ones."""
+    return sum(1 for node in inputs for child, _ in _walk(node) if child[0] == "indicator")
+
+
+def _run_indicator_group(data: Dict[str, pd.DataFrame], group: List[Tuple], memo: Dict) -> None:
+    """Runs all indicators of one kind over the same inputs in one vectorized vbt call."""
+    kind, inputs = group[0][1], group[0][2]
+    spec = INDICATORS[kind]
+    input_frames = [_evaluate(data, node, None, memo) for node in inputs]
+    param_values = {
+        param_name: [param_type(node[3][i][1]) for node in group]
+        for i, (param_name, param_type) in enumerate(spec["params"].items())
+    }
+    result = spec["run"](*input_frames, **param_values, **spec["kwargs"])
+    arrays = {}
+    for position, node in enumerate(group):
+        memo[node] = (result, arrays, position, input_frames[0].index, input_frames[0].columns)
+
+
+def _evaluate(data: Dict[str, pd.DataFrame], node: Tuple, params: Optional[Dict], memo: Dict):
+    """Evaluates a node once per memo: a time x symbol frame, a number or a per-column array."""
+    if node in memo:
+        return memo[node]
+
+    kind = node[0]
+    if kind == "field":
+        key = render(node)
+        if key not in data:
+            raise ValueError(f"Expression requires field {key}")
+        return data[key]
+    if kind == "const":
+        return node[1]
+    if kind == "param":
+        if params is None or node[1] not in params:
+            raise ValueError(f"Parameter {node[1]} has no value")
+        return params[node[1]]
+
+    if kind == "indicator":
+        _run_indicator_group(data, [node], memo)
+        return memo[node]
+    if kind == "output":
+        result, arrays, position, index, columns = _evaluate(data, node[2], params, memo)
+        if node[3] not in arrays:
+            arrays[node[3]] = getattr(result, node[3]).to_numpy()
+        n_cols = len(columns)
+        value = pd.DataFrame(arrays[node[3]][:, position * n_cols:(position + 1) * n_cols], index=index, columns=columns)
+    elif kind == "align":
+        value = _evaluate(data, node[1], params, memo)
+        if isinstance(value, pd.DataFrame):
+            target = data["close"].index
+            value = align_frame(value, _alignment(value.index, node[2], target, memo), target)
+    elif kind == "shift":
+        value = _evaluate(data, node[1], params, memo)
+        value = value.shift(node[2], fill_value=False) if is_boolean(node[1]) else value.shift(node[2])
+    elif kind == "neg":
+        value = -_evaluate(data, node[1], params, memo)
+    elif kind == "not":
+        value = ~_evaluate(data, node[1], params, memo)
+    else:
+        value = BINARY_OPERATORS[node[1]](_evaluate(data, node[2], params, memo), _evaluate(data, node[3], params, memo))
+
+    memo[node] = value
+    return value
+
+
+def _alignment(source_index: pd.DatetimeIndex, interval: str, target_index: pd.DatetimeIndex, memo: Dict) -> np.ndarray:
+    """Positions aligning a higher timeframe onto the base bars, computed once per memo and time axis pair."""
+    key = ("alignment", interval, len(source_index), len(target_index)) + (
+        (source_index[0], target_index[0]) if len(source_index) and len(target_index) else ()
+    )
+    if key not in memo:
+        memo[key] = align_positions(source_index, pd.Timedelta(interval), target_index, infer_bar_step(target_index))
+    return memo[key]
+
+
+def evaluate_nodes(data: Dict[str, pd.DataFrame], nodes: List[Tuple], memo: Optional[Dict] = None) -> List:
+    """
+    Evaluates parameter-free node graphs against a shared memo: every distinct node is computed
+    once, and indicators of one kind over the same inputs run in one vectorized vbt call.
+
+    Args:
+        data (Dict[str, pd.DataFrame]): Time x symbol frames of the kline fields.
+        nodes (List[Tuple]): Root nodes with parameters substituted.
+        memo (Optional[Dict]): Values of already evaluated nodes, shared across calls; a new one if None.
+
+    Returns:
+        List: Values of the roots.
+    """
+    memo = {} if memo is None else memo
+    groups = {}
+    for node in nodes:
+        _collect_indicators(node, groups)
+
+    # Inner indicators run first, the groups reading them take their outputs from the memo
+    n_runs = n_indicators = 0
+    for (_, inputs), group in sorted(groups.items(), key=lambda item: _nesting(item[0][1])):
+        group = [node for node in group if node not in memo]
+        if group:
+            _run_indicator_group(data, group, memo)
+            n_runs += 1
+            n_indicators += len(group)
+
+    values = [_evaluate(data, node, None, memo) for node in nodes]
+    logger.debug(f"Evaluated {len(nodes)} expressions: {n_indicators} distinct indicators in {n_runs} indicator runs")
+    return values
+
+
+def indicator_nodes(compiled: Dict, params: Dict) -> Dict[str, Tuple]:
+    """Indicator output nodes of an expression strategy with its indicator parameters substituted."""
+    return {name: _substitute(node, params) for name, node in compiled["outputs"].items()}
+
+
+def compute_indicators(compiled: Dict, data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    """
+    Indicator stage of an expression strategy. As in the built-in strategies, indicator
+    parameters given as per-combination lists (parameter sweeps) return param-major blocks
+    of symbols.
+    """
+    indicator_params = compiled["indicator_params"]
+    sweep_lengths = {len(strategy_params[name]) for name in indicator_params if isinstance(strategy_params[name], list)}
+    if not sweep_lengths:
+        nodes = indicator_nodes(compiled, strategy_params)
+        return dict(zip(nodes, evaluate_nodes(data, list(nodes.values()))))
+
+    n_combinations = sweep_lengths.pop()
+    combinations = [
+        {name: strategy_params[name][i] if isinstance(strategy_params[name], list) else strategy_params[name]
+         for name in indicator_params}
+        for i in range(n_combinations)
+    ]
+    nodes = [indicator_nodes(compiled, combination) for combination in combinations]
+    values = evaluate_nodes(data, [node for combination_nodes in nodes for node in combination_nodes.values()])
+
+    close = data["close"]
+    columns = pd.MultiIndex.from_tuples(
+        [(i, symbol) for i in range(n_combinations) for symbol in close.columns], names=["combination", "symbol"]
+    )
+    n_outputs = len(compiled["outputs"])
+    return {
+        name: pd.DataFrame(
+            np.hstack([values[i * n_outputs + j].to_numpy() for i in range(n_combinations)]),
+            index=values[j].index, columns=columns
+        )
+        for j, name in enumerate(compiled["outputs"])
+    }
+
+
+def compute_signals(compiled: Dict, data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    """
+    Signal stage of an expression strategy: evaluates the signal expressions with the indicator
+    outputs taken from the data. Threshold parameters may be numbers or per-column arrays.
+    """
+    memo = {node: data[name] for name, node in compiled["outputs"].items()}
+    close = data["close"]
+    for signal, node in compiled["signals"].items():
+        value = _evaluate(data, node, strategy_params, memo)
+        if not isinstance(value, pd.DataFrame):
+            value = pd.DataFrame(bool(value), index=close.index, columns=close.columns)
+        data[signal] = value
+    return data
+
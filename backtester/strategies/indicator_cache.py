@@ -0,0 +1,182 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from logger.config import logger
+from settings import INDICATOR_CACHE_BYTES, INDICATOR_CACHE_DISK_BYTES
+from utils import path_utils
+
+
+def make_indicator_key(fingerprint: str, strategy_name: str, indicator_params: Dict) -> str:
+    """
+    Builds the cache key of a strategy's indicators.
+
+    Args:
+        fingerprint (str): Fingerprint of the input data (see get_data_fingerprint).
+        strategy_name (str): Registered strategy name.
+        indicator_params (Dict): Parameters the indicators depend on.
+
+    Returns:
+        str: Hex digest usable as a file name.
+    """
+    payload = repr((fingerprint, strategy_name, sorted(indicator_params.items())))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _frames_size(frames: Dict[str, pd.DataFrame]) -> int:
+    return int(sum(frame.memory_usage(index=True, deep=True).sum() for frame in frames.values()))
+
+
+def _copy_frames(frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    return {name: frame.copy() for name, frame in frames.items()}
+
+
+def write_frames(file_path: str, frames: Dict[str, pd.DataFrame]) -> None:
+    """Stores time x symbol frames as one uncompressed Arrow IPC file with (indicator, symbol) columns."""
+    table = pa.Table.from_pandas(pd.concat(frames, axis=1, keys=list(frames), names=["indicator", "symbol"]))
+    tmp_path = f"{file_path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, file_path)
+
+
+def read_frames(file_path: str) -> Dict[str, pd.DataFrame]:
+    """Reads time x symbol frames stored by write_frames, memory-mapped."""
+    table = pa.ipc.open_file(pa.memory_map(file_path)).read_all().to_pandas()
+    return {name: table[name] for name in table.columns.get_level_values("indicator").unique()}
+
+
+class IndicatorCache:
+    """
+    Two-level LRU cache of computed indicator frames.
+
+    Entries live in memory up to a byte budget; the least recently used ones are spilled to
+    uncompressed Arrow IPC files under KLINES_DIR/indicators (read back memory-mapped), which are
+    removed oldest first beyond the disk budget. Keys include the data fingerprint, so new or
+    removed partitions never hit stale entries.
+    """
+
+    def __init__(self, max_bytes: int, max_disk_bytes: int):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.spills = 0
+        self._entries: "OrderedDict[str, Tuple[Dict[str, pd.DataFrame], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or self.max_disk_bytes > 0
+
+    def _spill(self, key: str, frames: Dict[str, pd.DataFrame]) -> None:
+        if self.max_disk_bytes <= 0:
+            return
+        try:
+            write_frames(path_utils.create_indicator_path(key), frames)
+            self.spills += 1
+            self._trim_disk()
+        except Exception as e:
+            logger.warning(f"Error spilling indicators {key} to disk: {e}")
+
+    def _trim_disk(self) -> None:
+        """Removes the least recently used spilled files beyond the disk budget."""
+        files = []
+        for file_path in path_utils.get_indicator_paths():
+            stat = os.stat(file_path)
+            files.append((stat.st_mtime_ns, stat.st_size, file_path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, file_path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(file_path)
+            total -= size
+
+    def _store(self, key: str, frames: Dict[str, pd.DataFrame], size: int) -> None:
+        if size > self.max_bytes:
+            self._spill(key, frames)
+            return
+
+        self._entries[key] = (frames, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            spilled_key, (spilled_frames, spilled_size) = self._entries.popitem(last=False)
+            self._bytes -= spilled_size
+            self._spill(spilled_key, spilled_frames)
+
+    def get(self, key: str) -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        Returns copies of cached indicator frames from memory or disk, None on a miss.
+        Entries found on disk are moved back into memory.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy_frames(self._entries[key][0])
+
+            file_path = path_utils.get_indicator_path(key)
+            if self.max_disk_bytes > 0 and os.path.exists(file_path):
+                try:
+                    frames = read_frames(file_path)
+                except Exception as e:
+                    logger.warning(f"Unreadable indicator cache file {file_path}: {e}")
+                    os.remove(file_path)
+                else:
+                    self.disk_hits += 1
+                    os.utime(file_path)
+                    size = _frames_size(frames)
+                    if size <= self.max_bytes:
+                        os.remove(file_path)
+                        self._store(key, frames, size)
+                    return _copy_frames(frames)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, frames: Dict[str, pd.DataFrame]) -> None:
+        """Stores computed indicator frames, spilling the least recently used entries to disk."""
+        frames = _copy_frames(frames)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._store(key, frames, _frames_size(frames))
+
+    def clear(self) -> None:
+        """Drops all cached indicators from memory and disk."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for file_path in path_utils.get_indicator_paths():
+                os.remove(file_path)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss/spill counters and the current memory size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "spills": self.spills,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        logger.debug(
+            f"Indicator cache: {stats['hits']} hits, {stats['disk_hits']} disk hits, {stats['misses']} misses, "
+            f"{stats['spills']} spills, {stats['entries']} entries, {stats['bytes'] / 2 ** 20:.1f} MiB"
+        )
+
+
+indicator_cache = IndicatorCache(INDICATOR_CACHE_BYTES, INDICATOR_CACHE_DISK_BYTES)
@@ -0,0 +1,337 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+from numba import njit, prange
+
+# Fused kernels of the built-in strategies: each column of a time x symbol block is walked once,
+# computing the indicators and the buy/sell signals at every bar, and columns run in parallel.
+# Rolling windows keep their running sums in ring buffers of the window length instead of
+# full-length temporaries. The arithmetic follows vbt's indicator implementations (minimum periods
+# equal to the window, simple moving averages except for ATR's exponential one, ddof=0) operation by
+# operation, so outputs are identical to the indicator + signal path of strategies.py.
+
+# Rolling min/max windows up to this length are rescanned, which beats the deque's
+# unpredictable branches on short windows
+SCAN_MAX_WINDOW = 16
+
+
+@njit(cache=True)
+def _rolling_step(value, i, window, state, ring):
+    """
+    Advances the running sums of a rolling window by one bar (vbt's rolling_mean_1d_nb and
+    rolling_std_1d_nb). state holds the cumulative sum, sum of squares and NaN count and the ring
+    slot of the current bar, ring their values at the last window bars. Returns the window length,
+    sum and sum of squares.
+    """
+    if np.isnan(value):
+        state[2] = state[2] + 1
+    else:
+        state[0] = state[0] + value
+        state[1] = state[1] + value ** 2
+
+    slot = int(state[3])
+    if i < window:
+        window_len = i + 1 - state[2]
+        window_sum = state[0]
+        window_sum_sq = state[1]
+    else:
+        window_len = window - (state[2] - ring[slot, 2])
+        window_sum = state[0] - ring[slot, 0]
+        window_sum_sq = state[1] - ring[slot, 1]
+
+    ring[slot, 0] = state[0]
+    ring[slot, 1] = state[1]
+    ring[slot, 2] = state[2]
+    state[3] = slot + 1 if slot + 1 < window else 0
+    return window_len, window_sum, window_sum_sq
+
+
+@njit(cache=True)
+def _rolling_mean(value, i, window, state, ring):
+    window_len, window_sum, _ = _rolling_step(value, i, window, state, ring)
+    if window_len < window:
+        return np.nan
+    return window_sum / window_len
+
+
+@njit(cache=True)
+def _ewm_mean(value, i, span, state):
+    """
+    Exponential moving average with adjust=False and min_periods=span (vbt's ewm_mean_1d_nb).
+    state holds the weighted average, the number of observations and the old weight.
+    """
+    is_observation = value == value
+    if i == 0:
+        state[0] = value
+        state[1] = is_observation
+        state[2] = 1.
+    else:
+        alpha = 1. / (1. + (span - 1) / 2.0)
+        state[1] += is_observation
+        if state[0] == state[0]:
+            state[2] *= 1. - alpha
+            if is_observation:
+                # avoid numerical errors on constant series
+                if state[0] != value:
+                    state[0] = ((state[2] * state[0]) + (alpha * value)) / (state[2] + alpha)
+                state[2] = 1.
+        elif is_observation:
+            state[0] = value
+    return state[0] if state[1] >= span else np.nan
+
+
+@njit(cache=True)
+def _rolling_extreme(value, i, window, positions, values, state, is_max):
+    """
+    Rolling min (or max) of the last window bars, NaN until the window is full or while it holds
+    a NaN (vbt's rolling_min_1d_nb with minp=window), kept in a monotonic ring deque of bar
+    positions and values instead of rescanning the window. state holds the deque head and length
+    and the position of the last NaN.
+    """
+    # Positions leave the front once they fall out of the window
+    while state[1] > 0 and positions[state[0]] <= i - window:
+        state[0] = state[0] + 1 if state[0] + 1 < window else 0
+        state[1] -= 1
+
+    if value != value:
+        state[2] = i
+    else:
+        while state[1] > 0:
+            back = state[0] + state[1] - 1
+            if back >= window:
+                back -= window
+            if (values[back] <= value) if is_max else (values[back] >= value):
+                state[1] -= 1
+            else:
+                break
+        tail = state[0] + state[1]
+        if tail >= window:
+            tail -= window
+        positions[tail] = i
+        values[tail] = value
+        state[1] += 1
+
+    if i + 1 < window or state[2] > i - window:
+        return np.nan
+    return values[state[0]]
+
+
+@njit(cache=True)
+def new_deque_state(window):
+    """Empty rolling min/max deque state: no positions and no NaN within reach of the window."""
+    return np.array([0, 0, -1 - window], dtype=np.int64)
+
+
+@njit(cache=True)
+def _rolling_extreme_scan(a, i, window, is_max):
+    """Rolling min (or max) by rescanning the window, as vbt's rolling_min_1d_nb does."""
+    extreme = a[i]
+    count = 0
+    for j in range(max(i - window + 1, 0), i + 1):
+        if np.isnan(a[j]):
+            continue
+        if np.isnan(extreme) or ((a[j] > extreme) if is_max else (a[j] < extreme)):
+            extreme = a[j]
+        count += 1
+    return extreme if count >= window else np.nan
+
+
+@njit(cache=True, parallel=True, error_model="numpy")
+def sma_rsi_nb(close, short_window, long_window, rsi_window, rsi_buy, rsi_sell):
+    n_rows, n_cols = close.shape
+    sma_short = np.empty((n_rows, n_cols))
+    sma_long = np.empty((n_rows, n_cols))
+    rsi = np.empty((n_rows, n_cols))
+    buy = np.empty((n_rows, n_cols), dtype=np.bool_)
+    sell = np.empty((n_rows, n_cols), dtype=np.bool_)
+
+    for col in prange(n_cols):
+        short_state, short_ring = np.zeros(4), np.zeros((short_window, 3))
+        long_state, long_ring = np.zeros(4), np.zeros((long_window, 3))
+        up_state, up_ring = np.zeros(4), np.zeros((rsi_window, 3))
+        down_state, down_ring = np.zeros(4), np.zeros((rsi_window, 3))
+
+        for i in range(n_rows):
+            value = close[i, col]
+            short_ma = _rolling_mean(value, i, short_window, short_state, short_ring)
+            long_ma = _rolling_mean(value, i, long_window, long_state, long_ring)
+
+            delta = value - close[i - 1, col] if i > 0 else np.nan
+            up = 0.0 if delta < 0 else delta
+            down = np.abs(0.0 if delta > 0 else delta)
+            rs = (_rolling_mean(up, i, rsi_window, up_state, up_ring)
+                  / _rolling_mean(down, i, rsi_window, down_state, down_ring))
+            rsi_value = 100 - 100 / (1 + rs)
+
+            sma_short[i, col] = short_ma
+            sma_long[i, col] = long_ma
+            rsi[i, col] = rsi_value
+            buy[i, col] = (short_ma > long_ma) & (rsi_value < rsi_buy)
+            sell[i, col] = (short_ma < long_ma) & (rsi_value > rsi_sell)
+
+    return sma_short, sma_long, rsi, buy, sell
+
+
+@njit(cache=True, parallel=True, error_model="numpy")
+def macd_nb(close, fast_window, slow_window, signal_window):
+    n_rows, n_cols = close.shape
+    macd = np.empty((n_rows, n_cols))
+    signal = np.empty((n_rows, n_cols))
+    buy = np.empty((n_rows, n_cols), dtype=np.bool_)
+    sell = np.empty((n_rows, n_cols), dtype=np.bool_)
+
+    for col in prange(n_cols):
+        fast_state, fast_ring = np.zeros(4), np.zeros((fast_window, 3))
+        slow_state, slow_ring = np.zeros(4), np.zeros((slow_window, 3))
+        signal_state, signal_ring = np.zeros(4), np.zeros((signal_window, 3))
+
+        for i in range(n_rows):
+            value = close[i, col]
+            macd_value = (_rolling_mean(value, i, fast_window, fast_state, fast_ring)
+                          - _rolling_mean(value, i, slow_window, slow_state, slow_ring))
+            signal_value = _rolling_mean(macd_value, i, signal_window, signal_state, signal_ring)
+
+            macd[i, col] = macd_value
+            signal[i, col] = signal_value
+            buy[i, col] = macd_value > signal_value
+            sell[i, col] = macd_value < signal_value
+
+    return macd, signal, buy, sell
+
+
+@njit(cache=True, parallel=True, error_model="numpy")
+def bollinger_bands_nb(close, window, num_std):
+    n_rows, n_cols = close.shape
+    upper = np.empty((n_rows, n_cols))
+    lower = np.empty((n_rows, n_cols))
+    mid = np.empty((n_rows, n_cols))
+    buy = np.empty((n_rows, n_cols), dtype=np.bool_)
+    sell = np.empty((n_rows, n_cols), dtype=np.bool_)
+
+    for col in prange(n_cols):
+        state, ring = np.zeros(4), np.zeros((window, 3))
+
+        for i in range(n_rows):
+            value = close[i, col]
+            window_len, window_sum, window_sum_sq = _rolling_step(value, i, window, state, ring)
+            if window_len < window:
+                ma = np.nan
+                mstd = np.nan
+            else:
+                ma = window_sum / window_len
+                mstd = np.sqrt(np.abs(window_sum_sq - 2 * window_sum * ma + window_len * ma ** 2) / window_len)
+            upper_value = ma + num_std * mstd
+            lower_value = ma - num_std * mstd
+
+            upper[i, col] = upper_value
+            lower[i, col] = lower_value
+            mid[i, col] = ma
+            buy[i, col] = value < lower_value
+            sell[i, col] = value > upper_value
+
+    return upper, lower, mid, buy, sell
+
+
+@njit(cache=True, parallel=True, error_model="numpy")
+def stochastic_nb(high, low, close, k_window, d_window, stoch_buy, stoch_sell):
+    n_rows, n_cols = close.shape
+    percent_k = np.empty((n_rows, n_cols))
+    percent_d = np.empty((n_rows, n_cols))
+    buy = np.empty((n_rows, n_cols), dtype=np.bool_)
+    sell = np.empty((n_rows, n_cols), dtype=np.bool_)
+
+    for col in prange(n_cols):
+        high_col, low_col = high[:, col], low[:, col]
+        min_positions, min_values, min_state = np.empty(k_window, np.int64), np.empty(k_window), new_deque_state(k_window)
+        max_positions, max_values, max_state = np.empty(k_window, np.int64), np.empty(k_window), new_deque_state(k_window)
+        d_state, d_ring = np.zeros(4), np.zeros((d_window, 3))
+
+        for i in range(n_rows):
+            if k_window <= SCAN_MAX_WINDOW:
+                roll_min = _rolling_extreme_scan(low_col, i, k_window, False)
+                roll_max = _rolling_extreme_scan(high_col, i, k_window, True)
+            else:
+                roll_min = _rolling_extreme(low_col[i], i, k_window, min_positions, min_values, min_state, False)
+                roll_max = _rolling_extreme(high_col[i], i, k_window, max_positions, max_values, max_state, True)
+            k_value = 100 * (close[i, col] - roll_min) / (roll_max - roll_min)
+            d_value = _rolling_mean(k_value, i, d_window, d_state, d_ring)
+
+            percent_k[i, col] = k_value
+            percent_d[i, col] = d_value
+            buy[i, col] = (k_value < stoch_buy) & (k_value > d_value)
+            sell[i, col] = (k_value > stoch_sell) & (k_value < d_value)
+
+    return percent_k, percent_d, buy, sell
+
+
+@njit(cache=True, parallel=True, error_model="numpy")
+def atr_breakout_nb(high, low, close, atr_window, atr_multiplier):
+    n_rows, n_cols = close.shape
+    atr = np.empty((n_rows, n_cols))
+    buy = np.empty((n_rows, n_cols), dtype=np.bool_)
+    sell = np.empty((n_rows, n_cols), dtype=np.bool_)
+
+    for col in prange(n_cols):
+        state = np.zeros(3)
+
+        for i in range(n_rows):
+            prev_close = close[i - 1, col] if i > 0 else np.nan
+            true_range = max(
+                high[i, col] - low[i, col], np.abs(high[i, col] - prev_close), np.abs(low[i, col] - prev_close)
+            )
+            atr_value = _ewm_mean(true_range, i, atr_window, state)
+            band = atr_value * atr_multiplier
+
+            atr[i, col] = atr_value
+            buy[i, col] = close[i, col] > prev_close + band
+            sell[i, col] = close[i, col] < prev_close - band
+
+    return atr, buy, sell
+
+
+def _matrix(data: Dict[str, pd.DataFrame], field: str) -> np.ndarray:
+    return np.asarray(data[field].to_numpy(), dtype=np.float64)
+
+
+def _frames(data: Dict[str, pd.DataFrame], outputs: Dict[str, np.ndarray]) -> Dict[str, pd.DataFrame]:
+    """Labels kernel outputs like the input frames."""
+    close = data["close"]
+    return {name: pd.DataFrame(values, index=close.index, columns=close.columns) for name, values in outputs.items()}
+
+
+def fused_sma_rsi(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    outputs = sma_rsi_nb(
+        _matrix(data, "close"), strategy_params["short_window"], strategy_params["long_window"],
+        strategy_params["rsi_window"], strategy_params["rsi_buy"], strategy_params["rsi_sell"]
+    )
+    return _frames(data, dict(zip(["SMA_short", "SMA_long", "RSI", "buy_signal", "sell_signal"], outputs)))
+
+
+def fused_macd(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    outputs = macd_nb(
+        _matrix(data, "close"), strategy_params["short_window"], strategy_params["long_window"],
+        strategy_params["signal_window"]
+    )
+    return _frames(data, dict(zip(["MACD", "MACD_signal", "buy_signal", "sell_signal"], outputs)))
+
+
+def fused_bollinger_bands(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    outputs = bollinger_bands_nb(_matrix(data, "close"), strategy_params["window"], strategy_params["num_std"])
+    return _frames(data, dict(zip(["BB_upper", "BB_lower", "BB_mid", "buy_signal", "sell_signal"], outputs)))
+
+
+def fused_stochastic(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    outputs = stochastic_nb(
+        _matrix(data, "high"), _matrix(data, "low"), _matrix(data, "close"), strategy_params["k_window"],
+        strategy_params["d_window"], strategy_params["stoch_buy"], strategy_params["stoch_sell"]
+    )
+    return _frames(data, dict(zip(["%K", "%D", "buy_signal", "sell_signal"], outputs)))
+
+
+def fused_atr_breakout(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    outputs = atr_breakout_nb(
+        _matrix(data, "high"), _matrix(data, "low"), _matrix(data, "close"), strategy_params["atr_window"],
+        strategy_params["atr_multiplier"]
+    )
+    return _frames(data, dict(zip(["ATR", "buy_signal", "sell_signal"], outputs)))
@@ -0,0 +1,344 @@
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from backtester.data_loader.timeframes import timeframe_key
+from backtester.strategies import expressions, kernels, strategies
+from backtester.strategies.indicator_cache import indicator_cache, make_indicator_key
+from logger.config import logger
+from settings import FUSED_KERNELS_ENABLED, STRATEGIES_CONFIG
+
+# Each strategy declares the kline fields it reads (only those are loaded), its parameters
+# with their types and defaults (mirroring the 'params' of STRATEGIES_CONFIG), the parameters its
+# indicators depend on (changing any other parameter reuses cached indicators) and the frames it adds.
+# 'timeframes' lists the fields it reads on intervals higher than the one it runs on.
+# 'kernel' computes indicators and signals of single-parameter runs in one fused numba pass.
+# 'ordered_params' lists parameter pairs whose values must increase; sweeps skip combinations breaking them.
+# Expression strategies of STRATEGIES_CONFIG are added by register_expression_strategies
+SIGNAL_OUTPUTS: List[str] = ["buy_signal", "sell_signal"]
+
+STRATEGY_REGISTRY: Dict[str, Dict] = {
+    "sma_rsi": {
+        "indicators": strategies.indicators_sma_rsi,
+        "signals": strategies.signals_sma_rsi,
+        "kernel": kernels.fused_sma_rsi,
+        "fields": ["close"],
+        "timeframes": {},
+        "params": {
+            "short_window": {"type": int, "default": 20},
+            "long_window": {"type": int, "default": 50},
+            "rsi_window": {"type": int, "default": 14},
+            "rsi_buy": {"type": float, "default": 30},
+            "rsi_sell": {"type": float, "default": 70},
+        },
+        "indicator_params": ["short_window", "long_window", "rsi_window"],
+        "ordered_params": [("short_window", "long_window")],
+        "outputs": ["SMA_short", "SMA_long", "RSI", "buy_signal", "sell_signal"],
+    },
+    "macd": {
+        "indicators": strategies.indicators_macd,
+        "signals": strategies.signals_macd,
+        "kernel": kernels.fused_macd,
+        "fields": ["close"],
+        "timeframes": {},
+        "params": {
+            "short_window": {"type": int, "default": 12},
+            "long_window": {"type": int, "default": 26},
+            "signal_window": {"type": int, "default": 9},
+        },
+        "indicator_params": ["short_window", "long_window", "signal_window"],
+        "ordered_params": [("short_window", "long_window")],
+        "outputs": ["MACD", "MACD_signal", "buy_signal", "sell_signal"],
+    },
+    "bollinger_bands": {
+        "indicators": strategies.indicators_bollinger_bands,
+        "signals": strategies.signals_bollinger_bands,
+        "kernel": kernels.fused_bollinger_bands,
+        "fields": ["close"],
+        "timeframes": {},
+        "params": {
+            "window": {"type": int, "default": 20},
+            "num_std": {"type": float, "default": 2},
+        },
+        "indicator_params": ["window", "num_std"],
+        "ordered_params": [],
+        "outputs": ["BB_upper", "BB_lower", "BB_mid", "buy_signal", "sell_signal"],
+    },
+    "stochastic": {
+        "indicators": strategies.indicators_stochastic,
+        "signals": strategies.signals_stochastic,
+        "kernel": kernels.fused_stochastic,
+        "fields": ["high", "low", "close"],
+        "timeframes": {},
+        "params": {
+            "k_window": {"type": int, "default": 14},
+            "d_window": {"type": int, "default": 3},
+            "stoch_buy": {"type": float, "default": 20},
+            "stoch_sell": {"type": float, "default": 80},
+        },
+        "indicator_params": ["k_window", "d_window"],
+        "ordered_params": [],
+        "outputs": ["%K", "%D", "buy_signal", "sell_signal"],
+    },
+    "atr_breakout": {
+        "indicators": strategies.indicators_atr_breakout,
+        "signals": strategies.signals_atr_breakout,
+        "kernel": kernels.fused_atr_breakout,
+        "fields": ["high", "low", "close"],
+        "timeframes": {},
+        "params": {
+            "atr_window": {"type": int, "default": 14},
+            "atr_multiplier": {"type": float, "default": 1.5},
+        },
+        "indicator_params": ["atr_window"],
+        "ordered_params": [],
+        "outputs": ["ATR", "buy_signal", "sell_signal"],
+    },
+}
+
+
+def get_strategy(strategy_name: str) -> Dict:
+    """
+    Returns the registry entry of a strategy.
+
+    Raises:
+        KeyError: If the strategy is not registered.
+    """
+    if strategy_name not in STRATEGY_REGISTRY:
+        raise KeyError(f"Strategy {strategy_name} not found")
+    return STRATEGY_REGISTRY[strategy_name]
+
+
+def get_required_fields(strategy_name: str) -> List[str]:
+    """Returns the kline columns a strategy reads."""
+    return list(get_strategy(strategy_name)["fields"])
+
+
+def get_required_timeframes(strategy_name: str) -> Dict[str, List[str]]:
+    """Returns the kline columns a strategy reads per higher interval."""
+    return {interval: list(fields) for interval, fields in get_strategy(strategy_name)["timeframes"].items()}
+
+
+def is_param_order_kept(strategy_name: str, params: Dict) -> bool:
+    """Whether resolved parameters keep the strategy's ordered pairs (e.g., short_window below long_window)."""
+    return all(params[lower] < params[higher] for lower, higher in get_strategy(strategy_name)["ordered_params"])
+
+
+def get_interval_error(strategy_name: str, interval: str) -> Optional[str]:
+    """
+    Checks that a strategy can run on a base interval: every higher timeframe it reads must be
+    above it (see load_timeframes), which is known before any data is loaded.
+
+    Returns:
+        Optional[str]: Why the strategy cannot run on the interval, None if it can.
+    """
+    timeframes = get_strategy(strategy_name)["timeframes"]
+    if not timeframes:
+        return None
+    lowest = min(timeframes, key=pd.Timedelta)
+    if pd.Timedelta(interval) >= pd.Timedelta(lowest):
+        return f"Strategy {strategy_name} reads the {lowest} timeframe and runs on intervals below {lowest}, not {interval}"
+    return None
+
+
+def get_data_keys(strategy_name: str) -> List[str]:
+    """Returns the keys of the frames a strategy reads: its fields, then those of its higher timeframes (e.g., 'close@1h')."""
+    strategy = get_strategy(strategy_name)
+    return strategy["fields"] + [
+        timeframe_key(field, interval) for interval, fields in strategy["timeframes"].items() for field in fields
+    ]
+
+
+def resolve_params(strategy_name: str, strategy_params: Dict) -> Dict:
+    """
+    Validates strategy parameters against the declared schema: casts values to their declared
+    types (the bot collects every value as float) and fills in defaults of missing parameters.
+
+    Args:
+        strategy_name (str): Registered strategy name.
+        strategy_params (Dict): Parameters given by the user or the config.
+
+    Returns:
+        Dict: Complete parameters of the strategy.
+
+    Raises:
+        ValueError: On unknown parameters or values that do not fit the declared type.
+    """
+    schema = get_strategy(strategy_name)["params"]
+
+    unknown = set(strategy_params) - set(schema)
+    if unknown:
+        raise ValueError(f"Unknown parameters for {strategy_name}: {', '.join(sorted(unknown))}")
+
+    params = {}
+    for param_name, param_info in schema.items():
+        value = strategy_params.get(param_name, param_info["default"])
+        if param_info["type"] is int and float(value) != int(float(value)):
+            raise ValueError(f"Parameter {param_name} of {strategy_name} must be a whole number, got {value}")
+        params[param_name] = param_info["type"](float(value))
+
+    return params
+
+
+def run_strategy(
+        strategy_name: str,
+        data: Dict[str, pd.DataFrame],
+        strategy_params: Dict,
+        fingerprint: Optional[str] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Runs a registered strategy on time x symbol frames. With a data fingerprint, indicators are
+    served from the indicator cache when the same data and indicator parameters were seen before,
+    so changing only thresholds or portfolio parameters skips the indicator computation.
+    Otherwise the strategy's fused kernel computes indicators and signals in one pass
+    (the pandas indicator and signal stages with FUSED_KERNELS_ENABLED off).
+
+    Args:
+        strategy_name (str): Registered strategy name.
+        data (Dict[str, pd.DataFrame]): Time x symbol frames holding at least the required fields.
+        strategy_params (Dict): Strategy parameters, resolved against the schema.
+        fingerprint (Optional[str]): Fingerprint of the data (see get_data_fingerprint); no caching if None.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Input frames plus the declared outputs, including 'buy_signal' and 'sell_signal'.
+    """
+    strategy = get_strategy(strategy_name)
+
+    missing = [key for key in get_data_keys(strategy_name) if key not in data]
+    if missing:
+        raise ValueError(f"Strategy {strategy_name} requires fields: {', '.join(missing)}")
+
+    params = resolve_params(strategy_name, strategy_params)
+
+    indicators = None
+    key = None
+    if fingerprint is not None and indicator_cache.enabled:
+        key = make_indicator_key(
+            fingerprint, strategy_name, {param_name: params[param_name] for param_name in strategy["indicator_params"]}
+        )
+        indicators = indicator_cache.get(key)
+
+    if indicators is None and FUSED_KERNELS_ENABLED and strategy["kernel"] is not None:
+        outputs = strategy["kernel"](data, params)
+        if key is not None:
+            indicator_cache.put(key, {name: frame for name, frame in outputs.items() if name not in SIGNAL_OUTPUTS})
+        data.update(outputs)
+        return data
+
+    if indicators is None:
+        indicators = strategy["indicators"](data, params)
+        if key is not None:
+            indicator_cache.put(key, indicators)
+
+    data.update(indicators)
+    return strategy["signals"](data, params)
+
+
+def register_expression_strategies(strategies_config: Dict) -> None:
+    """
+    Compiles the strategies of the config that define 'signals' expressions and registers them.
+    Their indicator stage evaluates the indicator calls of the expressions, the signal stage the
+    conditions; invalid strategies are logged and left unregistered.
+    """
+    for strategy_name, strategy_details in strategies_config.items():
+        if "signals" not in strategy_details:
+            continue
+        if strategy_name in STRATEGY_REGISTRY and "expression" not in STRATEGY_REGISTRY[strategy_name]:
+            logger.error(f"Expression strategy {strategy_name} has the name of a built-in strategy")
+            continue
+        try:
+            compiled = expressions.compile_strategy(strategy_name, strategy_details)
+        except ValueError as e:
+            logger.error(f"Expression strategy {strategy_name} is not registered: {e}")
+            continue
+
+        STRATEGY_REGISTRY[strategy_name] = {
+            "indicators": partial(expressions.compute_indicators, compiled),
+            "signals": partial(expressions.compute_signals, compiled),
+            "kernel": None,
+            "fields": compiled["fields"],
+            "timeframes": compiled["timeframes"],
+            "params": compiled["params"],
+            "indicator_params": compiled["indicator_params"],
+            "ordered_params": [],
+            "outputs": list(compiled["outputs"]) + SIGNAL_OUTPUTS,
+            "expression": compiled,
+        }
+
+
+def run_strategies(data: Dict[str, pd.DataFrame], runs: List[Tuple[str, Dict]]) -> List[Dict[str, pd.DataFrame]]:
+    """
+    Runs a batch of strategies on the same time x symbol frames. Indicators of all expression
+    strategies in the batch are evaluated together, so an indicator shared by several strategies
+    or parameter sets is computed once; built-in strategies run one by one.
+
+    Args:
+        data (Dict[str, pd.DataFrame]): Time x symbol frames holding the required fields of all strategies.
+        runs (List[Tuple[str, Dict]]): Registered strategy names and their parameters.
+
+    Returns:
+        List[Dict[str, pd.DataFrame]]: Input frames plus the declared outputs of every run, in order.
+    """
+    resolved = []
+    for strategy_name, strategy_params in runs:
+        strategy = get_strategy(strategy_name)
+        missing = [key for key in get_data_keys(strategy_name) if key not in data]
+        if missing:
+            raise ValueError(f"Strategy {strategy_name} requires fields: {', '.join(missing)}")
+        resolved.append((strategy_name, resolve_params(strategy_name, strategy_params)))
+
+    nodes = {
+        i: expressions.indicator_nodes(get_strategy(strategy_name)["expression"], params)
+        for i, (strategy_name, params) in enumerate(resolved) if "expression" in get_strategy(strategy_name)
+    }
+    values = iter(expressions.evaluate_nodes(
+        data, [node for run_nodes in nodes.values() for node in run_nodes.values()]
+    ))
+
+    results = []
+    for i, (strategy_name, params) in enumerate(resolved):
+        if i not in nodes:
+            results.append(run_strategy(strategy_name, dict(data), params))
+            continue
+        run_data = dict(data)
+        run_data.update({name: next(values) for name in nodes[i]})
+        results.append(get_strategy(strategy_name)["signals"](run_data, params))
+
+    n_indicators = len({node[2] for run_nodes in nodes.values() for node in run_nodes.values()})
+    logger.info(f"Ran {len(runs)} strategies, {len(nodes)} expression strategies sharing {n_indicators} distinct indicators")
+    return results
+
+
+def validate_strategies_config(strategies_config: Dict, symbols_config: Optional[Dict] = None) -> List[str]:
+    """
+    Compares configured strategies with the registry. With the symbols config, strategies that
+    cannot run on any configured interval (see get_interval_error) are reported too.
+
+    Returns:
+        List[str]: Descriptions of strategies or parameters that do not match.
+    """
+    problems = []
+    for strategy_name, strategy_details in strategies_config.items():
+        if strategy_name not in STRATEGY_REGISTRY:
+            problems.append(f"Strategy {strategy_name} is configured but not registered")
+            continue
+
+        configured = set(strategy_details.get("params", {}))
+        declared = set(STRATEGY_REGISTRY[strategy_name]["params"])
+        if configured - declared:
+            problems.append(f"Strategy {strategy_name} has unknown parameters: {', '.join(sorted(configured - declared))}")
+        if declared - configured:
+            problems.append(f"Strategy {strategy_name} does not configure: {', '.join(sorted(declared - configured))}")
+
+        intervals = {interval for symbol_intervals in (symbols_config or {}).values() for interval in symbol_intervals}
+        if intervals and all(get_interval_error(strategy_name, interval) for interval in intervals):
+            problems.append(
+                f"Strategy {strategy_name} cannot run on any configured interval ({', '.join(sorted(intervals))}): "
+                f"it reads the {min(STRATEGY_REGISTRY[strategy_name]['timeframes'], key=pd.Timedelta)} timeframe"
+            )
+
+    return problems
+
+
+register_expression_strategies(STRATEGIES_CONFIG)
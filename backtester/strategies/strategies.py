@@ -1,166 +1,118 @@
-from typing import Dict
+from typing import Dict, List
 
 import pandas as pd
 
 import vectorbt as vbt
 
-
-def strategy_sma_rsi_single(df: pd.DataFrame, strategy_params: Dict):
-    short_window = strategy_params.get("short_window", 20)
-    long_window = strategy_params.get("long_window", 50)
-    rsi_window = strategy_params.get("rsi_window", 14)
-    rsi_buy = strategy_params.get("rsi_buy", 30)
-    rsi_sell = strategy_params.get("rsi_sell", 70)
-
-    df["SMA_short"] = vbt.MA.run(df["close"], window=short_window).ma
-    df["SMA_long"] = vbt.MA.run(df["close"], window=long_window).ma
-    df["RSI"] = vbt.RSI.run(df["close"], window=rsi_window).rsi
-
-    df["buy_signal"] = (df["SMA_short"] > df["SMA_long"]) & (df["RSI"] < rsi_buy)
-    df["sell_signal"] = (df["SMA_short"] < df["SMA_long"]) & (df["RSI"] > rsi_sell)
-
-    return df
-
-
-def strategy_sma_rsi_multi(df: pd.DataFrame, strategy_params: Dict):
-    short_window = strategy_params.get("short_window", 20)
-    long_window = strategy_params.get("long_window", 50)
-    rsi_window = strategy_params.get("rsi_window", 14)
-    rsi_buy = strategy_params.get("rsi_buy", 30)
-    rsi_sell = strategy_params.get("rsi_sell", 70)
-
-    df["SMA_short"] = df.groupby(level="symbol")["close"].transform(lambda x: vbt.MA.run(x, window=short_window).ma)
-    df["SMA_long"] = df.groupby(level="symbol")["close"].transform(lambda x: vbt.MA.run(x, window=long_window).ma)
-    df["RSI"] = df.groupby(level="symbol")["close"].transform(lambda x: vbt.RSI.run(x, window=rsi_window).rsi)
-
-    df["buy_signal"] = (df["SMA_short"] > df["SMA_long"]) & (df["RSI"] < rsi_buy)
-    df["sell_signal"] = (df["SMA_short"] < df["SMA_long"]) & (df["RSI"] > rsi_sell)
-
-    return df
-
-
-def strategy_macd_single(df: pd.DataFrame, strategy_params: Dict):
-    short_window = strategy_params.get("short_window", 12)
-    long_window = strategy_params.get("long_window", 26)
-    signal_window = strategy_params.get("signal_window", 9)
-
-    # Calculate MACD
-    macd = vbt.MACD.run(df["close"], fast_window=short_window, slow_window=long_window, signal_window=signal_window)
-    df["MACD"] = macd.macd
-    df["MACD_signal"] = macd.signal
-
-    df["buy_signal"] = df["MACD"] > df["MACD_signal"]
-    df["sell_signal"] = df["MACD"] < df["MACD_signal"]
-
-    return df
-
-
-def strategy_macd_multi(df: pd.DataFrame, strategy_params: Dict):
-    short_window = strategy_params.get("short_window", 12)
-    long_window = strategy_params.get("long_window", 26)
-    signal_window = strategy_params.get("signal_window", 9)
-
-    df["MACD"] = df.groupby(level="symbol")["close"].transform(
-        lambda x: vbt.MACD.run(x, fast_window=short_window, slow_window=long_window, signal_window=signal_window).macd
+# Strategies take and return time x symbol frames keyed by field (see load_klines_matrix);
+# a single-asset backtest is the one-column case. Parameters arrive resolved by the registry.
+# Each strategy is split into an indicator stage, which depends on the data and the indicator
+# parameters only and is cached across runs, and a cheap signal stage applying thresholds.
+# Indicators run once on the whole block, hiding the parameter column levels keeps their outputs
+# labeled by symbol only. In a parameter sweep indicator parameters are per-combination lists,
+# the outputs then keep their parameter levels and are relabeled by the sweep
+MA_PARAMS = ["window", "ewm"]
+RSI_PARAMS = ["window", "ewm"]
+MACD_PARAMS = ["fast_window", "slow_window", "signal_window", "macd_ewm", "signal_ewm"]
+BBANDS_PARAMS = ["window", "ewm", "alpha"]
+STOCH_PARAMS = ["k_window", "d_window", "d_ewm"]
+ATR_PARAMS = ["window", "ewm"]
+
+
+def _hidden_params(param_names: List[str], *values) -> List[str]:
+    """Parameter levels to hide from indicator outputs: all for a single run, none in a sweep."""
+    return [] if any(isinstance(value, list) for value in values) else param_names
+
+
+def indicators_sma_rsi(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    close = data["close"]
+    short_window = strategy_params["short_window"]
+    long_window = strategy_params["long_window"]
+    rsi_window = strategy_params["rsi_window"]
+    return {
+        "SMA_short": vbt.MA.run(close, window=short_window, hide_params=_hidden_params(MA_PARAMS, short_window)).ma,
+        "SMA_long": vbt.MA.run(close, window=long_window, hide_params=_hidden_params(MA_PARAMS, long_window)).ma,
+        "RSI": vbt.RSI.run(close, window=rsi_window, hide_params=_hidden_params(RSI_PARAMS, rsi_window)).rsi,
+    }
+
+
+def signals_sma_rsi(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    rsi_buy = strategy_params["rsi_buy"]
+    rsi_sell = strategy_params["rsi_sell"]
+
+    data["buy_signal"] = (data["SMA_short"] > data["SMA_long"]) & (data["RSI"] < rsi_buy)
+    data["sell_signal"] = (data["SMA_short"] < data["SMA_long"]) & (data["RSI"] > rsi_sell)
+
+    return data
+
+
+def indicators_macd(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    short_window = strategy_params["short_window"]
+    long_window = strategy_params["long_window"]
+    signal_window = strategy_params["signal_window"]
+    macd = vbt.MACD.run(
+        data["close"], fast_window=short_window, slow_window=long_window, signal_window=signal_window,
+        hide_params=_hidden_params(MACD_PARAMS, short_window, long_window, signal_window)
     )
-    df["MACD_signal"] = df.groupby(level="symbol")["close"].transform(
-        lambda x: vbt.MACD.run(x, fast_window=short_window, slow_window=long_window, signal_window=signal_window).signal
-    )
-
-    df["buy_signal"] = df["MACD"] > df["MACD_signal"]
-    df["sell_signal"] = df["MACD"] < df["MACD_signal"]
-
-    return df
-
-
-def strategy_bollinger_bands_single(df: pd.DataFrame, strategy_params: Dict):
-    window = strategy_params.get("window", 20)
-    num_std = strategy_params.get("num_std", 2)
+    return {"MACD": macd.macd, "MACD_signal": macd.signal}
 
-    bb = vbt.BBANDS.run(df["close"], window=window, alpha=num_std)
-    df["BB_upper"] = bb.upper
-    df["BB_lower"] = bb.lower
-    df["BB_mid"] = bb.middle
 
-    df["buy_signal"] = df["close"] < df["BB_lower"]
-    df["sell_signal"] = df["close"] > df["BB_upper"]
+def signals_macd(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    data["buy_signal"] = data["MACD"] > data["MACD_signal"]
+    data["sell_signal"] = data["MACD"] < data["MACD_signal"]
 
-    return df
+    return data
 
 
-def strategy_bollinger_bands_multi(df: pd.DataFrame, strategy_params: Dict):
-    window = strategy_params.get("window", 20)
-    num_std = strategy_params.get("num_std", 2)
-
-    df["BB_upper"] = df.groupby(level="symbol")["close"].transform(
-        lambda x: vbt.BBANDS.run(x, window=window, alpha=num_std).upper
-    )
-    df["BB_lower"] = df.groupby(level="symbol")["close"].transform(
-        lambda x: vbt.BBANDS.run(x, window=window, alpha=num_std).lower
+def indicators_bollinger_bands(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    window = strategy_params["window"]
+    num_std = strategy_params["num_std"]
+    bb = vbt.BBANDS.run(
+        data["close"], window=window, alpha=num_std, hide_params=_hidden_params(BBANDS_PARAMS, window, num_std)
     )
-    df["BB_mid"] = df.groupby(level="symbol")["close"].transform(
-        lambda x: vbt.BBANDS.run(x, window=window, alpha=num_std).middle
-    )
-
-    df["buy_signal"] = df["close"] < df["BB_lower"]
-    df["sell_signal"] = df["close"] > df["BB_upper"]
+    return {"BB_upper": bb.upper, "BB_lower": bb.lower, "BB_mid": bb.middle}
 
-    return df
 
+def signals_bollinger_bands(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    data["buy_signal"] = data["close"] < data["BB_lower"]
+    data["sell_signal"] = data["close"] > data["BB_upper"]
 
-# TODO: Remove duplication
-def strategy_stochastic_single(df: pd.DataFrame, strategy_params: Dict):
-    k_window = strategy_params.get("k_window", 14)
-    d_window = strategy_params.get("d_window", 3)
-    stoch_buy = strategy_params.get("stoch_buy", 20)
-    stoch_sell = strategy_params.get("stoch_sell", 80)
+    return data
 
-    stoch = vbt.STOCH.run(df["high"], df["low"], df["close"], k_window=k_window, d_window=d_window)
-    df["%K"] = stoch.percent_k
-    df["%D"] = stoch.percent_d
 
-    df["buy_signal"] = (df["%K"] < stoch_buy) & (df["%K"] > df["%D"])
-    df["sell_signal"] = (df["%K"] > stoch_sell) & (df["%K"] < df["%D"])
-
-    return df
-
-
-def strategy_stochastic_multi(df: pd.DataFrame, strategy_params: Dict):
-    k_window = strategy_params.get("k_window", 14)
-    d_window = strategy_params.get("d_window", 3)
-    stoch_buy = strategy_params.get("stoch_buy", 20)
-    stoch_sell = strategy_params.get("stoch_sell", 80)
-
-    print(df.head(), df.columns, df.index.names)
-    stoch = vbt.STOCH.run(df["high"], df["low"], df["close"], k_window=k_window, d_window=d_window)
-    df["%K"] = stoch.percent_k
-    df["%D"] = stoch.percent_d
-
-    df["buy_signal"] = (df["%K"] < stoch_buy) & (df["%K"] > df["%D"])
-    df["sell_signal"] = (df["%K"] > stoch_sell) & (df["%K"] < df["%D"])
-
-    return df
+def indicators_stochastic(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    k_window = strategy_params["k_window"]
+    d_window = strategy_params["d_window"]
+    stoch = vbt.STOCH.run(
+        data["high"], data["low"], data["close"], k_window=k_window, d_window=d_window,
+        hide_params=_hidden_params(STOCH_PARAMS, k_window, d_window)
+    )
+    return {"%K": stoch.percent_k, "%D": stoch.percent_d}
 
 
-def strategy_atr_breakout_single(df: pd.DataFrame, strategy_params: Dict):
-    atr_window = strategy_params.get("atr_window", 14)
-    atr_multiplier = strategy_params.get("atr_multiplier", 1.5)
+def signals_stochastic(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    stoch_buy = strategy_params["stoch_buy"]
+    stoch_sell = strategy_params["stoch_sell"]
 
-    df["ATR"] = vbt.ATR.run(df["high"], df["low"], df["close"], window=atr_window).atr
+    data["buy_signal"] = (data["%K"] < stoch_buy) & (data["%K"] > data["%D"])
+    data["sell_signal"] = (data["%K"] > stoch_sell) & (data["%K"] < data["%D"])
 
-    df["buy_signal"] = df["close"] > df["close"].shift(1) + (df["ATR"] * atr_multiplier)
-    df["sell_signal"] = df["close"] < df["close"].shift(1) - (df["ATR"] * atr_multiplier)
+    return data
 
-    return df
 
+def indicators_atr_breakout(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    atr_window = strategy_params["atr_window"]
+    atr = vbt.ATR.run(
+        data["high"], data["low"], data["close"], window=atr_window, hide_params=_hidden_params(ATR_PARAMS, atr_window)
+    )
+    return {"ATR": atr.atr}
 
-def strategy_atr_breakout_multi(df: pd.DataFrame, strategy_params: Dict):
-    atr_window = strategy_params.get("atr_window", 14)
-    atr_multiplier = strategy_params.get("atr_multiplier", 1.5)
 
-    df["ATR"] = vbt.ATR.run(df["high"], df["low"], df["close"], window=atr_window).atr
+def signals_atr_breakout(data: Dict[str, pd.DataFrame], strategy_params: Dict) -> Dict[str, pd.DataFrame]:
+    atr_multiplier = strategy_params["atr_multiplier"]
 
-    df["buy_signal"] = df["close"] > df["close"].shift(1) + (df["ATR"] * atr_multiplier)
-    df["sell_signal"] = df["close"] < df["close"].shift(1) - (df["ATR"] * atr_multiplier)
+    close = data["close"]
+    data["buy_signal"] = close > close.shift(1) + (data["ATR"] * atr_multiplier)
+    data["sell_signal"] = close < close.shift(1) - (data["ATR"] * atr_multiplier)
 
-    return df
+    return data
@@ -0,0 +1,480 @@
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numba import njit, prange
+
+from backtester.strategies import registry
+from backtester.strategies.indicator_cache import make_indicator_key, read_frames, write_frames
+from backtester.strategies.kernels import _ewm_mean, _rolling_extreme, _rolling_mean, _rolling_step, new_deque_state
+from logger.config import logger
+from utils import path_utils
+
+# Streaming indicators keep the rolling state of vbt's indicators per column (running sums in
+# ring buffers, EWM weights, min/max deques) and advance it bar by bar, so appending bars costs
+# O(1) per column and bar. As they share the step functions of the fused kernels, a series streamed
+# in any number of pieces gives the same values as vbt on the whole series.
+
+# Output chunks of a stream checkpoint are merged into one once there are more than this many
+STREAM_MAX_CHUNKS: int = 32
+
+_lock = threading.Lock()
+
+
+@njit(cache=True, parallel=True)
+def _ma_update_nb(close, start, window, sums, ring):
+    n_rows, n_cols = close.shape
+    ma = np.empty((n_rows, n_cols))
+    for col in prange(n_cols):
+        for row in range(n_rows):
+            ma[row, col] = _rolling_mean(close[row, col], start + row, window, sums[col], ring[col])
+    return ma
+
+
+@njit(cache=True, parallel=True, error_model="numpy")
+def _rsi_update_nb(close, start, window, prev_close, up_sums, up_ring, down_sums, down_ring):
+    n_rows, n_cols = close.shape
+    rsi = np.empty((n_rows, n_cols))
+    for col in prange(n_cols):
+        for row in range(n_rows):
+            i = start + row
+            delta = close[row, col] - prev_close[col] if i > 0 else np.nan
+            prev_close[col] = close[row, col]
+            up = 0.0 if delta < 0 else delta
+            down = np.abs(0.0 if delta > 0 else delta)
+            rs = (_rolling_mean(up, i, window, up_sums[col], up_ring[col])
+                  / _rolling_mean(down, i, window, down_sums[col], down_ring[col]))
+            rsi[row, col] = 100 - 100 / (1 + rs)
+    return rsi
+
+
+@njit(cache=True, parallel=True)
+def _macd_update_nb(close, start, fast_window, slow_window, signal_window,
+                    fast_sums, fast_ring, slow_sums, slow_ring, signal_sums, signal_ring):
+    n_rows, n_cols = close.shape
+    macd = np.empty((n_rows, n_cols))
+    signal = np.empty((n_rows, n_cols))
+    for col in prange(n_cols):
+        for row in range(n_rows):
+            i = start + row
+            macd_value = (_rolling_mean(close[row, col], i, fast_window, fast_sums[col], fast_ring[col])
+                          - _rolling_mean(close[row, col], i, slow_window, slow_sums[col], slow_ring[col]))
+            macd[row, col] = macd_value
+            signal[row, col] = _rolling_mean(macd_value, i, signal_window, signal_sums[col], signal_ring[col])
+    return macd, signal
+
+
+@njit(cache=True, parallel=True)
+def _bbands_update_nb(close, start, window, num_std, sums, ring):
+    n_rows, n_cols = close.shape
+    upper = np.empty((n_rows, n_cols))
+    lower = np.empty((n_rows, n_cols))
+    mid = np.empty((n_rows, n_cols))
+    for col in prange(n_cols):
+        for row in range(n_rows):
+            window_len, window_sum, window_sum_sq = _rolling_step(close[row, col], start + row, window, sums[col], ring[col])
+            if window_len < window:
+                ma = np.nan
+                mstd = np.nan
+            else:
+                ma = window_sum / window_len
+                mstd = np.sqrt(np.abs(window_sum_sq - 2 * window_sum * ma + window_len * ma ** 2) / window_len)
+            upper[row, col] = ma + num_std * mstd
+            lower[row, col] = ma - num_std * mstd
+            mid[row, col] = ma
+    return upper, lower, mid
+
+
+@njit(cache=True, parallel=True, error_model="numpy")
+def _stoch_update_nb(high, low, close, start, k_window, d_window, min_positions, min_values, min_state,
+                     max_positions, max_values, max_state, d_sums, d_ring):
+    n_rows, n_cols = close.shape
+    percent_k = np.empty((n_rows, n_cols))
+    percent_d = np.empty((n_rows, n_cols))
+    for col in prange(n_cols):
+        for row in range(n_rows):
+            i = start + row
+            roll_min = _rolling_extreme(low[row, col], i, k_window, min_positions[col], min_values[col], min_state[col], False)
+            roll_max = _rolling_extreme(high[row, col], i, k_window, max_positions[col], max_values[col], max_state[col], True)
+            k_value = 100 * (close[row, col] - roll_min) / (roll_max - roll_min)
+            percent_k[row, col] = k_value
+            percent_d[row, col] = _rolling_mean(k_value, i, d_window, d_sums[col], d_ring[col])
+    return percent_k, percent_d
+
+
+@njit(cache=True, parallel=True)
+def _atr_update_nb(high, low, close, start, window, prev_close, ewm):
+    n_rows, n_cols = close.shape
+    atr = np.empty((n_rows, n_cols))
+    for col in prange(n_cols):
+        for row in range(n_rows):
+            i = start + row
+            prev = prev_close[col] if i > 0 else np.nan
+            prev_close[col] = close[row, col]
+            true_range = max(high[row, col] - low[row, col], np.abs(high[row, col] - prev), np.abs(low[row, col] - prev))
+            atr[row, col] = _ewm_mean(true_range, i, window, ewm[col])
+    return atr
+
+
+def _rolling_state(n_cols: int, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Running sums and their ring buffer of a rolling window, per column."""
+    return np.zeros((n_cols, 4)), np.zeros((n_cols, window, 3))
+
+
+def _deque_state(n_cols: int, window: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Positions, values and head/length/last NaN of a rolling min/max deque, per column."""
+    return (
+        np.zeros((n_cols, window), dtype=np.int64),
+        np.zeros((n_cols, window)),
+        np.tile(new_deque_state(window), (n_cols, 1)),
+    )
+
+
+class StreamingIndicator(ABC):
+    """
+    Indicator whose per-column state advances with every appended bar. Subclasses declare the
+    kline fields they read and the outputs they return, and keep all state in self.state so it
+    can be checkpointed as plain arrays.
+    """
+
+    inputs: List[str] = ["close"]
+    outputs: List[str] = []
+
+    def __init__(self):
+        self.state: Dict[str, np.ndarray] = {}
+
+    def update(self, inputs: Dict[str, np.ndarray], start: int) -> Dict[str, np.ndarray]:
+        """
+        Advances the state over new bars.
+
+        Args:
+            inputs (Dict[str, np.ndarray]): New bars (time x column, float64) of the fields in self.inputs.
+            start (int): Number of bars seen before the new ones.
+
+        Returns:
+            Dict[str, np.ndarray]: Outputs of the new bars.
+        """
+        results = self._update(*[inputs[field] for field in self.inputs], start)
+        if not isinstance(results, tuple):
+            results = (results,)
+        return dict(zip(self.outputs, results))
+
+    @abstractmethod
+    def _update(self, *args):
+        """Takes the new bars of self.inputs and start, returns the outputs in the order of self.outputs."""
+
+
+class StreamingMA(StreamingIndicator):
+    outputs = ["ma"]
+
+    def __init__(self, window: int, n_cols: int):
+        super().__init__()
+        self.window = window
+        self.state["sums"], self.state["ring"] = _rolling_state(n_cols, window)
+
+    def _update(self, close, start):
+        return _ma_update_nb(close, start, self.window, self.state["sums"], self.state["ring"])
+
+
+class StreamingRSI(StreamingIndicator):
+    outputs = ["rsi"]
+
+    def __init__(self, window: int, n_cols: int):
+        super().__init__()
+        self.window = window
+        self.state["prev_close"] = np.full(n_cols, np.nan)
+        self.state["up_sums"], self.state["up_ring"] = _rolling_state(n_cols, window)
+        self.state["down_sums"], self.state["down_ring"] = _rolling_state(n_cols, window)
+
+    def _update(self, close, start):
+        state = self.state
+        return _rsi_update_nb(
+            close, start, self.window, state["prev_close"], state["up_sums"], state["up_ring"],
+            state["down_sums"], state["down_ring"]
+        )
+
+
+class StreamingMACD(StreamingIndicator):
+    outputs = ["macd", "signal"]
+
+    def __init__(self, fast_window: int, slow_window: int, signal_window: int, n_cols: int):
+        super().__init__()
+        self.windows = (fast_window, slow_window, signal_window)
+        self.state["fast_sums"], self.state["fast_ring"] = _rolling_state(n_cols, fast_window)
+        self.state["slow_sums"], self.state["slow_ring"] = _rolling_state(n_cols, slow_window)
+        self.state["signal_sums"], self.state["signal_ring"] = _rolling_state(n_cols, signal_window)
+
+    def _update(self, close, start):
+        state = self.state
+        return _macd_update_nb(
+            close, start, *self.windows, state["fast_sums"], state["fast_ring"], state["slow_sums"],
+            state["slow_ring"], state["signal_sums"], state["signal_ring"]
+        )
+
+
+class StreamingBBANDS(StreamingIndicator):
+    outputs = ["upper", "lower", "middle"]
+
+    def __init__(self, window: int, num_std: float, n_cols: int):
+        super().__init__()
+        self.window = window
+        self.num_std = num_std
+        self.state["sums"], self.state["ring"] = _rolling_state(n_cols, window)
+
+    def _update(self, close, start):
+        return _bbands_update_nb(close, start, self.window, self.num_std, self.state["sums"], self.state["ring"])
+
+
+class StreamingSTOCH(StreamingIndicator):
+    inputs = ["high", "low", "close"]
+    outputs = ["percent_k", "percent_d"]
+
+    def __init__(self, k_window: int, d_window: int, n_cols: int):
+        super().__init__()
+        self.windows = (k_window, d_window)
+        self.state["min_positions"], self.state["min_values"], self.state["min_state"] = _deque_state(n_cols, k_window)
+        self.state["max_positions"], self.state["max_values"], self.state["max_state"] = _deque_state(n_cols, k_window)
+        self.state["d_sums"], self.state["d_ring"] = _rolling_state(n_cols, d_window)
+
+    def _update(self, high, low, close, start):
+        state = self.state
+        return _stoch_update_nb(
+            high, low, close, start, *self.windows, state["min_positions"], state["min_values"], state["min_state"],
+            state["max_positions"], state["max_values"], state["max_state"], state["d_sums"], state["d_ring"]
+        )
+
+
+class StreamingATR(StreamingIndicator):
+    inputs = ["high", "low", "close"]
+    outputs = ["atr"]
+
+    def __init__(self, window: int, n_cols: int):
+        super().__init__()
+        self.window = window
+        self.state["prev_close"] = np.full(n_cols, np.nan)
+        self.state["ewm"] = np.zeros((n_cols, 3))
+
+    def _update(self, high, low, close, start):
+        return _atr_update_nb(high, low, close, start, self.window, self.state["prev_close"], self.state["ewm"])
+
+
+# Streaming indicators of every registered strategy: each builder returns the indicators and
+# the strategy outputs their results are published as
+STRATEGY_STREAMS: Dict[str, Callable[[Dict, int], List[Tuple[StreamingIndicator, Dict[str, str]]]]] = {
+    "sma_rsi": lambda params, n_cols: [
+        (StreamingMA(params["short_window"], n_cols), {"ma": "SMA_short"}),
+        (StreamingMA(params["long_window"], n_cols), {"ma": "SMA_long"}),
+        (StreamingRSI(params["rsi_window"], n_cols), {"rsi": "RSI"}),
+    ],
+    "macd": lambda params, n_cols: [
+        (StreamingMACD(params["short_window"], params["long_window"], params["signal_window"], n_cols),
+         {"macd": "MACD", "signal": "MACD_signal"}),
+    ],
+    "bollinger_bands": lambda params, n_cols: [
+        (StreamingBBANDS(params["window"], params["num_std"], n_cols),
+         {"upper": "BB_upper", "lower": "BB_lower", "middle": "BB_mid"}),
+    ],
+    "stochastic": lambda params, n_cols: [
+        (StreamingSTOCH(params["k_window"], params["d_window"], n_cols), {"percent_k": "%K", "percent_d": "%D"}),
+    ],
+    "atr_breakout": lambda params, n_cols: [
+        (StreamingATR(params["atr_window"], n_cols), {"atr": "ATR"}),
+    ],
+}
+
+
+class StrategyStream:
+    """
+    Streaming indicators of a strategy over a time x symbol block. update() takes the bars that
+    follow the ones seen so far and returns their indicator frames; the state can be saved to and
+    restored from an .npz file.
+    """
+
+    def __init__(self, strategy_name: str, strategy_params: Dict, columns: pd.Index):
+        params = registry.resolve_params(strategy_name, strategy_params)
+        self.strategy_name = strategy_name
+        self.indicator_params = {
+            param_name: params[param_name] for param_name in registry.get_strategy(strategy_name)["indicator_params"]
+        }
+        self.columns = columns
+        self.indicators = STRATEGY_STREAMS[strategy_name](params, len(columns))
+        self.n_bars = 0
+        self.last_timestamp: Optional[pd.Timestamp] = None
+
+    def update(self, data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """
+        Advances the indicators over new bars.
+
+        Args:
+            data (Dict[str, pd.DataFrame]): Time x symbol frames of the new bars, holding the strategy's required fields.
+
+        Returns:
+            Dict[str, pd.DataFrame]: Indicator frames of the new bars.
+        """
+        index = data["close"].index
+        if self.last_timestamp is not None and len(index) and index[0] <= self.last_timestamp:
+            raise ValueError(f"Bars from {index[0]} do not follow the last streamed bar {self.last_timestamp}")
+
+        arrays = {field: np.asarray(frame.to_numpy(), dtype=np.float64) for field, frame in data.items()}
+        frames = {}
+        for indicator, names in self.indicators:
+            for output, values in indicator.update(arrays, self.n_bars).items():
+                frames[names[output]] = pd.DataFrame(values, index=index, columns=self.columns)
+
+        if len(index):
+            self.n_bars += len(index)
+            self.last_timestamp = index[-1]
+        return frames
+
+    def save(self, file_path: str, meta: Optional[Dict] = None) -> None:
+        """Writes the indicator state and stream position (plus extra metadata) to an .npz file."""
+        arrays = {
+            f"{position}.{name}": values
+            for position, (indicator, _) in enumerate(self.indicators)
+            for name, values in indicator.state.items()
+        }
+        header = {
+            **(meta or {}),
+            "strategy": self.strategy_name,
+            "indicator_params": self.indicator_params,
+            "columns": self.columns.tolist(),
+            "n_bars": self.n_bars,
+            "last_timestamp": None if self.last_timestamp is None else self.last_timestamp.value,
+        }
+        tmp_path = f"{file_path}.tmp.npz"
+        np.savez(tmp_path, header=np.array(json.dumps(header)), **arrays)
+        os.replace(tmp_path, file_path)
+
+    @classmethod
+    def load(cls, file_path: str, strategy_params: Dict) -> Tuple["StrategyStream", Dict]:
+        """
+        Restores a stream saved by save().
+
+        Returns:
+            Tuple[StrategyStream, Dict]: The stream and the saved metadata.
+        """
+        with np.load(file_path, allow_pickle=False) as arrays:
+            header = json.loads(str(arrays["header"]))
+            stream = cls(header["strategy"], strategy_params, pd.Index(header["columns"]))
+            if stream.indicator_params != header["indicator_params"]:
+                raise ValueError(f"Stream state {file_path} belongs to other indicator parameters")
+            for position, (indicator, _) in enumerate(stream.indicators):
+                for name in indicator.state:
+                    indicator.state[name] = arrays[f"{position}.{name}"].copy()
+
+        stream.n_bars = header["n_bars"]
+        if header["last_timestamp"] is not None:
+            stream.last_timestamp = pd.Timestamp(header["last_timestamp"])
+        return stream, header
+
+
+def _read_chunks(key: str, columns: pd.Index) -> Tuple[Dict[str, pd.DataFrame], int]:
+    """Reads the output chunks of a stream checkpoint into frames labeled like the data."""
+    chunks = [read_frames(file_path) for file_path in path_utils.get_stream_chunk_paths(key)]
+    if not chunks:
+        return {}, 0
+    frames = {name: pd.concat([chunk[name] for chunk in chunks]) for name in chunks[0]}
+    for frame in frames.values():
+        frame.columns = columns
+    return frames, len(chunks)
+
+
+def _write_checkpoint(key: str, stream: StrategyStream, new_frames: Dict[str, pd.DataFrame],
+                      frames: Dict[str, pd.DataFrame], n_chunks: int, fingerprint: str) -> None:
+    """Appends the new outputs as a chunk (or rewrites all outputs as one) and saves the state."""
+    if n_chunks == 0 or n_chunks >= STREAM_MAX_CHUNKS:
+        for file_path in path_utils.get_stream_chunk_paths(key):
+            os.remove(file_path)
+        write_frames(path_utils.create_stream_chunk_path(key, 0), frames)
+    elif len(next(iter(new_frames.values())).index):
+        write_frames(path_utils.create_stream_chunk_path(key, n_chunks), new_frames)
+    stream.save(path_utils.create_stream_state_path(key), {"fingerprint": fingerprint})
+
+
+def _load_checkpoint(key: str, strategy_params: Dict, index: pd.DatetimeIndex, columns: pd.Index,
+                     prefix_fingerprint: Callable[[pd.Timestamp], str]):
+    """Returns the saved stream, its outputs and chunk count if they still describe a prefix of the data, else None."""
+    state_path = path_utils.get_stream_state_path(key)
+    if not os.path.exists(state_path):
+        return None
+    try:
+        stream, header = StrategyStream.load(state_path, strategy_params)
+        frames, n_chunks = _read_chunks(key, columns)
+    except Exception as e:
+        logger.warning(f"Unreadable stream checkpoint {key}: {e}")
+        return None
+
+    stored_index = next(iter(frames.values())).index if frames else pd.DatetimeIndex([])
+    n_shared = min(stream.n_bars, len(index))
+    if (
+            len(stored_index) != stream.n_bars
+            or stream.columns.tolist() != columns.tolist()
+            or n_shared == 0
+            or stored_index[n_shared - 1] != index[n_shared - 1]
+            or stored_index[0] != index[0]
+            or header.get("fingerprint") != prefix_fingerprint(stream.last_timestamp)
+    ):
+        return None
+
+    stream.columns = columns
+    return stream, frames, n_chunks
+
+
+def run_strategy_incremental(
+        strategy_name: str,
+        data: Dict[str, pd.DataFrame],
+        strategy_params: Dict,
+        series_key: str,
+        prefix_fingerprint: Callable[[pd.Timestamp], str]
+) -> Dict[str, pd.DataFrame]:
+    """
+    Runs a strategy with indicators streamed from a checkpoint of the same series. Bars up to
+    the checkpoint reuse its stored outputs, only the bars after it are streamed, and the
+    checkpoint is advanced; the signal stage runs on the whole range. Without a valid checkpoint
+    the whole range is streamed once and checkpointed.
+
+    Args:
+        strategy_name (str): Registered strategy name.
+        data (Dict[str, pd.DataFrame]): Time x symbol frames holding at least the required fields.
+        strategy_params (Dict): Strategy parameters, resolved against the schema.
+        series_key (str): Key of the series the data belongs to (see get_series_key).
+        prefix_fingerprint (Callable[[pd.Timestamp], str]): Fingerprint of the stored data up to a
+            timestamp (see get_prefix_fingerprint); a checkpoint is used only if it still matches.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Input frames plus the declared outputs, including 'buy_signal' and 'sell_signal'.
+    """
+    strategy = registry.get_strategy(strategy_name)
+    missing = [field for field in strategy["fields"] if field not in data]
+    if missing:
+        raise ValueError(f"Strategy {strategy_name} requires fields: {', '.join(missing)}")
+
+    params = registry.resolve_params(strategy_name, strategy_params)
+    key = make_indicator_key(
+        series_key, strategy_name, {param_name: params[param_name] for param_name in strategy["indicator_params"]}
+    )
+    index, columns = data["close"].index, data["close"].columns
+    fields = {field: data[field] for field in strategy["fields"]}
+
+    with _lock:
+        checkpoint = _load_checkpoint(key, params, index, columns, prefix_fingerprint)
+        if checkpoint is None:
+            stream, frames, n_chunks = StrategyStream(strategy_name, params, columns), {}, 0
+        else:
+            stream, frames, n_chunks = checkpoint
+
+        if stream.n_bars >= len(index):
+            indicators = {name: frame.iloc[:len(index)] for name, frame in frames.items()}
+            logger.debug(f"Stream {key[:12]}: {len(index)} bars from checkpoint")
+        else:
+            new_frames = stream.update({field: frame.iloc[stream.n_bars:] for field, frame in fields.items()})
+            indicators = {name: pd.concat([frames[name], frame]) if frames else frame for name, frame in new_frames.items()}
+            _write_checkpoint(key, stream, new_frames, indicators, n_chunks, prefix_fingerprint(stream.last_timestamp))
+            logger.debug(f"Stream {key[:12]}: {len(next(iter(new_frames.values())))} new bars streamed, {len(index)} total")
+
+    data.update(indicators)
+    return strategy["signals"](data, params)
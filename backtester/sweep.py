@@ -0,0 +1,283 @@
+import gc
+from itertools import product
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+
+from backtester.strategies import registry
+from logger.config import logger
+from settings import SWEEP_CHUNK_CELLS
+
+
+def _returns_acc(portfolio: vbt.Portfolio) -> vbt.returns.accessors.ReturnsAccessor:
+    """
+    Returns accessor of a portfolio without the benchmark returns Portfolio.returns_acc computes
+    for every column; the ratios below do not read them and come out identical.
+    """
+    return portfolio.returns().vbt.returns(freq=portfolio.wrapper.freq)
+
+
+# Metrics available for ranking sweep results, computed for all combinations at once
+SWEEP_METRICS: Dict[str, Callable[[vbt.Portfolio], pd.Series]] = {
+    "total_return": lambda portfolio: portfolio.total_return(),
+    "sharpe_ratio": lambda portfolio: _returns_acc(portfolio).sharpe_ratio(),
+    "sortino_ratio": lambda portfolio: _returns_acc(portfolio).sortino_ratio(),
+    "max_drawdown": lambda portfolio: _returns_acc(portfolio).max_drawdown(),
+    "win_rate": lambda portfolio: portfolio.trades.win_rate(),
+    "total_trades": lambda portfolio: portfolio.trades.count(),
+}
+
+DEFAULT_SWEEP_METRICS: List[str] = ["total_return", "sharpe_ratio", "max_drawdown", "total_trades"]
+
+ParamRange = Union[List, Dict]
+
+
+def expand_param_range(param_range: ParamRange) -> List:
+    """
+    Expands a parameter range into its values.
+
+    Args:
+        param_range (ParamRange): Explicit list of values, or a dict with 'start', 'stop' (inclusive)
+            and an optional 'step' (default 1), e.g. {'start': 5, 'stop': 50, 'step': 5}.
+
+    Returns:
+        List: Parameter values in order, without repeats: results are labeled by parameter values,
+        so a repeated value would merge with its first occurrence.
+    """
+    if isinstance(param_range, dict):
+        start, stop, step = param_range["start"], param_range["stop"], param_range.get("step", 1)
+        if step <= 0:
+            raise ValueError(f"Range step must be positive, got {step}")
+        return np.round(np.arange(start, stop + step / 2, step), 10).tolist()
+    return list(dict.fromkeys(param_range))
+
+
+def keep_param_order(strategy_name: str, combinations: List[Dict]) -> List[Dict]:
+    """Drops combinations breaking the strategy's parameter order; an error if none is left."""
+    kept = [params for params in combinations if registry.is_param_order_kept(strategy_name, params)]
+    if not kept:
+        pairs = ", ".join(f"{lower} < {higher}" for lower, higher in registry.get_strategy(strategy_name)["ordered_params"])
+        raise ValueError(f"No parameter combination of {strategy_name} keeps {pairs}")
+    if len(kept) < len(combinations):
+        logger.info(f"Skipping {len(combinations) - len(kept)} combinations of {strategy_name} breaking its parameter order")
+    return kept
+
+
+def build_param_combinations(strategy_name: str, param_ranges: Dict[str, ParamRange]) -> List[Dict]:
+    """
+    Builds the cartesian product of the swept parameter values, each combination resolved
+    against the strategy's parameter schema (parameters that are not swept keep their defaults).
+    Combinations breaking the strategy's parameter order (e.g., a short window not below the
+    long one) are skipped.
+
+    Args:
+        strategy_name (str): Registered strategy name.
+        param_ranges (Dict[str, ParamRange]): Swept parameters and their ranges.
+
+    Returns:
+        List[Dict]: Complete parameters of every combination.
+    """
+    if not param_ranges:
+        raise ValueError("At least one parameter range is required for a sweep")
+
+    param_names = list(param_ranges)
+    values = [expand_param_range(param_ranges[param_name]) for param_name in param_names]
+
+    combinations = [
+        registry.resolve_params(strategy_name, dict(zip(param_names, combination)))
+        for combination in product(*values)
+    ]
+    return keep_param_order(strategy_name, combinations)
+
+
+def _sweep_chunk(
+        strategy_name: str,
+        data: Dict[str, pd.DataFrame],
+        combinations: List[Dict],
+        swept_params: List[str],
+        portfolio_params: Dict,
+        freq: str,
+        metrics: List[str]
+) -> pd.DataFrame:
+    """Evaluates a batch of parameter combinations in one broadcasted indicator and portfolio pass."""
+    strategy = registry.get_strategy(strategy_name)
+    indicator_params = strategy["indicator_params"]
+    symbols = data["close"].columns
+    n_symbols = len(symbols)
+
+    # Indicators are computed once per distinct set of indicator parameters
+    indicator_keys = [tuple(params[param_name] for param_name in indicator_params) for params in combinations]
+    unique_keys = list(dict.fromkeys(indicator_keys))
+    key_positions = {key: i for i, key in enumerate(unique_keys)}
+    indicators = strategy["indicators"](
+        data, {param_name: [key[i] for key in unique_keys] for i, param_name in enumerate(indicator_params)}
+    )
+
+    # Indicator outputs are param-major blocks of symbols; every combination takes its block
+    take = np.concatenate([
+        key_positions[key] * n_symbols + np.arange(n_symbols) for key in indicator_keys
+    ])
+    columns = pd.MultiIndex.from_tuples(
+        [tuple(params[param_name] for param_name in swept_params) + (symbol,)
+         for params in combinations for symbol in symbols],
+        names=swept_params + ["symbol"]
+    )
+
+    block = {
+        field: pd.DataFrame(np.tile(data[field].to_numpy(), len(combinations)), index=data[field].index, columns=columns)
+        for field in registry.get_data_keys(strategy_name)
+    }
+    for name, frame in indicators.items():
+        block[name] = pd.DataFrame(frame.to_numpy()[:, take], index=frame.index, columns=columns)
+
+    # Thresholds become one value per column
+    signal_params = {
+        param_name: np.repeat([params[param_name] for params in combinations], n_symbols)
+        for param_name in strategy["params"] if param_name not in indicator_params
+    }
+    block = strategy["signals"](block, signal_params)
+
+    portfolio = vbt.Portfolio.from_signals(
+        close=block["close"],
+        entries=block["buy_signal"],
+        exits=block["sell_signal"],
+        freq=freq,
+        **portfolio_params
+    )
+
+    results = pd.DataFrame({metric: SWEEP_METRICS[metric](portfolio) for metric in metrics})
+    if n_symbols == 1:
+        results.index = results.index.droplevel("symbol")
+    return results
+
+
+def run_parameter_sweep(
+        data: Dict[str, pd.DataFrame],
+        strategy_name: str,
+        param_ranges: Dict[str, ParamRange],
+        portfolio_params: Dict,
+        freq: str,
+        metrics: Optional[List[str]] = None,
+        sort_by: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Backtests every combination of the given parameter ranges and ranks them.
+    Combinations are evaluated in chunks of at most SWEEP_CHUNK_CELLS time x column cells,
+    each chunk in a single broadcasted pass through the strategy and vbt.Portfolio.from_signals.
+    As in multi-asset backtests, every symbol is traded with its own cash, so with several
+    symbols there is one row per combination and symbol.
+
+    Args:
+        data (Dict[str, pd.DataFrame]): Time x symbol frames holding the strategy's required fields.
+        strategy_name (str): Registered strategy name.
+        param_ranges (Dict[str, ParamRange]): Swept parameters and their ranges (see expand_param_range).
+        portfolio_params (Dict): Portfolio parameters shared by all combinations.
+        freq (str): Interval of klines (e.g., '1h').
+        metrics (Optional[List[str]]): Metrics from SWEEP_METRICS; DEFAULT_SWEEP_METRICS if None.
+        sort_by (Optional[str]): Metric to rank by (descending); the first metric if None.
+
+    Returns:
+        pd.DataFrame: Metrics indexed by the swept parameter values (and symbol, for several symbols),
+        best combination first.
+    """
+    metrics = metrics or DEFAULT_SWEEP_METRICS
+    unknown = [metric for metric in metrics if metric not in SWEEP_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(unknown)}. Available metrics are: {', '.join(SWEEP_METRICS)}.")
+    sort_by = sort_by or metrics[0]
+    if sort_by not in metrics:
+        raise ValueError(f"Sort metric {sort_by} must be one of the requested metrics")
+
+    combinations = build_param_combinations(strategy_name, param_ranges)
+    ranking = evaluate_combinations(data, strategy_name, combinations, list(param_ranges), portfolio_params, freq, metrics)
+    return ranking.sort_values(sort_by, ascending=False, kind="stable", na_position="last")
+
+
+def evaluate_combinations(
+        data: Dict[str, pd.DataFrame],
+        strategy_name: str,
+        combinations: List[Dict],
+        swept_params: List[str],
+        portfolio_params: Dict,
+        freq: str,
+        metrics: List[str]
+) -> pd.DataFrame:
+    """
+    Backtests resolved parameter combinations in chunks of at most SWEEP_CHUNK_CELLS cells.
+
+    Args:
+        data (Dict[str, pd.DataFrame]): Time x symbol frames holding the strategy's required fields.
+        strategy_name (str): Registered strategy name.
+        combinations (List[Dict]): Complete parameters of every combination (see build_param_combinations).
+        swept_params (List[str]): Parameters that label the results.
+        portfolio_params (Dict): Portfolio parameters shared by all combinations.
+        freq (str): Interval of klines (e.g., '1h').
+        metrics (List[str]): Metrics from SWEEP_METRICS.
+
+    Returns:
+        pd.DataFrame: Metrics indexed by the swept parameter values (and symbol, for several symbols),
+        in the order of the combinations.
+    """
+    n_rows, n_symbols = data["close"].shape
+    chunk_size = max(1, SWEEP_CHUNK_CELLS // max(n_rows * n_symbols, 1))
+    logger.info(f"Sweeping {len(combinations)} combinations of {strategy_name} in chunks of {chunk_size}")
+
+    results = []
+    for start in range(0, len(combinations), chunk_size):
+        results.append(_sweep_chunk(
+            strategy_name, data, combinations[start:start + chunk_size], swept_params, portfolio_params, freq, metrics
+        ))
+        # vbt objects hold reference cycles; without a collection, the arrays of several chunks pile up
+        gc.collect()
+
+    # Ratios of flat equity curves (no trades) are infinite, they rank last instead of first
+    return pd.concat(results).replace([np.inf, -np.inf], np.nan)
+
+
+def evaluate_signals(
+        runs: List[Dict[str, pd.DataFrame]],
+        portfolio_params: Dict,
+        freq: str,
+        metrics: List[str]
+) -> pd.DataFrame:
+    """
+    Backtests the signals of several strategy runs on the same symbols side by side, in chunks
+    of at most SWEEP_CHUNK_CELLS cells, each chunk in one vbt.Portfolio.from_signals pass.
+
+    Args:
+        runs (List[Dict[str, pd.DataFrame]]): Outputs of strategy runs with 'close', 'buy_signal' and 'sell_signal'.
+        portfolio_params (Dict): Portfolio parameters shared by all runs.
+        freq (str): Interval of klines (e.g., '1h').
+        metrics (List[str]): Metrics from SWEEP_METRICS.
+
+    Returns:
+        pd.DataFrame: Metrics indexed by the run's position (and symbol, for several symbols).
+    """
+    close = runs[0]["close"]
+    n_rows, n_symbols = close.shape
+    chunk_size = max(1, SWEEP_CHUNK_CELLS // max(n_rows * n_symbols, 1))
+
+    results = []
+    for start in range(0, len(runs), chunk_size):
+        chunk = runs[start:start + chunk_size]
+        columns = pd.MultiIndex.from_product([range(start, start + len(chunk)), close.columns], names=["run", "symbol"])
+        block = {
+            field: pd.DataFrame(np.hstack([run[field].to_numpy() for run in chunk]), index=close.index, columns=columns)
+            for field in ["close", "buy_signal", "sell_signal"]
+        }
+        portfolio = vbt.Portfolio.from_signals(
+            close=block["close"],
+            entries=block["buy_signal"],
+            exits=block["sell_signal"],
+            freq=freq,
+            **portfolio_params
+        )
+        results.append(pd.DataFrame({metric: SWEEP_METRICS[metric](portfolio) for metric in metrics}))
+        gc.collect()
+
+    results = pd.concat(results).replace([np.inf, -np.inf], np.nan)
+    if n_symbols == 1:
+        results.index = results.index.droplevel("symbol")
+    return results
@@ -0,0 +1,235 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from backtester.portfolio import create_multi_asset_portfolio
+from backtester.strategies import registry
+from backtester.sweep import SWEEP_METRICS, ParamRange, run_parameter_sweep
+from logger.config import logger
+from settings import WALK_FORWARD_WORKERS
+
+WALK_FORWARD_MODES: List[str] = ["rolling", "anchored"]
+
+# Out-of-sample metrics reported for every fold and symbol
+FOLD_METRICS: List[str] = ["total_return", "sharpe_ratio", "max_drawdown", "total_trades"]
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """
+    Returns the process pool shared by all walk-forward runs, creating it on first use. Workers are
+    spawned: the pool starts from a worker thread of a process running numba and asyncio threads,
+    which a fork would copy in an inconsistent state.
+    """
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=WALK_FORWARD_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def shutdown() -> None:
+    """Stops the walk-forward process pool."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown()
+        _process_pool = None
+
+
+def split_folds(
+        index: pd.DatetimeIndex,
+        train_period: Union[str, pd.Timedelta],
+        test_period: Union[str, pd.Timedelta],
+        mode: str = "rolling"
+) -> List[Dict]:
+    """
+    Splits a time axis into consecutive train/test folds. Test windows tile the range after
+    the first train window; a rolling train window has a fixed length and ends where its test
+    window starts, an anchored one always starts at the beginning of the range.
+
+    Args:
+        index (pd.DatetimeIndex): Sorted time axis of the loaded klines.
+        train_period (Union[str, pd.Timedelta]): Train window length (e.g., '180D').
+        test_period (Union[str, pd.Timedelta]): Test window length (e.g., '30D').
+        mode (str): One of WALK_FORWARD_MODES.
+
+    Returns:
+        List[Dict]: Folds with 'fold', 'train_start', 'test_start' and 'test_end' (exclusive) timestamps.
+    """
+    if mode not in WALK_FORWARD_MODES:
+        raise ValueError(f"Invalid walk-forward mode {mode}. Available modes are: {', '.join(WALK_FORWARD_MODES)}.")
+
+    train_period, test_period = pd.Timedelta(train_period), pd.Timedelta(test_period)
+    if train_period <= pd.Timedelta(0) or test_period <= pd.Timedelta(0):
+        raise ValueError("Train and test periods must be positive")
+
+    # The range ends one bar after the last kline
+    bar = index[-1] - index[-2] if len(index) > 1 else pd.Timedelta(1, unit="ns")
+    range_start, range_end = index[0], index[-1] + bar
+
+    folds = []
+    test_start = range_start + train_period
+    while test_start < range_end:
+        test_end = min(test_start + test_period, range_end)
+        if index.searchsorted(test_end) > index.searchsorted(test_start):
+            folds.append({
+                "fold": len(folds),
+                "train_start": range_start if mode == "anchored" else test_start - train_period,
+                "test_start": test_start,
+                "test_end": test_end,
+            })
+        test_start = test_end
+
+    if not folds:
+        raise ValueError(f"The range {index[0]} - {index[-1]} is too short for a {train_period} train window")
+    return folds
+
+
+def _slice_rows(data: Dict[str, pd.DataFrame], start: pd.Timestamp, end: pd.Timestamp) -> Dict[str, pd.DataFrame]:
+    """Cuts the [start, end) rows out of time x symbol frames, each on its own time axis (higher timeframes)."""
+    return {
+        field: matrix.iloc[matrix.index.searchsorted(start):matrix.index.searchsorted(end)]
+        for field, matrix in data.items()
+    }
+
+
+def _select_best_params(ranking: pd.DataFrame, swept_params: List[str], metric: str) -> Tuple[Dict, float]:
+    """Picks the combination with the best metric, averaged over symbols when several are traded."""
+    scores = ranking[metric]
+    if "symbol" in ranking.index.names:
+        scores = scores.groupby(level=swept_params, sort=False).mean()
+    scores = scores.dropna()
+    if scores.empty:
+        raise ValueError(f"No parameter combination produced a {metric} on the train window")
+
+    best = scores.idxmax()
+    values = best if isinstance(best, tuple) else (best,)
+    return dict(zip(swept_params, values)), float(scores[best])
+
+
+def run_fold(
+        data: Dict[str, pd.DataFrame],
+        fold: Dict,
+        strategy_name: str,
+        param_ranges: Dict[str, ParamRange],
+        portfolio_params: Dict,
+        freq: str,
+        metric: str
+) -> Dict:
+    """
+    Optimizes parameters on a fold's train window and backtests them on its test window.
+    Indicators of the test backtest are computed from the start of the train window, so
+    they are warmed up when the test window begins.
+
+    Args:
+        data (Dict[str, pd.DataFrame]): Time x symbol frames covering the fold (train start to test end).
+        fold (Dict): Fold from split_folds.
+        strategy_name (str): Registered strategy name.
+        param_ranges (Dict[str, ParamRange]): Swept parameters and their ranges.
+        portfolio_params (Dict): Portfolio parameters.
+        freq (str): Interval of klines (e.g., '1h').
+        metric (str): Metric from SWEEP_METRICS that is maximized on the train window.
+
+    Returns:
+        Dict: Fold with its best parameters, train score, out-of-sample 'returns' (time x symbol)
+        and out-of-sample 'stats' (metric x symbol).
+    """
+    train = _slice_rows(data, fold["train_start"], fold["test_start"])
+    ranking = run_parameter_sweep(train, strategy_name, param_ranges, portfolio_params, freq, metrics=[metric])
+    best_params, train_score = _select_best_params(ranking, list(param_ranges), metric)
+
+    signals = registry.run_strategy(strategy_name, dict(data), best_params)
+    test = _slice_rows(
+        {field: signals[field] for field in ["close", "buy_signal", "sell_signal"]}, fold["test_start"], fold["test_end"]
+    )
+    portfolio = create_multi_asset_portfolio(test, portfolio_params, freq=freq)
+
+    # A single-symbol portfolio returns scalar metrics and a returns series
+    symbols = test["close"].columns
+    returns = portfolio.returns()
+    if isinstance(returns, pd.Series):
+        returns = returns.to_frame(symbols[0])
+    stats = {}
+    for name in FOLD_METRICS:
+        value = SWEEP_METRICS[name](portfolio)
+        stats[name] = value if isinstance(value, pd.Series) else pd.Series([value], index=symbols)
+
+    return {
+        **fold,
+        "params": best_params,
+        "train_score": train_score,
+        "returns": returns,
+        "stats": pd.DataFrame(stats).T,
+    }
+
+
+def run_walk_forward(
+        data: Dict[str, pd.DataFrame],
+        strategy_name: str,
+        param_ranges: Dict[str, ParamRange],
+        portfolio_params: Dict,
+        freq: str,
+        train_period: Union[str, pd.Timedelta],
+        test_period: Union[str, pd.Timedelta],
+        mode: str = "rolling",
+        metric: str = "sharpe_ratio"
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Walk-forward optimization: every fold is optimized on its train window and evaluated on the
+    following test window. Folds run in parallel on the walk-forward process pool, each getting
+    only its slice of the data loaded once by the caller.
+
+    Args:
+        data (Dict[str, pd.DataFrame]): Time x symbol frames holding the strategy's required fields.
+        strategy_name (str): Registered strategy name.
+        param_ranges (Dict[str, ParamRange]): Swept parameters and their ranges (see expand_param_range).
+        portfolio_params (Dict): Portfolio parameters.
+        freq (str): Interval of klines (e.g., '1h').
+        train_period (Union[str, pd.Timedelta]): Train window length (e.g., '180D').
+        test_period (Union[str, pd.Timedelta]): Test window length (e.g., '30D').
+        mode (str): 'rolling' or 'anchored' train windows.
+        metric (str): Metric from SWEEP_METRICS that is maximized on train windows.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Per-fold stats (one row per fold and symbol) and the
+        stitched out-of-sample equity (time x symbol), compounding the test windows' returns.
+    """
+    if metric not in SWEEP_METRICS:
+        raise ValueError(f"Unknown metric {metric}. Available metrics are: {', '.join(SWEEP_METRICS)}.")
+    registry.get_strategy(strategy_name)
+
+    folds = split_folds(data["close"].index, train_period, test_period, mode)
+    fold_data = [_slice_rows(data, fold["train_start"], fold["test_end"]) for fold in folds]
+    args = (strategy_name, param_ranges, portfolio_params, freq, metric)
+    logger.info(f"Walk-forward of {strategy_name}: {len(folds)} {mode} folds on {WALK_FORWARD_WORKERS} workers")
+
+    if WALK_FORWARD_WORKERS > 1 and len(folds) > 1:
+        futures = [_get_process_pool().submit(run_fold, fold_slice, fold, *args) for fold_slice, fold in zip(fold_data, folds)]
+        results = [future.result() for future in futures]
+    else:
+        results = [run_fold(fold_slice, fold, *args) for fold_slice, fold in zip(fold_data, folds)]
+
+    rows = []
+    for result in results:
+        for symbol, symbol_stats in result["stats"].items():
+            rows.append({
+                "fold": result["fold"],
+                "symbol": symbol,
+                "train_start": result["train_start"],
+                "test_start": result["test_start"],
+                "test_end": result["test_end"],
+                **result["params"],
+                f"train_{metric}": result["train_score"],
+                **{f"test_{name}": value for name, value in symbol_stats.items()},
+            })
+    fold_stats = pd.DataFrame(rows)
+
+    init_cash = portfolio_params.get("init_cash", 100.0)
+    returns = pd.concat([result["returns"] for result in results])
+    equity = init_cash * (1 + returns).cumprod()
+
+    return fold_stats, equity
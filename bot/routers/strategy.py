@@ -1,6 +1,7 @@
 from aiogram import Router
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
+from backtester.strategies import registry
 from bot.utils.keyboards import kb_param_choice
 from bot.utils.message_answer_formatter import html_format_strategy_params, html_format_portfolio_params
 from bot.utils.states import SingleBacktestState, MultiBacktestState
@@ -23,10 +24,17 @@ async def handle_single_strategy_selection(message: Message, state: FSMContext):
     """Handles strategy selection for single-asset backtest."""
     selected_strategy = message.text
 
-    if selected_strategy not in STRATEGIES_CONFIG or "single-asset" not in STRATEGIES_CONFIG[selected_strategy]["asset_type"]:
+    if (selected_strategy not in STRATEGIES_CONFIG or selected_strategy not in registry.STRATEGY_REGISTRY
+            or "single-asset" not in STRATEGIES_CONFIG[selected_strategy]["asset_type"]):
         await message.answer("Invalid strategy selection. Please choose a valid strategy.")
         return
 
+    data = await state.get_data()
+    interval_error = registry.get_interval_error(selected_strategy, data["selected_interval"])
+    if interval_error:
+        await message.answer(f"{interval_error}. Please choose another strategy.")
+        return
+
     await state.update_data(selected_strategy=selected_strategy)
 
     formatted_params = html_format_strategy_params(selected_strategy)
@@ -48,10 +56,17 @@ async def handle_multi_strategy_selection(message: Message, state: FSMContext):
     """Handles strategy selection for multi-asset backtest."""
     selected_strategy = message.text
 
-    if selected_strategy not in STRATEGIES_CONFIG or "multi-asset" not in STRATEGIES_CONFIG[selected_strategy]["asset_type"]:
+    if (selected_strategy not in STRATEGIES_CONFIG or selected_strategy not in registry.STRATEGY_REGISTRY
+            or "multi-asset" not in STRATEGIES_CONFIG[selected_strategy]["asset_type"]):
         await message.answer("Invalid strategy selection. Please choose a valid strategy.")
         return
 
+    data = await state.get_data()
+    interval_error = registry.get_interval_error(selected_strategy, data["selected_interval"])
+    if interval_error:
+        await message.answer(f"{interval_error}. Please choose another strategy.")
+        return
+
     await state.update_data(selected_strategy=selected_strategy)
 
     formatted_params = html_format_strategy_params(selected_strategy)
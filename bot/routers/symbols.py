@@ -5,10 +5,16 @@ from aiogram.fsm.context import FSMContext
 from bot.utils.states import SingleBacktestState, MultiBacktestState
 from bot.utils.keyboards import kb_intervals, kb_dates, kb_strategies
 from settings import SYMBOLS_CONFIG
-from utils.validators import validate_date_range
+from utils import catalog
+from utils.validators import validate_date_range_in_ranges
 
 symbols_router = Router()
 
+
+def format_ranges(ranges) -> str:
+    """Formats available date ranges, one per line."""
+    return "\n".join(f"{start} - {end}" for start, end in ranges)
+
 # TODO: DRY, remove duplicated code fragments
 
 @symbols_router.message(SingleBacktestState.choosing_symbol)
@@ -77,18 +83,18 @@ async def handle_single_interval_selection(message: Message, state: FSMContext):
     await state.update_data(selected_interval=selected_interval)
     await message.answer(f"Selected interval: {selected_interval}\n\nNow proceed with dates.")
 
-    symbol_data = SYMBOLS_CONFIG.get(selected_symbol, {}).get(selected_interval)
+    available_ranges = catalog.get_available_ranges(selected_symbol, selected_interval)
 
-    if symbol_data is None:
+    if not available_ranges:
         await message.answer("No data found for the selected symbol and interval. Please /start again.")
         return
 
-    available_start = symbol_data["start_date"]
-    available_end = symbol_data["end_date"]
+    available_start, available_end = available_ranges[-1]
 
-    await state.update_data(available_start=available_start, available_end=available_end)
+    await state.update_data(available_ranges=available_ranges)
 
-    await message.answer(f"Available range for {selected_symbol} ({selected_interval}):\n"
+    await message.answer(f"Available ranges for {selected_symbol} ({selected_interval}):\n"
+                         f"{format_ranges(available_ranges)}\n"
                          f"Default range: {available_start} - {available_end}\n\n"
                          "Please choose an option:", reply_markup=kb_dates)
 
@@ -101,19 +107,20 @@ async def handle_single_date_choice(message: Message, state: FSMContext):
     user_input = message.text.strip().lower()
     data = await state.get_data()
 
-    available_start = data["available_start"]
-    available_end = data["available_end"]
+    available_ranges = data["available_ranges"]
+    available_start, available_end = available_ranges[-1]
 
     if user_input == "default":
         await state.update_data(start_date=available_start, end_date=available_end)
         await message.answer(
             f"Selected range: {available_start} - {available_end}\n\nNow proceed with strategy.",
-            reply_markup=kb_strategies(is_multi=False)
+            reply_markup=kb_strategies(is_multi=False, interval=data["selected_interval"])
         )
         await state.set_state(SingleBacktestState.choosing_strategy)
     elif user_input == "custom":
         await message.answer(
-            f"Please input your custom date range in the format 'Y-m-d - Y-m-d' within the available range: {available_start} - {available_end}.")
+            f"Please input your custom date range in the format 'Y-m-d - Y-m-d' within one of the available ranges:\n"
+            f"{format_ranges(available_ranges)}")
         await state.set_state(SingleBacktestState.waiting_for_custom_range)
     else:
         await message.answer("Invalid option. Please choose either 'Default' or 'Custom'.")
@@ -127,8 +134,7 @@ async def handle_single_custom_date_input(message: Message, state: FSMContext):
 
     data = await state.get_data()
 
-    available_start = data["available_start"]
-    available_end = data["available_end"]
+    available_ranges = data["available_ranges"]
 
     if " - " not in user_input:
         await message.answer("Invalid format. Please enter the date range as 'Y-m-d - Y-m-d'.")
@@ -136,16 +142,17 @@ async def handle_single_custom_date_input(message: Message, state: FSMContext):
 
     try:
         selected_start, selected_end = map(str.strip, user_input.split(" - "))
-        selected_start, selected_end = validate_date_range(selected_start, selected_end, available_start, available_end)
+        selected_start, selected_end = validate_date_range_in_ranges(selected_start, selected_end, available_ranges)
     except ValueError:
         await message.answer(
-            f"Invalid date range. Please ensure the date is in format 'Y-m-d - Y-m-d' and  within the available range: {available_start} - {available_end}.")
+            f"Invalid date range. Please ensure the date is in format 'Y-m-d - Y-m-d' and within one of the available ranges:\n"
+            f"{format_ranges(available_ranges)}")
         return
 
     await state.update_data(start_date=selected_start, end_date=selected_end)
     await message.answer(
         f"Selected range: {selected_start} - {selected_end}\n\nNow proceed with strategy.",
-        reply_markup=kb_strategies(is_multi=False)
+        reply_markup=kb_strategies(is_multi=False, interval=data["selected_interval"])
     )
     await state.set_state(SingleBacktestState.choosing_strategy)
 
@@ -168,29 +175,18 @@ async def handle_multi_interval_selection(message: Message, state: FSMContext):
     await state.update_data(selected_interval=selected_interval)
     await message.answer(f"Selected interval: {selected_interval}\n\nNow proceed with dates.")
 
-    start_dates = []
-    end_dates = []
-
-    for symbol in selected_symbols:
-        symbol_data = SYMBOLS_CONFIG.get(symbol, {}).get(selected_interval)
-
-        if symbol_data is None:
-            await message.answer(f"No data found for symbol {symbol} with interval {selected_interval}.")
-            return
-
-        start_dates.append(symbol_data["start_date"])
-        end_dates.append(symbol_data["end_date"])
-
-    available_start = max(start_dates)
-    available_end = min(end_dates)
-
-    await state.update_data(available_start=available_start, available_end=available_end)
+    available_ranges = catalog.get_common_ranges(selected_symbols, selected_interval)
 
-    if available_start > available_end:
+    if not available_ranges:
         await message.answer("No common date range found for selected symbols. Try again with /start.")
         return
 
-    await message.answer(f"Available range for selected symbols ({selected_interval}):\n"
+    available_start, available_end = available_ranges[-1]
+
+    await state.update_data(available_ranges=available_ranges)
+
+    await message.answer(f"Available ranges for selected symbols ({selected_interval}):\n"
+                         f"{format_ranges(available_ranges)}\n"
                          f"Default range: {available_start} - {available_end}\n\n"
                          "Please choose an option:", reply_markup=kb_dates)
 
@@ -203,19 +199,20 @@ async def handle_multi_date_choice(message: Message, state: FSMContext):
     user_input = message.text.strip().lower()
     data = await state.get_data()
 
-    available_start = data["available_start"]
-    available_end = data["available_end"]
+    available_ranges = data["available_ranges"]
+    available_start, available_end = available_ranges[-1]
 
     if user_input == "default":
         await state.update_data(start_date=available_start, end_date=available_end)
         await message.answer(
             f"Selected range: {available_start} - {available_end}\n\nNow proceed with strategy.",
-            reply_markup=kb_strategies(is_multi=True)
+            reply_markup=kb_strategies(is_multi=True, interval=data["selected_interval"])
         )
         await state.set_state(MultiBacktestState.choosing_strategy)
     elif user_input == "custom":
         await message.answer(
-            f"Please input your custom date range in the format 'Y-m-d - Y-m-d' within the available range: {available_start} - {available_end}.")
+            f"Please input your custom date range in the format 'Y-m-d - Y-m-d' within one of the available ranges:\n"
+            f"{format_ranges(available_ranges)}")
         await state.set_state(MultiBacktestState.waiting_for_custom_range)
     else:
         await message.answer("Invalid option. Please choose either 'Default' or 'Custom'.")
@@ -228,8 +225,7 @@ async def handle_multi_custom_date_input(message: Message, state: FSMContext):
 
     data = await state.get_data()
 
-    available_start = data["available_start"]
-    available_end = data["available_end"]
+    available_ranges = data["available_ranges"]
 
     if " - " not in user_input:
         await message.answer("Invalid format. Please enter the date range as 'Y-m-d - Y-m-d'.")
@@ -237,15 +233,16 @@ async def handle_multi_custom_date_input(message: Message, state: FSMContext):
 
     try:
         selected_start, selected_end = map(str.strip, user_input.split(" - "))
-        selected_start, selected_end = validate_date_range(selected_start, selected_end, available_start, available_end)
+        selected_start, selected_end = validate_date_range_in_ranges(selected_start, selected_end, available_ranges)
     except ValueError:
         await message.answer(
-            f"Invalid date range. Please ensure the date is in format 'Y-m-d - Y-m-d' and  within the available range: {available_start} - {available_end}.")
+            f"Invalid date range. Please ensure the date is in format 'Y-m-d - Y-m-d' and within one of the available ranges:\n"
+            f"{format_ranges(available_ranges)}")
         return
 
     await state.update_data(start_date=selected_start, end_date=selected_end)
     await message.answer(
         f"Selected range: {selected_start} - {selected_end}\n\nNow proceed with strategy.",
-        reply_markup=kb_strategies(is_multi=True)
+        reply_markup=kb_strategies(is_multi=True, interval=data["selected_interval"])
     )
     await state.set_state(MultiBacktestState.choosing_strategy)
@@ -1,6 +1,7 @@
 from aiogram.types import KeyboardButton, ReplyKeyboardMarkup
 from aiogram.utils.keyboard import ReplyKeyboardBuilder
 
+from backtester.strategies import registry
 from settings import SYMBOLS, SYMBOLS_CONFIG, STRATEGIES_CONFIG
 
 kb_main = ReplyKeyboardMarkup(
@@ -55,14 +56,16 @@ kb_dates = ReplyKeyboardMarkup(
 )
 
 
-def kb_strategies(is_multi: bool) -> ReplyKeyboardMarkup:
-    """Generate a keyboard with available strategies based on single or multi-asset mode."""
+def kb_strategies(is_multi: bool, interval: str) -> ReplyKeyboardMarkup:
+    """Generate a keyboard with the strategies available in single or multi-asset mode that can run on the interval."""
     asset_type = "multi-asset" if is_multi else "single-asset"
 
     strategy_buttons = [
         KeyboardButton(text=strategy_name)
         for strategy_name, strategy_details in STRATEGIES_CONFIG.items()
         if asset_type in strategy_details["asset_type"]
+        and strategy_name in registry.STRATEGY_REGISTRY
+        and registry.get_interval_error(strategy_name, interval) is None
     ]
 
     return ReplyKeyboardMarkup(
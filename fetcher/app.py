@@ -1,10 +1,13 @@
 import asyncio
-from datetime import timedelta
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from typing import Dict, List
 
-from fetcher.data_processing import fetcher_pipeline
+from fetcher.data_processing import compactor, fetcher_pipeline, manifest
+from fetcher.data_processing.download_scheduler import download_priority, scheduler
 from logger.config import logger
-from settings import DATE_FORMAT, SYMBOLS_CONFIG
-from utils import date_utils, validators
+from settings import COMPACTION_ENABLED, DATE_FORMAT, MONTH_FORMAT, MONTHLY_ARCHIVE_MIN_DAYS, SYMBOLS_CONFIG
+from utils import date_utils, usage_utils, validators
 
 
 async def fetch_klines_batch():
@@ -13,21 +16,45 @@ async def fetch_klines_batch():
     """
 
     logger.info("Starting kline data fetching for symbols")
+    symbol_usage = usage_utils.get_symbol_usage()
     tasks = []
     for symbol, intervals in SYMBOLS_CONFIG.items():
         for interval, date_range in intervals.items():
             start_date = date_range["start_date"]
             end_date = date_range["end_date"]
-            tasks.append(fetch_klines_for_symbol(symbol, start_date, end_date, interval))
+            tasks.append(fetch_klines_for_symbol(symbol, start_date, end_date, interval, symbol_usage.get(symbol, 0)))
 
     if tasks:
         await asyncio.gather(*tasks)
+        fetcher_pipeline.shutdown()
+        scheduler.log_throughput()
         logger.info("Finished fetching kline data")
     else:
         logger.warning("No kline data tasks to fetch")
 
+    if COMPACTION_ENABLED:
+        await compact_klines_batch()
 
-async def fetch_klines_for_symbol(symbol: str, start_date: str, end_date: str, interval: str) -> None:
+
+async def compact_klines_batch():
+    """
+    Merges daily Parquet files of all symbols and intervals from SYMBOLS_CONFIG into monthly
+    or yearly partitions. Runs in a worker thread to keep the event loop responsive.
+    """
+    for symbol, intervals in SYMBOLS_CONFIG.items():
+        for interval in intervals:
+            compacted = await asyncio.to_thread(compactor.compact_klines, symbol, interval)
+            if compacted:
+                logger.info(f"Compacted {compacted} daily files for {symbol} on {interval}")
+
+
+async def fetch_klines_for_symbol(
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        interval: str,
+        symbol_requests: int = 0
+) -> None:
     """
     Function to download, preprocess, and store Binance market data for a date range.
 
@@ -35,23 +62,73 @@ async def fetch_klines_for_symbol(symbol: str, start_date: str, end_date: str, i
     :param start_date: Start date in 'YYYY-MM-DD' format.
     :param end_date: End date in 'YYYY-MM-DD' format.
     :param interval: Kline interval (e.g., '1h', '5m').
+    :param symbol_requests: Number of backtests that requested the symbol, used for download priority.
     """
     logger.info(f"Start loading data for {symbol} on {interval}, start: {start_date}, end: {end_date}")
     try:
-        await validators.async_validate_symbol(symbol)
         validators.validate_interval(interval)
         start_date = date_utils.date_from_string(start_date)
         end_date = date_utils.date_from_string(end_date)
         validators.validate_dates(start_date, end_date)
 
-        tasks = []
+        dates = []
         current_date = start_date
         while current_date <= end_date:
-            tasks.append(fetcher_pipeline.process_daily_klines(symbol, current_date.strftime(DATE_FORMAT), interval))
+            dates.append(current_date.strftime(DATE_FORMAT))
             current_date += timedelta(days=1)
-        await asyncio.gather(*tasks)
+
+        missing_dates = [
+            date_utils.date_from_string(date) for date in manifest.find_missing_dates(symbol, interval, dates)
+        ]
+
+        if not missing_dates:
+            logger.info(f"Parquet files are up to date for {symbol} on {interval}, start: {start_date}, end: {end_date}")
+            return
+
+        await validators.async_validate_symbol(symbol)
+        logger.info(f"Fetching {len(missing_dates)} missing days for {symbol} on {interval}")
+        jobs = plan_downloads(symbol, interval, missing_dates, symbol_requests)
+        await fetcher_pipeline.run_pipeline(jobs)
         logger.info(f"Parquet files created for {symbol} on {interval}, start: {start_date}, end: {end_date}")
     except ValueError as e:
         logger.error(f"Error validating {symbol} on {interval}, start: {start_date}, end: {end_date}: {e}")
     except Exception as e:
         logger.error(f"Error {symbol} on {interval}: {e}")
+
+
+def plan_downloads(symbol: str, interval: str, missing_dates: List[date], symbol_requests: int = 0) -> List[Dict]:
+    """
+    Groups missing days into download jobs: complete past months with enough missing days are
+    fetched as one monthly archive, the rest (including the current month) as daily files.
+
+    :param symbol: Trading pair symbol (e.g., 'BTCUSDT').
+    :param interval: Kline interval (e.g., '1h', '5m').
+    :param missing_dates: Sorted days that still need to be fetched.
+    :param symbol_requests: Number of backtests that requested the symbol, used for download priority.
+    :return: Download jobs for fetcher_pipeline.run_pipeline.
+    """
+    current_month = datetime.now().date().replace(day=1)
+    jobs = []
+
+    for month_start, month_days in groupby(missing_dates, key=lambda day: day.replace(day=1)):
+        month_days = list(month_days)
+
+        if month_start < current_month and len(month_days) >= MONTHLY_ARCHIVE_MIN_DAYS:
+            jobs.append(
+                fetcher_pipeline.monthly_job(
+                    symbol,
+                    interval,
+                    month_start.strftime(MONTH_FORMAT),
+                    [day.strftime(DATE_FORMAT) for day in month_days],
+                    download_priority(symbol_requests, month_days[-1])
+                )
+            )
+        else:
+            jobs.extend(
+                fetcher_pipeline.daily_job(
+                    symbol, interval, day.strftime(DATE_FORMAT), download_priority(symbol_requests, day)
+                )
+                for day in month_days
+            )
+
+    return jobs
@@ -24,6 +24,11 @@ DTYPE_MAP: Dict[str, str] = {
 
 TARGET_COLUMNS: List[str] = list(DTYPE_MAP.keys())
 
+FLOAT_COLUMNS: List[str] = [col for col, dtype in DTYPE_MAP.items() if dtype == "float64"]
+
+# Width of FLOAT_COLUMNS in compact mode
+COMPACT_FLOAT_DTYPE: str = "float32"
+
 INDEX_COLUMNS: List[str] = [
     "symbol",
     "timestamp"
@@ -34,6 +39,9 @@ DATETIME_COLUMNS: List[str] = [
     "close_time"
 ]
 
+# Epoch timestamps at or above this value are in microseconds, below it in milliseconds
+MICROSECOND_TIMESTAMP_THRESHOLD: int = 10 ** 15
+
 PRICE_COLUMNS: List[str] = [
     "open",
     "high",
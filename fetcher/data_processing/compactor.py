@@ -0,0 +1,111 @@
+import os
+from datetime import datetime
+from itertools import groupby
+from typing import List
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from fetcher.data_processing import manifest, table_proc
+from logger.config import logger
+from settings import COMPACTION_YEARLY_MAX_ROWS, DATE_FORMAT, PARQUET_ROW_GROUP_ROWS
+from utils import date_utils, path_utils
+
+
+def get_compaction_period(interval: str, date: str) -> str:
+    """
+    Returns the compacted partition a day belongs to: its year when a whole year of the
+    interval fits into COMPACTION_YEARLY_MAX_ROWS rows, its month otherwise.
+
+    Args:
+        interval (str): Interval of klines (e.g., '1m', '1h').
+        date (str): Date string in 'YYYY-MM-DD' format.
+
+    Returns:
+        str: Period in 'YYYY' or 'YYYY-MM' format.
+    """
+    rows_per_year = 366 * 86_400 // date_utils.interval_to_seconds(interval)
+    return date[:4] if rows_per_year <= COMPACTION_YEARLY_MAX_ROWS else date[:7]
+
+
+def _period_is_closed(period: str) -> bool:
+    """A period can be compacted once it lies entirely in the past."""
+    today = datetime.now().date().strftime(DATE_FORMAT)
+    return today[:len(period)] > period
+
+
+def _merge_tables(file_paths: List[str]) -> pa.Table:
+    """Concatenates Parquet files ordered by timestamp, keeping the last copy of duplicated klines."""
+    tables = [table_proc.to_storage_types(pq.read_table(file_path)) for file_path in file_paths]
+    table = pa.concat_tables(tables, promote_options="permissive").sort_by("timestamp")
+
+    timestamps = table["timestamp"].cast(pa.int64()).to_numpy()
+    keep = np.append(timestamps[1:] != timestamps[:-1], True)
+    if not keep.all():
+        table = table.filter(pa.array(keep))
+
+    return table
+
+
+def compact_period(symbol: str, interval: str, period: str, daily_paths: List[str]) -> str:
+    """
+    Merges daily Parquet files (and an existing compacted file of the period) into one
+    compacted file, re-points the catalog and removes the daily files.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h').
+        period (str): Period in 'YYYY' or 'YYYY-MM' format.
+        daily_paths (List[str]): Daily Parquet files belonging to the period.
+
+    Returns:
+        str: Path to the compacted Parquet file.
+    """
+    file_path = path_utils.create_compacted_parquet_path(symbol, interval, period)
+    source_paths = ([file_path] if os.path.exists(file_path) else []) + daily_paths
+
+    table = _merge_tables(source_paths)
+
+    tmp_path = f"{file_path}.tmp"
+    pq.write_table(table, tmp_path, compression="zstd", row_group_size=PARQUET_ROW_GROUP_ROWS)
+    os.replace(tmp_path, file_path)
+
+    manifest.record_file(symbol, interval, file_path, table)
+
+    for daily_path in daily_paths:
+        os.remove(daily_path)
+
+    return file_path
+
+
+def compact_klines(symbol: str, interval: str) -> int:
+    """
+    Compacts all daily Parquet files of a symbol and interval whose period is over.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h').
+
+    Returns:
+        int: Number of daily files merged into compacted partitions.
+    """
+    daily_paths = path_utils.get_daily_parquet_paths(symbol, interval)
+
+    def period_of(daily_path: str) -> str:
+        return get_compaction_period(interval, os.path.basename(daily_path)[:-len(".parquet")])
+
+    compacted = 0
+    for period, period_paths in groupby(daily_paths, key=period_of):
+        period_paths = list(period_paths)
+        if not _period_is_closed(period):
+            continue
+
+        try:
+            file_path = compact_period(symbol, interval, period, period_paths)
+            compacted += len(period_paths)
+            logger.debug(f"Compacted {len(period_paths)} daily files into {file_path}")
+        except Exception as e:
+            logger.error(f"Error compacting {symbol} on {interval}, {period}: {e}")
+
+    return compacted
@@ -1,9 +1,15 @@
 import io
 
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv
 
 from fetcher.config import data_enums
 
+ARROW_SCHEMA: pa.Schema = pa.schema(
+    [(col, pa.type_for_alias(dtype)) for col, dtype in data_enums.DTYPE_MAP.items()]
+)
+
 
 def to_dataframe(csv_data: io.StringIO) -> pd.DataFrame:
     """
@@ -20,3 +26,22 @@ def to_dataframe(csv_data: io.StringIO) -> pd.DataFrame:
         raise ValueError(f"Missing columns in CSV: {missing_columns}")
 
     return df
+
+
+def to_table(csv_bytes: bytes) -> pa.Table:
+    """
+    Parses raw CSV bytes into an Arrow table with the explicit DTYPE_MAP schema,
+    using the multi-threaded Arrow CSV reader. Malformed rows are skipped.
+
+    :param csv_bytes: Raw CSV content.
+    :return: Arrow table with the target columns.
+    """
+    return csv.read_csv(
+        pa.BufferReader(csv_bytes),
+        read_options=csv.ReadOptions(column_names=data_enums.CSV_COLUMNS, use_threads=True),
+        parse_options=csv.ParseOptions(invalid_row_handler=lambda row: "skip"),
+        convert_options=csv.ConvertOptions(
+            column_types=ARROW_SCHEMA,
+            include_columns=data_enums.TARGET_COLUMNS
+        )
+    )
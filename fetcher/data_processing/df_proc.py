@@ -1,6 +1,9 @@
+from typing import Dict
+
 import pandas as pd
 
 from fetcher.config import data_enums
+from settings import DATE_FORMAT, PARQUET_ROW_GROUP_ROWS
 from utils import path_utils
 
 
@@ -21,16 +24,12 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def get_time_unit(series: pd.Series) -> str:
-    """Returns time_unit based on the most frequent length of integer values in the Series"""
-    length_to_unit = {13: "ms", 16: "us"}
-
-    len_series = series.apply(lambda x: len(str(x)))
-
-    most_frequent_len = len_series.mode()[0]
+    """Returns time_unit ('ms' or 'us') based on the magnitude of the median epoch value in the Series"""
+    median = series.median()
 
-    time_unit = length_to_unit.get(most_frequent_len, None)
-
-    return time_unit
+    if pd.isna(median) or median < data_enums.MICROSECOND_TIMESTAMP_THRESHOLD:
+        return "ms"
+    return "us"
 
 
 def normalize_data(df: pd.DataFrame) -> pd.DataFrame:
@@ -51,13 +50,26 @@ def normalize_data(df: pd.DataFrame) -> pd.DataFrame:
 
     df[data_enums.MARKET_ACTIVITY_COLUMNS] = df[data_enums.MARKET_ACTIVITY_COLUMNS].fillna(0)
 
-    for col in data_enums.PRICE_COLUMNS:
-        df[col] = df[col].replace(0, pd.NA)
-        df[col] = df[col].ffill().bfill()
+    prices = df[data_enums.PRICE_COLUMNS]
+    df[data_enums.PRICE_COLUMNS] = prices.mask(prices == 0).ffill().bfill()
 
     return df
 
 
+def split_by_date(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Splits a normalized multi-day DataFrame into one DataFrame per day.
+
+    Args:
+        df (pd.DataFrame): Normalized DataFrame with a datetime 'timestamp' column.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Daily DataFrames keyed by date string in 'YYYY-MM-DD' format.
+    """
+    days = df["timestamp"].dt.floor("D")
+    return {day.strftime(DATE_FORMAT): day_df.reset_index(drop=True) for day, day_df in df.groupby(days, sort=True)}
+
+
 def set_index(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
     """
     Inserts the symbol as a new column at the beginning and sets the index.
@@ -88,5 +100,7 @@ def save_to_parquet(df: pd.DataFrame, symbol: str, interval: str, date: str) ->
         str: Path to the saved Parquet file.
     """
     file_path = path_utils.create_parquet_path(symbol, interval, date)
-    df.to_parquet(file_path, engine="pyarrow", index=True, compression="zstd")
+    df.to_parquet(
+        file_path, engine="pyarrow", index=True, compression="zstd", row_group_size=PARQUET_ROW_GROUP_ROWS
+    )
     return file_path
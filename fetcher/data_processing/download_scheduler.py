@@ -0,0 +1,220 @@
+import asyncio
+import itertools
+from datetime import date
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from fetcher.data_processing import zip_proc
+from logger.config import logger
+from settings import (
+    DOWNLOAD_BURST,
+    DOWNLOAD_CONCURRENCY,
+    DOWNLOAD_RATE_LIMIT,
+    RETRY_ATTEMPTS,
+    RETRY_BUDGET_MIN,
+    RETRY_BUDGET_RATIO,
+    RETRY_MAX_WAIT,
+    RETRY_MIN_WAIT,
+    RETRY_MULTIPLIER,
+)
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+def download_priority(symbol_requests: int, day: date) -> Tuple[int, int]:
+    """
+    Builds a queue priority for a download: frequently requested symbols first, then recent dates.
+
+    Args:
+        symbol_requests (int): Number of backtests that requested the symbol.
+        day (date): Date covered by the download.
+
+    Returns:
+        Tuple[int, int]: Priority tuple, lower values are downloaded first.
+    """
+    return -symbol_requests, -day.toordinal()
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Returns True for transport errors and throttling/server responses."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (httpx.RequestError, httpx.TimeoutException))
+
+
+class TokenBucket:
+    """Token bucket limiting the request rate against a single host."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self._updated_at is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and consumes it."""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            self._refill(loop.time())
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill(loop.time())
+            self._tokens -= 1
+
+
+class RetryBudget:
+    """Caps retries to a fraction of completed requests, shared by all downloads."""
+
+    def __init__(self, ratio: float, min_retries: int):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+
+    def record_request(self) -> None:
+        self.requests += 1
+
+    def try_spend(self) -> bool:
+        """Consumes one retry if the budget allows it."""
+        if self.retries >= self.min_retries + self.ratio * self.requests:
+            return False
+        self.retries += 1
+        return True
+
+
+class DownloadScheduler:
+    """
+    Priority queue of downloads served by a fixed pool of workers.
+
+    Concurrency is capped by the number of workers, request rate by a token bucket
+    per host, and retries by a budget shared across all downloads.
+    """
+
+    def __init__(
+            self,
+            concurrency: int = DOWNLOAD_CONCURRENCY,
+            rate_limit: float = DOWNLOAD_RATE_LIMIT,
+            burst: int = DOWNLOAD_BURST,
+            retry_ratio: float = RETRY_BUDGET_RATIO,
+            retry_min: int = RETRY_BUDGET_MIN
+    ):
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.retry_ratio = retry_ratio
+        self.retry_min = retry_min
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sequence = itertools.count()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._workers = []
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.retry_budget = RetryBudget(self.retry_ratio, self.retry_min)
+        self.files = 0
+        self.bytes = 0
+        self.failures = 0
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._reset()
+        if not self._workers:
+            self._workers = [loop.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate_limit, self.burst)
+        return self._buckets[host]
+
+    async def download(self, url: str, priority: Tuple = (0,)) -> bytes:
+        """
+        Queues a download and waits for its content.
+
+        Args:
+            url (str): The URL to fetch.
+            priority (Tuple): Queue priority, lower values are served first.
+
+        Returns:
+            bytes: The downloaded content.
+        """
+        self._ensure_workers()
+        future = self._loop.create_future()
+        self._queue.put_nowait((priority, next(self._sequence), url, 0, future))
+        return await future
+
+    async def _worker(self) -> None:
+        while True:
+            priority, sequence, url, attempt, future = await self._queue.get()
+            try:
+                await self._bucket(url).acquire()
+                if self._started_at is None:
+                    self._started_at = self._loop.time()
+
+                content = await zip_proc.download(url)
+
+                self.retry_budget.record_request()
+                self.files += 1
+                self.bytes += len(content)
+                self._finished_at = self._loop.time()
+                if not future.done():
+                    future.set_result(content)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.retry_budget.record_request()
+                if _is_retryable(e) and attempt + 1 < RETRY_ATTEMPTS and self.retry_budget.try_spend():
+                    delay = min(RETRY_MAX_WAIT, max(RETRY_MIN_WAIT, RETRY_MULTIPLIER * 2 ** attempt))
+                    logger.debug(f"Retrying {url} in {delay}s (attempt {attempt + 1}): {e}")
+                    self._loop.call_later(
+                        delay, self._queue.put_nowait, (priority, sequence, url, attempt + 1, future)
+                    )
+                else:
+                    self.failures += 1
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def throughput(self) -> Dict[str, float]:
+        """
+        Returns sustained throughput since the first request was sent.
+
+        Returns:
+            Dict[str, float]: Completed files, failures, retries, elapsed seconds, files/s and MB/s.
+        """
+        elapsed = 0.0
+        if self._started_at is not None and self._finished_at is not None:
+            elapsed = self._finished_at - self._started_at
+        return {
+            "files": self.files,
+            "failures": self.failures,
+            "retries": self.retry_budget.retries,
+            "elapsed_s": elapsed,
+            "files_per_s": self.files / elapsed if elapsed > 0 else 0.0,
+            "mb_per_s": self.bytes / elapsed / 1e6 if elapsed > 0 else 0.0,
+        }
+
+    def log_throughput(self) -> None:
+        stats = self.throughput()
+        logger.info(
+            f"Downloaded {stats['files']} files in {stats['elapsed_s']:.2f}s "
+            f"({stats['files_per_s']:.1f} files/s, {stats['mb_per_s']:.2f} MB/s), "
+            f"retries: {stats['retries']}, failures: {stats['failures']}"
+        )
+
+
+scheduler = DownloadScheduler()
@@ -1,28 +1,205 @@
-from fetcher.data_processing import csv_proc, df_proc, zip_proc
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import pyarrow as pa
+
+from fetcher.data_processing import csv_proc, df_proc, manifest, table_proc, zip_proc
+from fetcher.data_processing.download_scheduler import scheduler
 from logger.config import logger
+from settings import DOWNLOAD_CONCURRENCY, PARSE_WORKERS, PIPELINE_QUEUE_SIZE, WRITE_WORKERS
 from utils import url_utils
 
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Returns the process pool shared by all pipelines, creating it on first use."""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    return _process_pool
+
+
+def shutdown() -> None:
+    """Stops the parse process pool once fetching is finished."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown()
+        _process_pool = None
 
-async def process_daily_klines(symbol: str, date: str, interval: str) -> None:
+
+def daily_job(symbol: str, interval: str, date: str, priority: Tuple = (0,)) -> Dict:
     """
-    Downloads Kline data for a single day.
+    Describes the download of a single day archive.
 
     :param symbol: Trading pair symbol (e.g., 'BTCUSDT').
+    :param interval: Kline interval (e.g., '1h', '5m').
     :param date: Date in 'YYYY-MM-DD' format.
+    :param priority: Download queue priority, lower values are downloaded first.
+    :return: Job description consumed by run_pipeline.
+    """
+    return {
+        "symbol": symbol,
+        "interval": interval,
+        "url": url_utils.build_zip_url(symbol, interval, date),
+        "dates": [date],
+        "monthly": False,
+        "priority": priority,
+    }
+
+
+def monthly_job(symbol: str, interval: str, month: str, dates: List[str], priority: Tuple = (0,)) -> Dict:
+    """
+    Describes the download of a monthly archive that is split into daily partitions.
+
+    :param symbol: Trading pair symbol (e.g., 'BTCUSDT').
     :param interval: Kline interval (e.g., '1h', '5m').
+    :param month: Month in 'YYYY-MM' format.
+    :param dates: Dates of the month to store, in 'YYYY-MM-DD' format.
+    :param priority: Download queue priority, lower values are downloaded first.
+    :return: Job description consumed by run_pipeline.
+    """
+    return {
+        "symbol": symbol,
+        "interval": interval,
+        "url": url_utils.build_monthly_zip_url(symbol, interval, month),
+        "dates": dates,
+        "monthly": True,
+        "priority": priority,
+    }
+
+
+def _parse_with_pandas(zip_content: bytes) -> pa.Table:
+    """Fallback parser for archives the strict Arrow schema rejects (e.g. header rows)."""
+    csv_data = zip_proc.extract_content(zip_content)
+
+    raw_df = csv_proc.to_dataframe(csv_data)
+    cleaned_df = df_proc.clean_data(raw_df)
+    normalized_df = df_proc.normalize_data(cleaned_df)
+    return pa.Table.from_pandas(normalized_df, preserve_index=False)
+
+
+def parse_archive(zip_content: bytes, symbol: str, dates: List[str], monthly: bool) -> Dict[str, pa.Table]:
+    """
+    Parses a downloaded ZIP archive straight from the CSV bytes into normalized Arrow tables,
+    one per day. CPU-bound, runs in the parse process pool.
+
+    :param zip_content: The ZIP file content in bytes.
+    :param symbol: Trading pair symbol (e.g., 'BTCUSDT').
+    :param dates: Dates to keep, in 'YYYY-MM-DD' format.
+    :param monthly: Whether the archive covers a whole month and has to be split by day.
+    :return: Tables in the stored layout keyed by date.
     """
     try:
-        zip_url = url_utils.build_zip_url(symbol, interval, date)
-        zip_content = await zip_proc.download(zip_url)
+        table = table_proc.normalize_table(csv_proc.to_table(zip_proc.extract_bytes(zip_content)))
+    except pa.ArrowInvalid as e:
+        logger.warning(f"Arrow CSV parsing failed for {symbol}, falling back to pandas: {e}")
+        table = _parse_with_pandas(zip_content)
 
-        csv_data = zip_proc.extract_content(zip_content)
+    daily_tables = table_proc.split_by_date(table) if monthly else {dates[0]: table}
 
-        raw_df = csv_proc.to_dataframe(csv_data)
-        cleaned_df = df_proc.clean_data(raw_df)
-        normalized_df = df_proc.normalize_data(cleaned_df)
-        indexed_df = df_proc.set_index(normalized_df, symbol)
+    return {date: table_proc.set_index(daily_tables[date], symbol) for date in dates if date in daily_tables}
 
-        df_proc.save_to_parquet(indexed_df, symbol, interval, date)
 
-    except Exception as e:
-        logger.error(f"Error processing {symbol} on {interval}, {date}: {e}")
+def write_partitions(daily_tables: Dict[str, pa.Table], symbol: str, interval: str) -> List[str]:
+    """
+    Writes daily tables to Parquet and registers them in the catalog.
+    Disk-bound, runs in a worker thread.
+
+    :param daily_tables: Tables in the stored layout keyed by date.
+    :param symbol: Trading pair symbol (e.g., 'BTCUSDT').
+    :param interval: Kline interval (e.g., '1h', '5m').
+    :return: Paths of the written files.
+    """
+    file_paths = []
+    for date, table in daily_tables.items():
+        file_path = table_proc.save_to_parquet(table, symbol, interval, date)
+        manifest.record_file(symbol, interval, file_path, table)
+        file_paths.append(file_path)
+    return file_paths
+
+
+async def _download_stage(jobs: asyncio.Queue, parsed: asyncio.Queue) -> None:
+    while True:
+        job = await jobs.get()
+        try:
+            zip_content = await scheduler.download(job["url"], job["priority"])
+            await parsed.put((job, zip_content))
+        except httpx.HTTPStatusError as e:
+            if job["monthly"]:
+                logger.warning(f"Monthly archive unavailable at {job['url']}, falling back to daily: {e}")
+                for date in job["dates"]:
+                    jobs.put_nowait(daily_job(job["symbol"], job["interval"], date, job["priority"]))
+            else:
+                logger.error(f"Error downloading {job['symbol']} on {job['interval']}, {job['dates'][0]}: {e}")
+        except Exception as e:
+            logger.error(f"Error downloading {job['url']}: {e}")
+        finally:
+            jobs.task_done()
+
+
+async def _parse_stage(parsed: asyncio.Queue, written: asyncio.Queue) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        job, zip_content = await parsed.get()
+        try:
+            daily_tables = await loop.run_in_executor(
+                _get_process_pool(), parse_archive, zip_content, job["symbol"], job["dates"], job["monthly"]
+            )
+            del zip_content
+
+            missing_dates = [date for date in job["dates"] if date not in daily_tables]
+            if missing_dates:
+                logger.warning(f"No klines for {job['symbol']} on {job['interval']}, {missing_dates} in {job['url']}")
+
+            await written.put((job, daily_tables))
+        except Exception as e:
+            logger.error(f"Error processing {job['symbol']} on {job['interval']}, {job['url']}: {e}")
+        finally:
+            parsed.task_done()
+
+
+async def _write_stage(written: asyncio.Queue) -> None:
+    while True:
+        job, daily_tables = await written.get()
+        try:
+            await asyncio.to_thread(write_partitions, daily_tables, job["symbol"], job["interval"])
+        except Exception as e:
+            logger.error(f"Error saving {job['symbol']} on {job['interval']}, {job['url']}: {e}")
+        finally:
+            written.task_done()
+
+
+async def run_pipeline(jobs: List[Dict]) -> None:
+    """
+    Runs download jobs through a staged pipeline: downloads -> parsing in a process pool ->
+    Parquet writes in worker threads. Bounded queues between the stages apply backpressure,
+    so at most PIPELINE_QUEUE_SIZE archives wait at each stage.
+
+    :param jobs: Jobs created by daily_job / monthly_job.
+    """
+    job_queue: asyncio.Queue = asyncio.Queue()
+    parsed_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    written_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+
+    for job in sorted(jobs, key=lambda item: item["priority"]):
+        job_queue.put_nowait(job)
+
+    stages = [
+        [asyncio.create_task(_download_stage(job_queue, parsed_queue)) for _ in range(DOWNLOAD_CONCURRENCY)],
+        [asyncio.create_task(_parse_stage(parsed_queue, written_queue)) for _ in range(PARSE_WORKERS)],
+        [asyncio.create_task(_write_stage(written_queue)) for _ in range(WRITE_WORKERS)],
+    ]
+
+    try:
+        for queue, workers in zip((job_queue, parsed_queue, written_queue), stages):
+            await queue.join()
+            for worker in workers:
+                worker.cancel()
+    finally:
+        for workers in stages:
+            for worker in workers:
+                worker.cancel()
+        await asyncio.gather(*[worker for workers in stages for worker in workers], return_exceptions=True)
@@ -0,0 +1,185 @@
+import hashlib
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from fetcher.data_processing.table_proc import NANOSECONDS_PER_DAY
+from logger.config import logger
+from utils import catalog, path_utils
+
+
+def file_hash(file_path: str) -> str:
+    """Returns the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=256)
+def _cached_file_hash(file_path: str, size: int, mtime_ns: int) -> str:
+    """Hashes a file once per (size, mtime) version; compacted files are shared by many partitions."""
+    return file_hash(file_path)
+
+
+def build_partitions(symbol: str, interval: str, file_path: str, table: pa.Table) -> List[Dict]:
+    """
+    Builds catalog rows (one per day) for the klines stored in a written file.
+    Performs file IO only, so it can run outside the event loop.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h').
+        file_path (str): Path to the written Parquet file.
+        table (pa.Table): Table holding at least the 'timestamp' column of the file.
+
+    Returns:
+        List[Dict]: Catalog rows with path, row count, size, mtime, content hash and timestamp bounds.
+    """
+    if table.num_rows == 0:
+        return []
+
+    stat = os.stat(file_path)
+    sha256 = _cached_file_hash(file_path, stat.st_size, stat.st_mtime_ns)
+
+    timestamps = np.sort(table["timestamp"].cast(pa.int64()).to_numpy())
+    days, starts, counts = np.unique(timestamps // NANOSECONDS_PER_DAY, return_index=True, return_counts=True)
+
+    return [
+        {
+            "symbol": symbol,
+            "interval": interval,
+            "date": np.datetime_as_string(np.datetime64(int(day), "D")),
+            "path": file_path,
+            "rows": int(count),
+            "bytes": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256,
+            "min_ts": int(timestamps[start]),
+            "max_ts": int(timestamps[start + count - 1]),
+        }
+        for day, start, count in zip(days, starts, counts)
+    ]
+
+
+def record_file(symbol: str, interval: str, file_path: str, table: Optional[pa.Table] = None) -> List[Dict]:
+    """
+    Registers every day stored in a Parquet file in the catalog.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h').
+        file_path (str): Path to the Parquet file.
+        table (Optional[pa.Table]): Content of the file if already in memory; read from disk otherwise.
+
+    Returns:
+        List[Dict]: The recorded catalog rows.
+    """
+    if table is None:
+        table = pq.read_table(file_path, columns=["timestamp"])
+
+    partitions = build_partitions(symbol, interval, file_path, table)
+    catalog.upsert_partitions(partitions)
+    return partitions
+
+
+def _discard_file(file_path: str) -> None:
+    """Deletes a damaged file and drops every partition stored in it from the catalog."""
+    catalog.delete_path(file_path)
+
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+
+def _adopt_existing_file(symbol: str, interval: str, date: str) -> List[Dict]:
+    """Registers a daily or compacted file written before it was catalogued, if it is readable."""
+    candidates = (
+        path_utils.get_parquet_path(symbol, interval, date),
+        path_utils.get_compacted_parquet_path(symbol, interval, date[:7]),
+        path_utils.get_compacted_parquet_path(symbol, interval, date[:4]),
+    )
+
+    for file_path in candidates:
+        if not os.path.exists(file_path):
+            continue
+        try:
+            return record_file(symbol, interval, file_path)
+        except Exception as e:
+            logger.warning(f"Unreadable Parquet file {file_path}, discarding it and scheduling re-download: {e}")
+            _discard_file(file_path)
+
+    return []
+
+
+def _is_file_intact(partition: Dict) -> bool:
+    """
+    The file is trusted when its size and mtime match the catalog; otherwise its content
+    hash is recomputed and compared against the recorded one. When it matches, the new mtime
+    is recorded, so a touched or restored file is hashed only once.
+    """
+    file_path = partition["path"]
+    if not os.path.exists(file_path):
+        return False
+
+    stat = os.stat(file_path)
+    if stat.st_size != partition["bytes"]:
+        return False
+
+    if stat.st_mtime_ns == partition["mtime_ns"]:
+        return True
+
+    if _cached_file_hash(file_path, stat.st_size, stat.st_mtime_ns) != partition["sha256"]:
+        return False
+
+    catalog.update_mtime(file_path, stat.st_mtime_ns)
+    return True
+
+
+def find_missing_dates(symbol: str, interval: str, dates: List[str]) -> List[str]:
+    """
+    Returns the days that still have to be fetched: days missing from the catalog, and days
+    whose file (daily or compacted) is gone or damaged. Damaged files are deleted so they are
+    never merged with their re-downloaded replacements.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h').
+        dates (List[str]): Sorted dates in 'YYYY-MM-DD' format.
+
+    Returns:
+        List[str]: Dates without an intact partition.
+    """
+    if not dates:
+        return []
+
+    partitions = catalog.get_partitions(symbol, interval, dates[0], dates[-1])
+    intact_files: Dict[str, bool] = {}
+    missing_dates = []
+
+    for date in dates:
+        partition = partitions.get(date)
+
+        if partition is None:
+            for adopted in _adopt_existing_file(symbol, interval, date):
+                partitions[adopted["date"]] = adopted
+            partition = partitions.get(date)
+            if partition is None:
+                missing_dates.append(date)
+                continue
+
+        file_path = partition["path"]
+        if file_path not in intact_files:
+            intact_files[file_path] = _is_file_intact(partition)
+            if not intact_files[file_path]:
+                logger.warning(f"Partition file {file_path} is missing or damaged, scheduling re-download")
+                _discard_file(file_path)
+
+        if not intact_files[file_path]:
+            missing_dates.append(date)
+
+    return missing_dates
@@ -0,0 +1,167 @@
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from fetcher.config import data_enums
+from settings import COMPACT_MODE, PARQUET_ROW_GROUP_ROWS
+from utils import path_utils
+
+NANOSECONDS_PER_DAY: int = 86_400 * 10 ** 9
+
+_pandas_metadata: Optional[bytes] = None
+
+
+def get_storage_dtypes() -> Dict[str, str]:
+    """Returns DTYPE_MAP with price and volume columns narrowed to float32 in compact mode."""
+    if not COMPACT_MODE:
+        return data_enums.DTYPE_MAP
+    return {
+        col: data_enums.COMPACT_FLOAT_DTYPE if col in data_enums.FLOAT_COLUMNS else dtype
+        for col, dtype in data_enums.DTYPE_MAP.items()
+    }
+
+
+def to_storage_types(table: pa.Table) -> pa.Table:
+    """
+    Casts the float columns of a table to the configured width, so files written in and
+    out of compact mode can be merged and loaded together.
+
+    Args:
+        table (pa.Table): Table holding any subset of the stored columns.
+
+    Returns:
+        pa.Table: Table with float columns as float32 in compact mode, float64 otherwise.
+    """
+    float_type = pa.from_numpy_dtype(np.dtype(get_storage_dtypes()[data_enums.FLOAT_COLUMNS[0]]))
+    for col in data_enums.FLOAT_COLUMNS:
+        index = table.schema.get_field_index(col)
+        if index != -1 and table.schema.field(index).type != float_type:
+            table = table.set_column(index, col, table[col].cast(float_type))
+    return table
+
+
+def _get_pandas_metadata() -> bytes:
+    """
+    Returns pandas schema metadata for the stored layout, so Parquet files written from
+    Arrow tables load with the same ('symbol', 'timestamp') MultiIndex as before.
+    """
+    global _pandas_metadata
+    if _pandas_metadata is None:
+        empty_df = pd.DataFrame(
+            {col: pd.Series(dtype=dtype) for col, dtype in get_storage_dtypes().items()}
+        )
+        for col in data_enums.DATETIME_COLUMNS:
+            empty_df[col] = empty_df[col].astype("datetime64[ns]")
+        empty_df.insert(0, "symbol", pd.Series(dtype="object"))
+        empty_df = empty_df.set_index(data_enums.INDEX_COLUMNS)
+        _pandas_metadata = pa.Schema.from_pandas(empty_df).metadata[b"pandas"]
+    return _pandas_metadata
+
+
+def _to_nanoseconds(array: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Converts ms or µs epoch integers to timestamp[ns], detecting the unit of each value by magnitude."""
+    is_microseconds = pc.greater_equal(array, data_enums.MICROSECOND_TIMESTAMP_THRESHOLD)
+    nanoseconds = pc.if_else(is_microseconds, pc.multiply(array, 1_000), pc.multiply(array, 1_000_000))
+    return nanoseconds.cast(pa.timestamp("ns"))
+
+
+def _fill_price_gaps(array: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Treats zero prices as missing and fills them forward, then backward."""
+    missing = pc.if_else(pc.equal(array, 0), pa.scalar(None, array.type), array)
+    return pc.fill_null_backward(pc.fill_null_forward(missing))
+
+
+def normalize_table(table: pa.Table) -> pa.Table:
+    """
+    Normalizes the parsed klines: converts datetime columns to timestamps, fills missing
+    market activity values with zero and interpolates zero or missing prices.
+
+    Args:
+        table (pa.Table): Table produced by csv_proc.to_table.
+
+    Returns:
+        pa.Table: Normalized table.
+    """
+    for col in data_enums.DATETIME_COLUMNS:
+        table = table.set_column(table.schema.get_field_index(col), col, _to_nanoseconds(table[col]))
+
+    for col in data_enums.MARKET_ACTIVITY_COLUMNS:
+        table = table.set_column(table.schema.get_field_index(col), col, pc.fill_null(table[col], 0))
+
+    for col in data_enums.PRICE_COLUMNS:
+        table = table.set_column(table.schema.get_field_index(col), col, _fill_price_gaps(table[col]))
+
+    return table
+
+
+def split_by_date(table: pa.Table) -> Dict[str, pa.Table]:
+    """
+    Splits a normalized multi-day table into zero-copy daily slices.
+
+    Args:
+        table (pa.Table): Normalized table with a timestamp[ns] 'timestamp' column.
+
+    Returns:
+        Dict[str, pa.Table]: Daily tables keyed by date string in 'YYYY-MM-DD' format.
+    """
+    if table.num_rows == 0:
+        return {}
+
+    timestamps = table["timestamp"].cast(pa.int64()).to_numpy()
+    if np.any(np.diff(timestamps) < 0):
+        table = table.sort_by("timestamp")
+        timestamps = np.sort(timestamps)
+
+    days = timestamps // NANOSECONDS_PER_DAY
+    boundaries = np.concatenate(([0], np.flatnonzero(np.diff(days)) + 1, [len(days)]))
+
+    daily_tables = {}
+    for start, end in zip(boundaries[:-1], boundaries[1:]):
+        date = np.datetime_as_string(np.datetime64(int(days[start]), "D"))
+        daily_tables[date] = table.slice(start, end - start)
+    return daily_tables
+
+
+def set_index(table: pa.Table, symbol: str) -> pa.Table:
+    """
+    Adds the symbol column and orders columns like a pandas frame indexed by ('symbol', 'timestamp').
+    Float columns are narrowed to float32 in compact mode.
+
+    Args:
+        table (pa.Table): Normalized table.
+        symbol (str): The symbol to be inserted.
+
+    Returns:
+        pa.Table: Table in the stored Parquet layout.
+    """
+    data_columns = [col for col in data_enums.TARGET_COLUMNS if col not in data_enums.INDEX_COLUMNS]
+    symbol_column = pa.array([symbol], type=pa.string()).take(np.zeros(table.num_rows, dtype=np.int32))
+
+    indexed_table = pa.table(
+        [table[col] for col in data_columns] + [symbol_column, table["timestamp"]],
+        names=data_columns + data_enums.INDEX_COLUMNS
+    )
+    return to_storage_types(indexed_table).replace_schema_metadata({b"pandas": _get_pandas_metadata()})
+
+
+def save_to_parquet(table: pa.Table, symbol: str, interval: str, date: str) -> str:
+    """
+    Saves a table to a compressed Parquet file using ZSTD compression. Row groups of
+    PARQUET_ROW_GROUP_ROWS rows let intraday reads skip the rest of the day.
+
+    Args:
+        table (pa.Table): Table in the stored layout (see set_index).
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1s', '5m').
+        date (str): Date string in 'YYYY-MM-DD' format.
+
+    Returns:
+        str: Path to the saved Parquet file.
+    """
+    file_path = path_utils.create_parquet_path(symbol, interval, date)
+    pq.write_table(table, file_path, compression="zstd", row_group_size=PARQUET_ROW_GROUP_ROWS)
+    return file_path
@@ -3,13 +3,13 @@ import zipfile
 
 import httpx
 
-from utils.httpx_client import client, retry_on_httpx
+from utils.httpx_client import client
 
 
-@retry_on_httpx
 async def download(url: str) -> bytes:
     """
     Asynchronously downloads a ZIP file from the given URL.
+    Retries are handled by the download scheduler's shared retry budget.
     :param url: The URL to fetch the ZIP file from.
     :return: The content of the ZIP file in bytes.
     """
@@ -24,6 +24,19 @@ async def download(url: str) -> bytes:
     return response.content
 
 
+def extract_bytes(zip_content: bytes) -> bytes:
+    """
+    Extracts the raw CSV bytes from a ZIP file without decoding them.
+    :param zip_content: The ZIP file content in bytes.
+    :return: The CSV content in bytes.
+    """
+    with zipfile.ZipFile(io.BytesIO(zip_content), "r") as z:
+        file_names = z.namelist()
+        if not file_names:
+            raise ValueError("ZIP file is empty")
+        return z.read(file_names[0])
+
+
 def extract_content(zip_content: bytes) -> io.StringIO:
     """
     Extracts the CSV content from a ZIP file.
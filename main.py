@@ -1,15 +1,24 @@
 import asyncio
+from backtester.data_loader.hot_tier import refresh_hot_tier
+from backtester import walk_forward
+from backtester.strategies.registry import validate_strategies_config
 from fetcher.app import fetch_klines_batch
 from bot.app import start_bot
 from logger.config import logger
+from settings import STRATEGIES_CONFIG, SYMBOLS_CONFIG
 
 
 async def main():
     logger.info("Starting app")
-    # TODO: implement check of already downloaded parquet klines
+    for problem in validate_strategies_config(STRATEGIES_CONFIG, SYMBOLS_CONFIG):
+        logger.warning(f"Strategies config: {problem}")
     await fetch_klines_batch()
+    await asyncio.to_thread(refresh_hot_tier)
     logger.info("Starting bot")
-    await start_bot()
+    try:
+        await start_bot()
+    finally:
+        walk_forward.shutdown()
 
 
 if __name__ == "__main__":
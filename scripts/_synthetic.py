@@ -0,0 +1,48 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from fetcher.config import data_enums
+
+
+def make_raw_klines(n_rows: int, freq: str = "1s", zero_fraction: float = 0.001, seed: int = 0) -> pd.DataFrame:
+    """
+    Klines as csv_proc.to_dataframe parses them from a Binance archive: epoch-millisecond
+    timestamps and a random-walk price, with a fraction of zero prices to gap-fill.
+    """
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2024-01-01").value // 10 ** 6
+    step = pd.Timedelta(freq).value // 10 ** 6
+    timestamps = start + step * np.arange(n_rows, dtype=np.int64)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-4, n_rows)))
+    df = pd.DataFrame({
+        "timestamp": timestamps,
+        "open": np.roll(close, 1),
+        "high": close * (1 + rng.uniform(0, 1e-4, n_rows)),
+        "low": close * (1 - rng.uniform(0, 1e-4, n_rows)),
+        "close": close,
+        "volume": rng.uniform(0, 10, n_rows),
+        "close_time": timestamps + step - 1,
+        "quote_asset_volume": rng.uniform(0, 1000, n_rows),
+        "trades": rng.integers(0, 100, n_rows).astype(np.int32),
+        "taker_buy_base": rng.uniform(0, 5, n_rows),
+        "taker_buy_quote": rng.uniform(0, 500, n_rows),
+        "ignore": 0,
+    })
+    for col in data_enums.PRICE_COLUMNS:
+        df.loc[rng.random(n_rows) < zero_fraction, col] = 0.0
+    return df
+
+
+def make_klines_matrix(symbols: List[str], n_rows: int, freq: str = "1s", seed: int = 0) -> Dict[str, pd.DataFrame]:
+    """Time x symbol frames of high, low and close as load_klines_matrix returns them."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=n_rows, freq=freq)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, (n_rows, len(symbols))), axis=0))
+    spread = rng.uniform(0, 2e-3, (n_rows, len(symbols)))
+    return {
+        "high": pd.DataFrame(close * (1 + spread), index=index, columns=symbols),
+        "low": pd.DataFrame(close * (1 - spread), index=index, columns=symbols),
+        "close": pd.DataFrame(close, index=index, columns=symbols),
+    }
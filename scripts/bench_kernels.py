@@ -0,0 +1,70 @@
+"""
+Benchmark of the fused numba kernels against the pandas indicator and signal stages they replace
+on an indicator-cache miss. Runs on a week of synthetic 1s klines with default parameters (and a
+long stochastic window, where vbt rescans every window) and checks that every output is
+bit-identical. The first call of each kernel compiles it and is not timed.
+
+    python -m scripts.bench_kernels [--symbols 4] [--rows 604800] [--repeat 5]
+"""
+import argparse
+import time
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from backtester.strategies import registry
+from scripts._synthetic import make_klines_matrix
+
+# (label, strategy name, parameters over the defaults)
+CASES: List[Tuple[str, str, Dict]] = [
+    ("sma_rsi", "sma_rsi", {}),
+    ("macd", "macd", {}),
+    ("bollinger_bands", "bollinger_bands", {}),
+    ("stochastic", "stochastic", {}),
+    ("atr_breakout", "atr_breakout", {}),
+    ("stochastic k=300", "stochastic", {"k_window": 300}),
+]
+
+
+def _run_stages(strategy: Dict, data: Dict[str, pd.DataFrame], params: Dict) -> Dict[str, pd.DataFrame]:
+    data = dict(data)
+    data.update(strategy["indicators"](data, params))
+    return strategy["signals"](data, params)
+
+
+def _best_time(run: Callable, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=604_800)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = make_klines_matrix([f"SYM{i}USDT" for i in range(args.symbols)], args.rows, freq="1s")
+
+    print(f"Strategy outputs, {args.symbols} symbols x {args.rows} rows of 1s klines (best of {args.repeat}), "
+          f"bit-identical outputs")
+    print(f"  {'strategy':<18}{'pandas stages':>15}{'fused kernel':>14}")
+    for label, strategy_name, overrides in CASES:
+        strategy = registry.get_strategy(strategy_name)
+        params = registry.resolve_params(strategy_name, overrides)
+        expected = _run_stages(strategy, data, params)
+        current = strategy["kernel"](data, params)
+        for name, frame in current.items():
+            pd.testing.assert_frame_equal(frame, expected[name], check_exact=True, obj=f"{label} {name}")
+
+        before = _best_time(lambda: _run_stages(strategy, data, params), args.repeat)
+        after = _best_time(lambda: strategy["kernel"](data, params), args.repeat)
+        print(f"  {label:<18}{before * 1000:>12.0f} ms{after * 1000:>11.0f} ms ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
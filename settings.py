@@ -18,6 +18,7 @@ KLINES_DIR: str = os.getenv("KLINES_DIR")
 RESULTS_DIR: str = os.getenv("RESULTS_DIR")
 
 DATE_FORMAT: str = "%Y-%m-%d"
+MONTH_FORMAT: str = "%Y-%m"
 
 
 def load_config(config_file_path: str) -> dict:
@@ -46,3 +47,65 @@ RETRY_MULTIPLIER = int(os.getenv("RETRY_MULTIPLIER"))
 RETRY_MIN_WAIT = int(os.getenv("RETRY_MIN_WAIT"))
 RETRY_MAX_WAIT = int(os.getenv("RETRY_MAX_WAIT"))
 
+BINANCE_DATA_URL: str = os.getenv("BINANCE_DATA_URL", "https://data.binance.vision")
+
+# Complete past months with at least this many missing days are fetched as one monthly archive
+MONTHLY_ARCHIVE_MIN_DAYS = int(os.getenv("MONTHLY_ARCHIVE_MIN_DAYS", 7))
+
+# Download scheduler: global concurrency cap, per-host token bucket and shared retry budget
+DOWNLOAD_CONCURRENCY = int(os.getenv("DOWNLOAD_CONCURRENCY", 16))
+DOWNLOAD_RATE_LIMIT = float(os.getenv("DOWNLOAD_RATE_LIMIT", 20))
+DOWNLOAD_BURST = int(os.getenv("DOWNLOAD_BURST", 40))
+RETRY_BUDGET_RATIO = float(os.getenv("RETRY_BUDGET_RATIO", 0.1))
+RETRY_BUDGET_MIN = int(os.getenv("RETRY_BUDGET_MIN", 10))
+
+# Fetch pipeline: process pool size for parsing, thread count for writing, bounded queue size between stages
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", os.cpu_count() or 1))
+WRITE_WORKERS = int(os.getenv("WRITE_WORKERS", 2))
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", 8))
+
+# Compaction of daily Parquet files: whole years are merged into one file when they fit
+# into COMPACTION_YEARLY_MAX_ROWS rows, otherwise months are merged
+COMPACTION_ENABLED: bool = os.getenv("COMPACTION_ENABLED", "true").lower() == "true"
+COMPACTION_YEARLY_MAX_ROWS = int(os.getenv("COMPACTION_YEARLY_MAX_ROWS", 1_000_000))
+
+# Rows per row group in daily and compacted Parquet files; the loader skips row groups outside
+# the requested time window using their timestamp statistics
+PARQUET_ROW_GROUP_ROWS = int(os.getenv("PARQUET_ROW_GROUP_ROWS", 16_384))
+
+# Compact mode: price and volume columns are stored and loaded as float32 instead of float64,
+# and loaded frames use a categorical symbol index
+COMPACT_MODE: bool = os.getenv("COMPACT_MODE", "false").lower() == "true"
+
+# Byte budget of the in-process LRU cache of loaded kline frames, 0 disables it
+LOADER_CACHE_BYTES = int(os.getenv("LOADER_CACHE_BYTES", 512 * 2 ** 20))
+
+# Hot tier: the most requested series (at least HOT_TIER_MIN_REQUESTS backtests) are kept as
+# uncompressed, memory-mapped Arrow IPC files next to the Parquet partitions
+HOT_TIER_ENABLED: bool = os.getenv("HOT_TIER_ENABLED", "false").lower() == "true"
+HOT_TIER_MAX_SERIES = int(os.getenv("HOT_TIER_MAX_SERIES", 4))
+HOT_TIER_MIN_REQUESTS = int(os.getenv("HOT_TIER_MIN_REQUESTS", 5))
+
+# Indicator cache: computed indicators are kept in memory up to INDICATOR_CACHE_BYTES and spilled
+# to KLINES_DIR/indicators up to INDICATOR_CACHE_DISK_BYTES, 0 disables a level
+INDICATOR_CACHE_BYTES = int(os.getenv("INDICATOR_CACHE_BYTES", 256 * 2 ** 20))
+INDICATOR_CACHE_DISK_BYTES = int(os.getenv("INDICATOR_CACHE_DISK_BYTES", 2 ** 30))
+
+# Threading layer of numba's parallel kernels, set before any kernel is compiled or launched. The default
+# TBB layer hangs the interpreter at exit once a kernel ran on a worker thread (asyncio.to_thread), and
+# workqueue aborts on concurrent launches from several threads; omp handles both
+NUMBA_THREADING_LAYER: str = os.getenv("NUMBA_THREADING_LAYER", "omp")
+os.environ["NUMBA_THREADING_LAYER"] = NUMBA_THREADING_LAYER
+
+# Single backtests compute indicators and signals in fused numba kernels, false falls back to pandas stages
+FUSED_KERNELS_ENABLED: bool = os.getenv("FUSED_KERNELS_ENABLED", "true").lower() == "true"
+
+# Backtests stream indicators from checkpoints under KLINES_DIR/streams, so extending a series
+# by new bars computes only those bars
+STREAM_CHECKPOINTS_ENABLED: bool = os.getenv("STREAM_CHECKPOINTS_ENABLED", "false").lower() == "true"
+
+# Parameter sweeps evaluate combinations in chunks of at most this many time x column cells
+SWEEP_CHUNK_CELLS = int(os.getenv("SWEEP_CHUNK_CELLS", 4_000_000))
+
+# Walk-forward optimization: process pool size for running folds in parallel
+WALK_FORWARD_WORKERS = int(os.getenv("WALK_FORWARD_WORKERS", os.cpu_count() or 1))
@@ -0,0 +1,11 @@
+import os
+import tempfile
+
+from dotenv import dotenv_values
+
+# Settings are read from the environment when project modules are first imported: unset
+# variables take their .env.sample values, and tests never touch the configured data directories
+for name, value in dotenv_values(os.path.join(os.path.dirname(__file__), os.pardir, ".env.sample")).items():
+    os.environ.setdefault(name, value)
+os.environ["KLINES_DIR"] = tempfile.mkdtemp(prefix="klines_")
+os.environ["RESULTS_DIR"] = tempfile.mkdtemp(prefix="backtest_results_")
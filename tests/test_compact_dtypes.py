@@ -0,0 +1,112 @@
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester.data_loader import parquet_loader, partitions
+from backtester.data_loader.frame_cache import frame_cache
+from backtester.portfolio import create_multi_asset_portfolio
+from backtester.strategies import registry
+from fetcher.data_processing import csv_proc, table_proc
+from fetcher.data_processing.fetcher_pipeline import write_partitions
+from utils import path_utils
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+INTERVAL = "1h"
+START_DATE, END_DATE = "2024-01-01", "2024-03-31"
+
+BUILTIN_STRATEGIES = [name for name, strategy in registry.STRATEGY_REGISTRY.items() if "expression" not in strategy]
+
+PORTFOLIO_PARAMS = {"init_cash": 1000, "fees": 0.001, "slippage": 0.0005}
+
+# float32 keeps about 7 significant digits: indicators may move by a few float32 ulps of their
+# range, which must flip (almost) no signal and leave the stats equal to 4 significant digits
+INDICATOR_TOLERANCE = 1e-5
+SIGNAL_AGREEMENT = 0.999
+STATS_RTOL = 1e-4
+STATS = ["Total Return [%]", "Max Drawdown [%]", "Sharpe Ratio", "Total Trades", "Win Rate [%]"]
+
+
+def _klines_csv(seed: int) -> bytes:
+    """Hourly klines of the test range in the Binance archive CSV layout, epoch milliseconds."""
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range(START_DATE, pd.Timestamp(END_DATE) + pd.Timedelta(days=1), freq=INTERVAL,
+                               inclusive="left").asi8 // 10 ** 6
+    n_rows = len(timestamps)
+    close = 30_000 * np.exp(np.cumsum(rng.normal(0, 5e-3, n_rows)))
+    high = close * (1 + rng.uniform(0, 4e-3, n_rows))
+    low = close * (1 - rng.uniform(0, 4e-3, n_rows))
+    volume = rng.uniform(1, 100, n_rows)
+    rows = zip(timestamps, np.roll(close, 1), high, low, close, volume, timestamps + 3_599_999,
+               volume * close, rng.integers(1, 1000, n_rows), volume / 2, volume * close / 2)
+    return "".join(",".join(map(str, row)) + ",0\n" for row in rows).encode()
+
+
+@contextmanager
+def _store(klines_dir: str, compact: bool):
+    """Points storage at klines_dir and switches compact mode for writing and loading."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(path_utils, "KLINES_DIR", klines_dir)
+        for module in (table_proc, partitions, parquet_loader):
+            monkeypatch.setattr(module, "COMPACT_MODE", compact)
+        frame_cache.clear()
+        try:
+            yield
+        finally:
+            frame_cache.clear()
+
+
+def _load(klines_dir: str, compact: bool) -> dict:
+    """Writes the synthetic klines through the fetcher's Arrow path and loads them back as matrices."""
+    with _store(klines_dir, compact):
+        for seed, symbol in enumerate(SYMBOLS):
+            table = table_proc.normalize_table(csv_proc.to_table(_klines_csv(seed)))
+            daily_tables = table_proc.split_by_date(table)
+            write_partitions({date: table_proc.set_index(daily, symbol) for date, daily in daily_tables.items()},
+                             symbol, INTERVAL)
+        return parquet_loader.load_klines_matrix(SYMBOLS, INTERVAL, START_DATE, END_DATE, ["high", "low", "close"])
+
+
+@pytest.fixture(scope="module")
+def matrices(tmp_path_factory):
+    baseline = _load(str(tmp_path_factory.mktemp("float64")), compact=False)
+    compact = _load(str(tmp_path_factory.mktemp("float32")), compact=True)
+    return baseline, compact
+
+
+def _run(data: dict, strategy_name: str) -> dict:
+    # Backtests compute in float64 (app.COMPUTE_DTYPE) whatever the stored width
+    data = {field: matrix.astype("float64") for field, matrix in data.items()}
+    return registry.run_strategy(strategy_name, data, {})
+
+
+def test_compact_mode_narrows_loaded_floats(matrices):
+    baseline, compact = matrices
+    assert all(matrix.dtypes.eq("float64").all() for matrix in baseline.values())
+    assert all(matrix.dtypes.eq("float32").all() for matrix in compact.values())
+    # Values take half the memory; the time index is shared
+    assert sum(m.memory_usage(index=False).sum() for m in compact.values()) * 2 == \
+        sum(m.memory_usage(index=False).sum() for m in baseline.values())
+    for field in baseline:
+        np.testing.assert_allclose(compact[field].to_numpy(), baseline[field].to_numpy(), rtol=1e-7)
+
+
+@pytest.mark.parametrize("strategy_name", BUILTIN_STRATEGIES)
+def test_compact_mode_matches_float64_baseline(matrices, strategy_name):
+    baseline_data, compact_data = matrices
+    baseline = _run(baseline_data, strategy_name)
+    compact = _run(compact_data, strategy_name)
+
+    for name in registry.get_strategy(strategy_name)["outputs"]:
+        if name in registry.SIGNAL_OUTPUTS:
+            assert (compact[name].to_numpy() == baseline[name].to_numpy()).mean() >= SIGNAL_AGREEMENT, name
+        else:
+            expected = baseline[name].to_numpy()
+            scale = np.nanmax(expected) - np.nanmin(expected)
+            assert np.nanmax(np.abs(compact[name].to_numpy() - expected)) <= INDICATOR_TOLERANCE * scale, name
+
+    baseline_stats = create_multi_asset_portfolio(baseline, PORTFOLIO_PARAMS, freq=INTERVAL).stats(agg_func=None)
+    compact_stats = create_multi_asset_portfolio(compact, PORTFOLIO_PARAMS, freq=INTERVAL).stats(agg_func=None)
+    np.testing.assert_allclose(compact_stats[STATS].to_numpy(dtype=float), baseline_stats[STATS].to_numpy(dtype=float),
+                               rtol=STATS_RTOL)
@@ -0,0 +1,247 @@
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from utils import path_utils
+
+PARTITION_COLUMNS: List[str] = [
+    "symbol", "interval", "date", "path", "rows", "bytes", "mtime_ns", "sha256", "min_ts", "max_ts"
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS partitions (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    date TEXT NOT NULL,
+    path TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    min_ts INTEGER NOT NULL,
+    max_ts INTEGER NOT NULL,
+    PRIMARY KEY (symbol, interval, date)
+);
+CREATE INDEX IF NOT EXISTS partitions_path ON partitions (path);
+CREATE TABLE IF NOT EXISTS versions (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (symbol, interval)
+);
+"""
+
+_BUMP_VERSION = """
+INSERT INTO versions (symbol, interval, version) VALUES (?, ?, 1)
+ON CONFLICT (symbol, interval) DO UPDATE SET version = version + 1
+"""
+
+_initialized_path: Optional[str] = None
+
+
+def _connect() -> sqlite3.Connection:
+    """
+    Opens a connection to the catalog, creating the schema on first use.
+    Connections are short-lived, so the catalog can be used from worker threads.
+    """
+    global _initialized_path
+    catalog_path = path_utils.create_catalog_path()
+
+    conn = sqlite3.connect(catalog_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+
+    if _initialized_path != catalog_path:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        _initialized_path = catalog_path
+
+    return conn
+
+
+def upsert_partitions(partitions: List[Dict]) -> None:
+    """
+    Inserts or replaces partition rows in one transaction and bumps the data version
+    of every affected symbol and interval.
+
+    Args:
+        partitions (List[Dict]): Rows with the keys listed in PARTITION_COLUMNS.
+    """
+    if not partitions:
+        return
+
+    placeholders = ", ".join(f":{col}" for col in PARTITION_COLUMNS)
+    conn = _connect()
+    try:
+        with conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO partitions ({', '.join(PARTITION_COLUMNS)}) VALUES ({placeholders})",
+                partitions
+            )
+            conn.executemany(_BUMP_VERSION, {(row["symbol"], row["interval"]) for row in partitions})
+    finally:
+        conn.close()
+
+
+def delete_path(file_path: str) -> None:
+    """Drops every partition stored in the given file and bumps the affected data versions."""
+    conn = _connect()
+    try:
+        with conn:
+            affected = conn.execute(
+                "SELECT DISTINCT symbol, interval FROM partitions WHERE path = ?", (file_path,)
+            ).fetchall()
+            conn.execute("DELETE FROM partitions WHERE path = ?", (file_path,))
+            conn.executemany(_BUMP_VERSION, [tuple(row) for row in affected])
+    finally:
+        conn.close()
+
+
+def update_mtime(file_path: str, mtime_ns: int) -> None:
+    """
+    Records the current mtime of a file whose content was verified against its hash. The data
+    version is kept, since the data did not change.
+    """
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute("UPDATE partitions SET mtime_ns = ? WHERE path = ?", (mtime_ns, file_path))
+    finally:
+        conn.close()
+
+
+def get_data_version(symbol: str, interval: str) -> int:
+    """
+    Returns a counter that changes whenever partitions of a symbol and interval are written or dropped.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h').
+
+    Returns:
+        int: Data version, 0 if nothing was recorded yet.
+    """
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT version FROM versions WHERE symbol = ? AND interval = ?", (symbol, interval)
+        ).fetchone()
+    finally:
+        conn.close()
+
+    return row["version"] if row else 0
+
+
+def get_partitions(symbol: str, interval: str, start_date: str, end_date: str) -> Dict[str, Dict]:
+    """
+    Returns the catalogued partitions of a symbol and interval within a date range.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h').
+        start_date (str): Start date in 'YYYY-MM-DD' format.
+        end_date (str): End date in 'YYYY-MM-DD' format (inclusive).
+
+    Returns:
+        Dict[str, Dict]: Partition rows keyed by date.
+    """
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT * FROM partitions WHERE symbol = ? AND interval = ? AND date BETWEEN ? AND ?",
+            (symbol, interval, start_date, end_date)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return {row["date"]: dict(row) for row in rows}
+
+
+def get_partition_files(symbol: str, interval: str, start_date: str, end_date: str) -> Tuple[List[str], int]:
+    """
+    Resolves a date range to the exact set of files holding it in one query.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h').
+        start_date (str): Start date in 'YYYY-MM-DD' format.
+        end_date (str): End date in 'YYYY-MM-DD' format (inclusive).
+
+    Returns:
+        Tuple[List[str], int]: File paths in chronological order and the number of catalogued days.
+    """
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            """
+            SELECT path, COUNT(*) AS days
+            FROM partitions
+            WHERE symbol = ? AND interval = ? AND date BETWEEN ? AND ?
+            GROUP BY path
+            ORDER BY MIN(date)
+            """,
+            (symbol, interval, start_date, end_date)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return [row["path"] for row in rows], sum(row["days"] for row in rows)
+
+
+def get_available_ranges(symbol: str, interval: str) -> List[Tuple[str, str]]:
+    """
+    Returns the contiguous date ranges that are present for a symbol and interval.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h').
+
+    Returns:
+        List[Tuple[str, str]]: Inclusive (start_date, end_date) ranges in 'YYYY-MM-DD' format.
+    """
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            """
+            SELECT MIN(date) AS start_date, MAX(date) AS end_date
+            FROM (
+                SELECT date, julianday(date) - ROW_NUMBER() OVER (ORDER BY date) AS island
+                FROM partitions
+                WHERE symbol = ? AND interval = ?
+            )
+            GROUP BY island
+            ORDER BY start_date
+            """,
+            (symbol, interval)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return [(row["start_date"], row["end_date"]) for row in rows]
+
+
+def get_common_ranges(symbols: List[str], interval: str) -> List[Tuple[str, str]]:
+    """
+    Returns the date ranges present for all given symbols on an interval.
+
+    Args:
+        symbols (List[str]): Trading pair symbols (e.g., ['BTCUSDT', 'ETHUSDT']).
+        interval (str): Interval of klines (e.g., '1m', '1h').
+
+    Returns:
+        List[Tuple[str, str]]: Inclusive (start_date, end_date) ranges in 'YYYY-MM-DD' format.
+    """
+    common_ranges: Optional[List[Tuple[str, str]]] = None
+
+    for symbol in symbols:
+        ranges = get_available_ranges(symbol, interval)
+        if common_ranges is None:
+            common_ranges = ranges
+            continue
+
+        common_ranges = [
+            (max(start, other_start), min(end, other_end))
+            for start, end in common_ranges
+            for other_start, other_end in ranges
+            if max(start, other_start) <= min(end, other_end)
+        ]
+
+    return common_ranges or []
@@ -5,3 +5,9 @@ from settings import DATE_FORMAT
 
 def date_from_string(date_str) -> date:
     return datetime.strptime(date_str, DATE_FORMAT).date()
+
+
+def interval_to_seconds(interval: str) -> int:
+    """Converts a kline interval (e.g., '1s', '30m', '1h', '1d') to its length in seconds."""
+    unit_seconds = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    return int(interval[:-1]) * unit_seconds[interval[-1]]
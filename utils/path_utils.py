@@ -1,3 +1,4 @@
+import glob
 import os
 from datetime import datetime
 
@@ -54,6 +55,185 @@ def get_parquet_path(symbol: str, interval: str, date: str) -> str:
     return file_path
 
 
+def _construct_compacted_parquet_path(symbol: str, interval: str, period: str) -> tuple:
+    """
+    Constructs the directory and filename of a compacted Parquet file.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1s', '5m').
+        period (str): Month in 'YYYY-MM' format or year in 'YYYY' format.
+
+    Returns:
+        tuple: Directory path and full Parquet file path.
+    """
+    if "-" in period:
+        year, month = period.split("-")
+        file_dir = os.path.join(KLINES_DIR, symbol, year, month, interval)
+    else:
+        file_dir = os.path.join(KLINES_DIR, symbol, period, interval)
+    return file_dir, os.path.join(file_dir, f"{period}.parquet")
+
+
+def create_compacted_parquet_path(symbol: str, interval: str, period: str) -> str:
+    """
+    Generates and ensures the directory of a compacted (monthly or yearly) Parquet file exists.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1s', '5m').
+        period (str): Month in 'YYYY-MM' format or year in 'YYYY' format.
+
+    Returns:
+        str: Full Parquet file path.
+    """
+    file_dir, file_path = _construct_compacted_parquet_path(symbol, interval, period)
+    os.makedirs(file_dir, exist_ok=True)
+    return file_path
+
+
+def get_compacted_parquet_path(symbol: str, interval: str, period: str) -> str:
+    """
+    Generates the path of a compacted (monthly or yearly) Parquet file without ensuring the directory exists.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1s', '5m').
+        period (str): Month in 'YYYY-MM' format or year in 'YYYY' format.
+
+    Returns:
+        str: Full Parquet file path.
+    """
+    _, file_path = _construct_compacted_parquet_path(symbol, interval, period)
+    return file_path
+
+
+def get_daily_parquet_paths(symbol: str, interval: str) -> list[str]:
+    """
+    Lists the existing daily (not yet compacted) Parquet files of a symbol and interval.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1s', '5m').
+
+    Returns:
+        list[str]: Sorted daily Parquet file paths.
+    """
+    pattern = os.path.join(KLINES_DIR, symbol, "*", "*", interval, "????-??-??.parquet")
+    return sorted(glob.glob(pattern))
+
+
+def _construct_catalog_path() -> tuple:
+    """
+    Constructs the kline catalog directory and filename.
+
+    Returns:
+        tuple: Directory path and full catalog file path.
+    """
+    return KLINES_DIR, os.path.join(KLINES_DIR, "catalog.sqlite")
+
+
+def create_catalog_path() -> str:
+    """
+    Generates and ensures the kline catalog directory exists.
+
+    Returns:
+        str: Full catalog file path.
+    """
+    file_dir, file_path = _construct_catalog_path()
+    os.makedirs(file_dir, exist_ok=True)
+    return file_path
+
+
+def _construct_usage_path() -> tuple:
+    """
+    Constructs the usage statistics file directory and filename.
+
+    Returns:
+        tuple: Directory path and full usage statistics file path.
+    """
+    return KLINES_DIR, os.path.join(KLINES_DIR, "usage.json")
+
+
+def create_usage_path() -> str:
+    """
+    Generates and ensures the usage statistics file directory exists.
+
+    Returns:
+        str: Full usage statistics file path.
+    """
+    file_dir, file_path = _construct_usage_path()
+    os.makedirs(file_dir, exist_ok=True)
+    return file_path
+
+
+def get_usage_path() -> str:
+    """
+    Generates the usage statistics file path without ensuring the directory exists.
+
+    Returns:
+        str: Full usage statistics file path.
+    """
+    _, file_path = _construct_usage_path()
+    return file_path
+
+
+def _construct_hot_path(symbol: str, interval: str) -> tuple:
+    """
+    Constructs the hot tier Arrow IPC file directory and filename for a series.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h').
+
+    Returns:
+        tuple: Directory path and full Arrow IPC file path.
+    """
+    file_dir = os.path.join(KLINES_DIR, "hot", symbol)
+    return file_dir, os.path.join(file_dir, f"{interval}.arrow")
+
+
+def create_hot_path(symbol: str, interval: str) -> str:
+    """
+    Generates and ensures the hot tier file directory exists.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h').
+
+    Returns:
+        str: Full Arrow IPC file path.
+    """
+    file_dir, file_path = _construct_hot_path(symbol, interval)
+    os.makedirs(file_dir, exist_ok=True)
+    return file_path
+
+
+def get_hot_path(symbol: str, interval: str) -> str:
+    """
+    Generates the hot tier file path without ensuring the directory exists.
+
+    Args:
+        symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+        interval (str): Interval of klines (e.g., '1m', '1h').
+
+    Returns:
+        str: Full Arrow IPC file path.
+    """
+    _, file_path = _construct_hot_path(symbol, interval)
+    return file_path
+
+
+def get_hot_paths() -> list[str]:
+    """
+    Lists all hot tier files.
+
+    Returns:
+        list[str]: Sorted Arrow IPC file paths.
+    """
+    return sorted(glob.glob(os.path.join(KLINES_DIR, "hot", "*", "*.arrow")))
+
+
 def _construct_plot_path(symbols: list[str], strategy_name: str, timestamp: str) -> tuple:
     """
     Constructs the plot file directory and filename.
@@ -118,3 +298,126 @@ def create_csv_path(symbols: list[str], strategy_name: str, timestamp: str) -> s
     file_dir, file_path = _construct_csv_path(symbols, strategy_name, timestamp)
     os.makedirs(file_dir, exist_ok=True)
     return file_path
+
+
+def _construct_indicator_path(key: str) -> tuple:
+    """
+    Constructs the indicator cache directory and filename for a cache key.
+
+    Args:
+        key (str): Hex digest identifying data fingerprint, strategy and indicator parameters.
+
+    Returns:
+        tuple: Directory path and full Arrow IPC file path.
+    """
+    file_dir = os.path.join(KLINES_DIR, "indicators")
+    return file_dir, os.path.join(file_dir, f"{key}.arrow")
+
+
+def create_indicator_path(key: str) -> str:
+    """
+    Generates and ensures the indicator cache directory exists.
+
+    Args:
+        key (str): Hex digest identifying data fingerprint, strategy and indicator parameters.
+
+    Returns:
+        str: Full Arrow IPC file path.
+    """
+    file_dir, file_path = _construct_indicator_path(key)
+    os.makedirs(file_dir, exist_ok=True)
+    return file_path
+
+
+def get_indicator_path(key: str) -> str:
+    """
+    Generates the indicator cache file path without ensuring the directory exists.
+
+    Args:
+        key (str): Hex digest identifying data fingerprint, strategy and indicator parameters.
+
+    Returns:
+        str: Full Arrow IPC file path.
+    """
+    _, file_path = _construct_indicator_path(key)
+    return file_path
+
+
+def get_indicator_paths() -> list[str]:
+    """
+    Lists all spilled indicator cache files.
+
+    Returns:
+        list[str]: Sorted Arrow IPC file paths.
+    """
+    return sorted(glob.glob(os.path.join(KLINES_DIR, "indicators", "*.arrow")))
+
+
+def _construct_stream_dir(key: str) -> str:
+    """
+    Constructs the checkpoint directory of an indicator stream.
+
+    Args:
+        key (str): Hex digest identifying the series, strategy and indicator parameters.
+
+    Returns:
+        str: Directory holding the stream state and its output chunks.
+    """
+    return os.path.join(KLINES_DIR, "streams", key)
+
+
+def create_stream_state_path(key: str) -> str:
+    """
+    Generates the stream state file path and ensures the checkpoint directory exists.
+
+    Args:
+        key (str): Hex digest identifying the series, strategy and indicator parameters.
+
+    Returns:
+        str: Full .npz file path.
+    """
+    file_dir = _construct_stream_dir(key)
+    os.makedirs(file_dir, exist_ok=True)
+    return os.path.join(file_dir, "state.npz")
+
+
+def get_stream_state_path(key: str) -> str:
+    """
+    Generates the stream state file path without ensuring the directory exists.
+
+    Args:
+        key (str): Hex digest identifying the series, strategy and indicator parameters.
+
+    Returns:
+        str: Full .npz file path.
+    """
+    return os.path.join(_construct_stream_dir(key), "state.npz")
+
+
+def create_stream_chunk_path(key: str, chunk: int) -> str:
+    """
+    Generates the path of a stream output chunk and ensures the checkpoint directory exists.
+
+    Args:
+        key (str): Hex digest identifying the series, strategy and indicator parameters.
+        chunk (int): Sequence number of the chunk.
+
+    Returns:
+        str: Full Arrow IPC file path.
+    """
+    file_dir = _construct_stream_dir(key)
+    os.makedirs(file_dir, exist_ok=True)
+    return os.path.join(file_dir, f"{chunk:05d}.arrow")
+
+
+def get_stream_chunk_paths(key: str) -> list[str]:
+    """
+    Lists the output chunks of a stream.
+
+    Args:
+        key (str): Hex digest identifying the series, strategy and indicator parameters.
+
+    Returns:
+        list[str]: Arrow IPC file paths in chronological order.
+    """
+    return sorted(glob.glob(os.path.join(_construct_stream_dir(key), "?????.arrow")))
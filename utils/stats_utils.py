@@ -20,3 +20,19 @@ def create_symbol_stats(portfolio) -> pd.DataFrame:
 
 def save_stats_to_csv(symbol_stats: pd.DataFrame, path: str) -> None:
     symbol_stats.to_csv(path, index_label="Metric")
+
+
+def save_sweep_to_csv(sweep_results: pd.DataFrame, path: str) -> None:
+    sweep_results.to_csv(path)
+
+
+def save_fold_stats_to_csv(fold_stats: pd.DataFrame, path: str) -> None:
+    fold_stats.to_csv(path, index=False)
+
+
+def save_equity_to_csv(equity: pd.DataFrame, path: str) -> None:
+    equity.to_csv(path, index_label="timestamp")
+
+
+def save_robustness_to_csv(robustness: pd.DataFrame, path: str) -> None:
+    robustness.to_csv(path)
@@ -1,3 +1,6 @@
+from settings import BINANCE_DATA_URL
+
+
 def build_zip_url(symbol: str, interval: str, date: str) -> str:
     """
     Builds the URL for downloading data from Binance.
@@ -7,7 +10,19 @@ def build_zip_url(symbol: str, interval: str, date: str) -> str:
     :param date: The date in 'yyyy-mm-dd' format.
     :return: The URL for the data file.
     """
-    return f"https://data.binance.vision/data/spot/daily/klines/{symbol}/{interval}/{symbol}-{interval}-{date}.zip"
+    return f"{BINANCE_DATA_URL}/data/spot/daily/klines/{symbol}/{interval}/{symbol}-{interval}-{date}.zip"
+
+
+def build_monthly_zip_url(symbol: str, interval: str, month: str) -> str:
+    """
+    Builds the URL for downloading a monthly data archive from Binance.
+
+    :param symbol: The trading symbol (e.g., 'BTCUSDT').
+    :param interval: The interval for the data (e.g., '1h', '1s').
+    :param month: The month in 'yyyy-mm' format.
+    :return: The URL for the data file.
+    """
+    return f"{BINANCE_DATA_URL}/data/spot/monthly/klines/{symbol}/{interval}/{symbol}-{interval}-{month}.zip"
 
 
 def build_symbol_url(symbol: str) -> str:
@@ -17,5 +32,5 @@ def build_symbol_url(symbol: str) -> str:
     :param symbol: The trading symbol (e.g., 'BTCUSDT').
     :return: The URL for the symbol.
     """
-    return f"https://data.binance.vision/?prefix=data/spot/daily/klines/{symbol}/"
+    return f"{BINANCE_DATA_URL}/?prefix=data/spot/daily/klines/{symbol}/"
 
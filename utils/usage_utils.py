@@ -0,0 +1,63 @@
+import json
+import os
+from typing import Dict, List
+
+from utils import path_utils
+
+
+def _usage_key(symbol: str, interval: str) -> str:
+    return f"{symbol}/{interval}"
+
+
+def load_usage() -> Dict[str, int]:
+    """
+    Loads backtest request counts per symbol and interval.
+
+    Returns:
+        Dict[str, int]: Request counts keyed by 'SYMBOL/interval'.
+    """
+    usage_path = path_utils.get_usage_path()
+
+    if not os.path.exists(usage_path):
+        return {}
+
+    try:
+        with open(usage_path, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def record_backtest_request(symbols: List[str], interval: str) -> None:
+    """
+    Increments request counts for the symbols used in a backtest.
+
+    Args:
+        symbols (List[str]): Requested trading symbols (e.g., ['BTCUSDT', 'ETHUSDT']).
+        interval (str): Requested interval (e.g., '1h').
+    """
+    usage = load_usage()
+    for symbol in symbols:
+        key = _usage_key(symbol, interval)
+        usage[key] = usage.get(key, 0) + 1
+
+    usage_path = path_utils.create_usage_path()
+    tmp_path = f"{usage_path}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(usage, file, indent=1, sort_keys=True)
+    os.replace(tmp_path, usage_path)
+
+
+def get_symbol_usage() -> Dict[str, int]:
+    """
+    Aggregates backtest request counts per symbol over all intervals.
+
+    Returns:
+        Dict[str, int]: Request counts keyed by symbol.
+    """
+    symbol_usage: Dict[str, int] = {}
+    for key, count in load_usage().items():
+        symbol = key.split("/", 1)[0]
+        symbol_usage[symbol] = symbol_usage.get(symbol, 0) + count
+    return symbol_usage
+
@@ -1,4 +1,5 @@
 from datetime import date, datetime
+from typing import List, Tuple
 
 import httpx
 
@@ -81,3 +82,25 @@ def validate_date_range(
         raise ValueError(
             f"Invalid date range. Please provide a date range in the format 'YYYY-MM-DD'."
         )
+
+
+def validate_date_range_in_ranges(start_date: str, end_date: str, valid_ranges: List[Tuple[str, str]]):
+    """
+    Validates that the given start_date and end_date lie within one of the available ranges.
+
+    Args:
+    - start_date: Start date input by the user (string in 'YYYY-MM-DD' format).
+    - end_date: End date input by the user (string in 'YYYY-MM-DD' format).
+    - valid_ranges: Available (start, end) ranges (strings in 'YYYY-MM-DD' format).
+
+    Returns:
+    - (valid_start_date, valid_end_date): The validated start and end dates as strings.
+    - Raises ValueError if the dates are invalid or span a gap in the data.
+    """
+    for valid_start, valid_end in valid_ranges:
+        try:
+            return validate_date_range(start_date, end_date, valid_start, valid_end)
+        except ValueError:
+            continue
+
+    raise ValueError("Date range is not within a single available range.")